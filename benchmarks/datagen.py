@@ -0,0 +1,213 @@
+"""
+Seeded synthetic dataset generator.
+
+    from benchmarks.datagen import generate
+    generate(movies=100, books=100, reviews_per_title=5, categories=4, seed=1)
+
+The same arguments always produce the same rows (titles, ratings, created
+timestamps and M2M links), so timings taken on different commits compare
+like for like. Rows are written with bulk_create to keep setup time small
+next to what is being measured. bulk_create sends no signals, so derived
+data (e.g. the document store, see documents.store.rebuild_all) is left for
+the caller to build.
+"""
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from reviewapp.apps.books.models import Book, BookReview, ReviewSection, ReviewSectionType
+from reviewapp.apps.metadata.models import Country, Creator, Genre, Language
+from reviewapp.apps.movies.models import Movie, MovieAspectRating, MovieReview, MovieReviewCategory
+
+
+EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+WORDS = (
+    "silent river crimson empire winter garden shadow light broken promise "
+    "last letter hidden city golden hour distant shore iron heart paper moon "
+    "wild storm quiet room lost kingdom burning sky glass house secret road"
+).split()
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    movies: int = 100
+    books: int = 100
+    reviews_per_title: int = 5
+    categories: int = 4
+    sections_per_review: int = 3
+    genres: int = 12
+    creators: int = 50
+    languages: int = 8
+    countries: int = 10
+    seed: int = 1
+
+
+def _words(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def _sample(rng: random.Random, population: list, k_max: int) -> list:
+    return rng.sample(population, rng.randint(1, min(k_max, len(population))))
+
+
+@transaction.atomic
+def generate(spec: DatasetSpec = None, **kwargs) -> DatasetSpec:
+    """
+    Populate an empty database according to ``spec`` (or keyword overrides).
+    Returns the spec that was used.
+    """
+    spec = spec or DatasetSpec(**kwargs)
+    rng = random.Random(spec.seed)
+
+    users = User.objects.bulk_create([
+        User(username=f"reviewer{i}", email=f"reviewer{i}@example.com")
+        for i in range(max(spec.reviews_per_title, 1))
+    ])
+
+    languages = Language.objects.bulk_create([
+        Language(name=f"Language {i}", code=f"l{i}") for i in range(spec.languages)
+    ])
+    countries = Country.objects.bulk_create([
+        Country(name=f"Country {i}", code=f"c{i}") for i in range(spec.countries)
+    ])
+    movie_genres = Genre.objects.bulk_create([
+        Genre(name=f"Movie genre {i}", type=Genre.TYPE.MOVIE, description=_words(rng, 8))
+        for i in range(spec.genres)
+    ])
+    book_genres = Genre.objects.bulk_create([
+        Genre(name=f"Book genre {i}", type=Genre.TYPE.BOOK, description=_words(rng, 8))
+        for i in range(spec.genres)
+    ])
+    directors = Creator.objects.bulk_create([
+        Creator(name=f"Director {i}", type=Creator.TYPE.Director, bio=_words(rng, 20),
+                birth_date=date(1940, 1, 1) + timedelta(days=rng.randint(0, 15000)))
+        for i in range(spec.creators)
+    ])
+    authors = Creator.objects.bulk_create([
+        Creator(name=f"Author {i}", type=Creator.TYPE.Author, bio=_words(rng, 20),
+                birth_date=date(1940, 1, 1) + timedelta(days=rng.randint(0, 15000)))
+        for i in range(spec.creators)
+    ])
+
+    categories = MovieReviewCategory.objects.bulk_create([
+        MovieReviewCategory(
+            name=f"Aspect {i}",
+            type=MovieReviewCategory.TYPE.critical_analysis if i % 2 else MovieReviewCategory.TYPE.technical_breakdown,
+            description=_words(rng, 10),
+            weight=round(rng.uniform(0.5, 2.0), 2),
+            icon_name=f"icon-{i}",
+        )
+        for i in range(spec.categories)
+    ])
+    section_types = ReviewSectionType.objects.bulk_create([
+        ReviewSectionType(name=f"Section {i}", description=_words(rng, 6), icon_name=f"icon-{i}",
+                          suggested_for=ReviewSectionType.SUGGESTED_GENRES.ALL)
+        for i in range(max(spec.sections_per_review, 1))
+    ])
+
+    movies = Movie.objects.bulk_create([
+        Movie(
+            title=f"{_words(rng, 3).title()} {i}",
+            slug=f"movie-{i}",
+            tagline=_words(rng, 6),
+            synopsis=_words(rng, 60),
+            release_year=rng.randint(1950, 2024),
+            runtime=rng.randint(80, 200),
+            imdb_id=f"tt{i:07d}",
+            release_date=date(1950, 1, 1) + timedelta(days=rng.randint(0, 27000)),
+        )
+        for i in range(spec.movies)
+    ])
+    books = Book.objects.bulk_create([
+        Book(
+            title=f"{_words(rng, 3).title()} {i}",
+            subtitle=_words(rng, 4),
+            slug=f"book-{i}",
+            isbn=f"{9780000000000 + i}",
+            publisher=f"Publisher {rng.randint(0, 20)}",
+            publication_year=rng.randint(1900, 2024),
+            publication_date=date(1900, 1, 1) + timedelta(days=rng.randint(0, 45000)),
+            pages=rng.randint(100, 900),
+            summary=_words(rng, 60),
+        )
+        for i in range(spec.books)
+    ])
+
+    for movie in movies:
+        movie_through = (
+            (Movie.genre.through, "genre_id", _sample(rng, movie_genres, 3)),
+            (Movie.director.through, "creator_id", _sample(rng, directors, 2)),
+            (Movie.language.through, "language_id", _sample(rng, languages, 2)),
+            (Movie.country.through, "country_id", _sample(rng, countries, 2)),
+        )
+        for through, column, targets in movie_through:
+            through.objects.bulk_create([through(movie_id=movie.id, **{column: t.id}) for t in targets])
+    for book in books:
+        book_through = (
+            (Book.authors.through, "creator_id", _sample(rng, authors, 2)),
+            (Book.category.through, "genre_id", _sample(rng, book_genres, 3)),
+            (Book.language.through, "language_id", _sample(rng, languages, 2)),
+            (Book.country.through, "country_id", _sample(rng, countries, 2)),
+        )
+        for through, column, targets in book_through:
+            through.objects.bulk_create([through(book_id=book.id, **{column: t.id}) for t in targets])
+
+    def created_at():
+        return EPOCH + timedelta(seconds=rng.randint(0, 5 * 365 * 24 * 3600))
+
+    movie_reviews = MovieReview.objects.bulk_create([
+        MovieReview(
+            movie=movie,
+            overall_rating=round(rng.uniform(1, 10), 1),
+            imdb_rating=round(rng.uniform(1, 10), 1),
+            rottentomatoes_rating=rng.randint(0, 100),
+            review_summary=_words(rng, 15),
+            detailed_review=_words(rng, 200),
+            final_verdict=_words(rng, 10),
+            created_by=users[j],
+            is_public=rng.random() > 0.1,
+        )
+        for movie in movies for j in range(spec.reviews_per_title)
+    ])
+    book_reviews = BookReview.objects.bulk_create([
+        BookReview(
+            book=book,
+            overall_rating=round(rng.uniform(1, 10), 1),
+            goodreads_rating=round(rng.uniform(1, 5), 2),
+            amazon_rating=round(rng.uniform(1, 5), 1),
+            review_summary=_words(rng, 15),
+            detailed_review=_words(rng, 200),
+            personal_reflection=_words(rng, 40),
+            final_verdict=_words(rng, 10),
+            created_by=users[j],
+            is_public=rng.random() > 0.1,
+        )
+        for book in books for j in range(spec.reviews_per_title)
+    ])
+
+    # auto_now_add stamps every row with "now"; spread them out deterministically
+    # so ordering and pagination behave like real data.
+    for review in movie_reviews:
+        review.created = review.updated = created_at()
+    for review in book_reviews:
+        review.created = review.updated = created_at()
+    MovieReview.objects.bulk_update(movie_reviews, ["created", "updated"], batch_size=500)
+    BookReview.objects.bulk_update(book_reviews, ["created", "updated"], batch_size=500)
+
+    MovieAspectRating.objects.bulk_create([
+        MovieAspectRating(review=review, category=category,
+                          rating=round(rng.uniform(1, 10), 1), review_text=_words(rng, 30))
+        for review in movie_reviews for category in categories
+    ], batch_size=500)
+    ReviewSection.objects.bulk_create([
+        ReviewSection(review=review, section_type=section_types[k % len(section_types)],
+                      title=f"Key idea {k + 1}", content=_words(rng, 50),
+                      quote_title=_words(rng, 4), icon_name=f"icon-{k}", order=k)
+        for review in book_reviews for k in range(spec.sections_per_review)
+    ], batch_size=500)
+
+    return spec
@@ -0,0 +1,107 @@
+"""
+Encoding benchmark: the API renderers against the previous JsonResponse path.
+
+    python -m benchmarks.encoding --size 500 --repeat 20
+
+Seeds the database with benchmarks.datagen, serializes the verbose Index
+payload (reviews and aspects included) once, then times encoding it:
+
+  baseline   what the views did before the renderer layer: every datetime
+             formatted with localtime(...).isoformat() by the serializers,
+             then json.dumps with DjangoJSONEncoder and ensure_ascii=False
+  json       renderers.to_json (orjson when installed, native datetimes)
+  stdlib     renderers.to_json with orjson disabled
+  msgpack    renderers.to_msgpack, when msgpack is installed
+"""
+import argparse
+import datetime
+import json
+import os
+import statistics
+import time
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.core.serializers.json import DjangoJSONEncoder  # noqa: E402
+from django.utils.timezone import localtime  # noqa: E402
+
+from benchmarks.datagen import generate  # noqa: E402
+from reviewapp.apps.movies.models import Movie  # noqa: E402
+from reviewapp.core import renderers  # noqa: E402
+from reviewapp.core.querysets import movies_queryset_for_serialization  # noqa: E402
+from reviewapp.core.serializers import serialize_movie  # noqa: E402
+
+
+def format_datetimes(value):
+    """The serializers' former per-field formatting, applied to a payload."""
+    if isinstance(value, dict):
+        return {key: format_datetimes(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [format_datetimes(item) for item in value]
+    if isinstance(value, datetime.datetime):
+        return localtime(value).isoformat()
+    return value
+
+
+def baseline(data) -> bytes:
+    return json.dumps(format_datetimes(data), cls=DjangoJSONEncoder, ensure_ascii=False).encode("utf-8")
+
+
+def stdlib(data) -> bytes:
+    accelerated, renderers.orjson = renderers.orjson, None
+    try:
+        return renderers.to_json(data)
+    finally:
+        renderers.orjson = accelerated
+
+
+def encoders() -> dict:
+    cases = {"baseline": baseline, "json": renderers.to_json, "stdlib": stdlib}
+    if renderers.msgpack is not None:
+        cases["msgpack"] = renderers.to_msgpack
+    return cases
+
+
+def measure(fn, data, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn(data)
+        samples.append(time.perf_counter() - start)
+    return {"median": statistics.median(samples), "min": min(samples), "bytes": len(body)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=500, help="Number of movies to seed")
+    parser.add_argument("--reviews", type=int, default=5, help="Reviews per title")
+    parser.add_argument("--categories", type=int, default=4, help="Aspect categories")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    call_command("migrate", interactive=False, verbosity=0)
+    call_command("flush", interactive=False, verbosity=0)
+    generate(movies=args.size, books=0, reviews_per_title=args.reviews, categories=args.categories, seed=args.seed)
+    data = [
+        serialize_movie(movie, verbose=True, include_reviews=True, include_aspects=True)
+        for movie in movies_queryset_for_serialization(Movie.objects.all())
+    ]
+
+    accelerated = "orjson" if renderers.orjson is not None else "stdlib fallback"
+    print(f"Verbose Index payload, {len(data)} movies; json uses {accelerated}")
+    results = {name: measure(fn, data, args.repeat) for name, fn in encoders().items()}
+    base = results["baseline"]["median"]
+    for name, stats in results.items():
+        print(f"{name:<10} median={stats['median'] * 1000:9.2f}ms min={stats['min'] * 1000:9.2f}ms "
+              f"{base / stats['median']:6.2f}x  {stats['bytes']:>10} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,285 @@
+"""
+Concurrent load harness for the WSGI and ASGI entry points.
+
+    python -m benchmarks.load --server wsgi --concurrency 8 --requests 2000
+    python -m benchmarks.load --server asgi --profile benchmarks/load.json
+
+Requests are replayed in-process straight into ``reviewapp.wsgi.application``
+(one thread per concurrent client) or ``reviewapp.asgi.application`` (one task
+per concurrent client), so nothing but this repository is needed. The request
+mix and the SLO come from a JSON profile; the run exits non-zero when any SLO
+is exceeded.
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import sys
+import threading
+import time
+from urllib.parse import urlencode
+from wsgiref.util import setup_testing_defaults
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connections  # noqa: E402
+
+from benchmarks.datagen import generate  # noqa: E402
+from reviewapp.apps.documents.store import rebuild_all  # noqa: E402
+
+
+DEFAULT_PROFILE = os.path.join(os.path.dirname(__file__), "load.json")
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def build_plan(profile: dict, total: int, slugs: list, seed: int) -> list:
+    """
+    Expand the weighted mix into a fixed, seeded list of (name, path, query) so
+    that every run replays exactly the same requests in the same order.
+    """
+    rng = random.Random(seed)
+    mix = profile["mix"]
+    weights = [entry["weight"] for entry in mix]
+    plan = []
+    for entry in rng.choices(mix, weights=weights, k=total):
+        path = entry["path"].format(slug=rng.choice(slugs))
+        plan.append((entry["name"], path, urlencode(entry.get("params", {}))))
+    return plan
+
+
+class WSGIDriver:
+    def __init__(self):
+        from reviewapp.wsgi import application
+        self.application = application
+
+    def request(self, path: str, query: str) -> int:
+        environ = {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": path,
+            "QUERY_STRING": query,
+            "SERVER_NAME": "localhost",
+            "HTTP_HOST": "localhost",
+            "wsgi.input": io.BytesIO(),
+        }
+        setup_testing_defaults(environ)
+        status = []
+
+        def start_response(status_line, headers, exc_info=None):
+            status.append(int(status_line.split(" ", 1)[0]))
+
+        response = self.application(environ, start_response)
+        try:
+            for _ in response:
+                pass
+        finally:
+            if hasattr(response, "close"):
+                response.close()
+        return status[0]
+
+    def run(self, plan: list, concurrency: int) -> list:
+        samples = []
+        lock = threading.Lock()
+        cursor = iter(plan)
+
+        def worker():
+            try:
+                while True:
+                    with lock:
+                        item = next(cursor, None)
+                    if item is None:
+                        return
+                    name, path, query = item
+                    start = time.perf_counter()
+                    status = self.request(path, query)
+                    elapsed = time.perf_counter() - start
+                    with lock:
+                        samples.append((name, status, elapsed))
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return samples
+
+
+class ASGIDriver:
+    def __init__(self):
+        from reviewapp.asgi import application
+        self.application = application
+
+    async def request(self, path: str, query: str) -> int:
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": [(b"host", b"localhost")],
+            "server": ("localhost", 80),
+            "client": ("127.0.0.1", 0),
+        }
+        status = []
+        body_sent = False
+        finished = asyncio.Event()
+
+        async def receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await finished.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                status.append(message["status"])
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                finished.set()
+
+        await self.application(scope, receive, send)
+        return status[0]
+
+    def run(self, plan: list, concurrency: int) -> list:
+        samples = []
+
+        async def worker(queue):
+            while not queue.empty():
+                name, path, query = queue.get_nowait()
+                start = time.perf_counter()
+                status = await self.request(path, query)
+                samples.append((name, status, time.perf_counter() - start))
+
+        async def main():
+            queue = asyncio.Queue()
+            for item in plan:
+                queue.put_nowait(item)
+            await asyncio.gather(*(worker(queue) for _ in range(concurrency)))
+
+        asyncio.run(main())
+        return samples
+
+
+DRIVERS = {"wsgi": WSGIDriver, "asgi": ASGIDriver}
+
+
+def summarize(samples: list, wall: float) -> dict:
+    def stats(items):
+        latencies = sorted(elapsed for _, _, elapsed in items)
+        return {
+            "requests": len(items),
+            "errors": sum(1 for _, status, _ in items if status >= 500),
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p95_ms": percentile(latencies, 95) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+            "max_ms": (latencies[-1] if latencies else 0.0) * 1000,
+        }
+
+    report = stats(samples)
+    report["throughput_rps"] = len(samples) / wall if wall else 0.0
+    report["by_route"] = {
+        name: stats([s for s in samples if s[0] == name])
+        for name in sorted({s[0] for s in samples})
+    }
+    return report
+
+
+def check_slo(report: dict, slo: dict) -> list:
+    """Return the list of violated objectives; ``slo`` keys mirror the report."""
+    violations = []
+    for key, limit in slo.items():
+        if key == "min_throughput_rps":
+            if report["throughput_rps"] < limit:
+                violations.append(f"throughput {report['throughput_rps']:.1f} rps < {limit}")
+        elif key == "max_error_rate":
+            rate = report["errors"] / report["requests"] if report["requests"] else 0.0
+            if rate > limit:
+                violations.append(f"error rate {rate:.3f} > {limit}")
+        elif report.get(key, 0.0) > limit:
+            violations.append(f"{key} {report[key]:.1f} > {limit}")
+    return violations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--server", choices=sorted(DRIVERS), default="wsgi")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE, help="JSON file with the request mix and SLO")
+    parser.add_argument("--concurrency", type=int, help="Concurrent clients (overrides the profile)")
+    parser.add_argument("--requests", type=int, help="Total requests (overrides the profile)")
+    parser.add_argument("--size", type=int, help="Movies in the seeded dataset (overrides the profile)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--no-seed-data", action="store_true", help="Reuse the data already in BENCH_DB")
+    parser.add_argument("--warmup", type=int, default=20, help="Requests replayed before measuring")
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    with open(args.profile) as fh:
+        profile = json.load(fh)
+    concurrency = args.concurrency or profile.get("concurrency", 8)
+    total = args.requests or profile.get("requests", 1000)
+    size = args.size or profile.get("dataset", {}).get("movies", 100)
+
+    call_command("migrate", interactive=False, verbosity=0)
+    if not args.no_seed_data:
+        call_command("flush", interactive=False, verbosity=0)
+        dataset = profile.get("dataset", {})
+        generate(movies=size, books=size, reviews_per_title=dataset.get("reviews_per_title", 5),
+                 categories=dataset.get("categories", 4), seed=args.seed)
+        # the seeded rows bypass the signals that fill the document store
+        rebuild_all()
+
+    from reviewapp.apps.movies.models import Movie
+    slugs = list(Movie.objects.order_by("id").values_list("slug", flat=True))
+    connections.close_all()
+
+    driver = DRIVERS[args.server]()
+    driver.run(build_plan(profile, args.warmup, slugs, args.seed + 1), concurrency)
+
+    plan = build_plan(profile, total, slugs, args.seed)
+    start = time.perf_counter()
+    samples = driver.run(plan, concurrency)
+    wall = time.perf_counter() - start
+
+    report = summarize(samples, wall)
+    report.update({"server": args.server, "concurrency": concurrency, "dataset_size": size})
+
+    print(f"{args.server} concurrency={concurrency} requests={report['requests']} "
+          f"throughput={report['throughput_rps']:.1f} rps errors={report['errors']}")
+    for name, route in [("all", report)] + list(report["by_route"].items()):
+        print(f"  {name:<10} n={route['requests']:<6} p50={route['p50_ms']:8.2f}ms "
+              f"p95={route['p95_ms']:8.2f}ms p99={route['p99_ms']:8.2f}ms")
+
+    violations = check_slo(report, profile.get("slo", {}))
+    report["slo_violations"] = violations
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+
+    if violations:
+        print("\nSLO exceeded:\n  " + "\n  ".join(violations))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
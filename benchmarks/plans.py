@@ -0,0 +1,239 @@
+"""
+Query-plan regression check for the serialization querysets and API views.
+
+    python -m benchmarks.plans                 # compare against plans.json
+    python -m benchmarks.plans --update        # accept the current plans
+
+The database is seeded with benchmarks.datagen, every case is run once while
+its queries are captured, and each SELECT is explained (``EXPLAIN QUERY PLAN``
+on SQLite, ``EXPLAIN (FORMAT JSON)`` on PostgreSQL). Plans are reduced to
+flags for the two things that hurt as tables grow: full table scans and sorts
+that need a temporary B-tree (a Sort node on PostgreSQL). Flags are compared
+per query shape with the checked-in expectations of the same database vendor;
+a flag that is not expected fails the run. Queries that appear or disappear
+without a new flag are only reported. A case that does not answer 2xx or runs
+no query fails the run too, since its plans would silently go missing.
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import timedelta
+from pathlib import Path
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from benchmarks.run import CASES, DOCUMENT_CASES, factory, seed  # noqa: E402
+from reviewapp.api.books.views import Reviews as BookReviews  # noqa: E402
+from reviewapp.api.changes.views import Feed  # noqa: E402
+from reviewapp.api.creators.views import Works  # noqa: E402
+from reviewapp.api.feed.views import Index as ReviewFeed  # noqa: E402
+from reviewapp.api.movies.views import Batch, Reviews, Similar  # noqa: E402
+from reviewapp.api.reviewers.views import Profile  # noqa: E402
+from reviewapp.apps.books.models import Book, BookReview  # noqa: E402
+from reviewapp.apps.changes.models import KIND, Change  # noqa: E402
+from reviewapp.apps.movies.models import Movie, MovieAspectRating, MovieReview  # noqa: E402
+from reviewapp.apps.documents.store import rebuild_all  # noqa: E402
+from reviewapp.core.nplusone import fingerprint  # noqa: E402
+from reviewapp.core.pagination import encode_cursor  # noqa: E402
+
+
+EXPECTATIONS = Path(__file__).with_name("plans.json")
+
+reviews_view = Reviews.as_view()
+book_reviews_view = BookReviews.as_view()
+batch_view = Batch.as_view()
+similar_view = Similar.as_view()
+feed_view = Feed.as_view()
+profile_view = Profile.as_view()
+review_feed_view = ReviewFeed.as_view()
+works_view = Works.as_view()
+
+
+VIEW_CASES = {
+    "Reviews": lambda: reviews_view(factory.get("/api/movies/movie-0/reviews/", {"sort": "highest"}),
+                                    slug="movie-0"),
+    "Reviews[book]": lambda: book_reviews_view(factory.get("/api/books/book-0/reviews/"), slug="book-0"),
+    "Batch": lambda: batch_view(factory.get("/api/movies/batch/", {"slugs": "movie-0,movie-1,movie-2"})),
+    "Similar": lambda: similar_view(factory.get("/api/movies/movie-0/similar/"), slug="movie-0"),
+    "Changes": lambda: feed_view(factory.get("/api/changes/")),
+    "Profile": lambda: profile_view(factory.get("/api/reviewers/reviewer0/"), username="reviewer0"),
+    "ReviewFeed": lambda: review_feed_view(factory.get("/api/feed/")),
+    "ReviewFeed[page]": lambda: review_feed_view(factory.get("/api/feed/", {"cursor": encode_cursor(
+        "2021-06-01T00:00:00+00:00", 1, "movie")})),
+    "Works": lambda: works_view(factory.get("/api/creators/1/works/"), pk=1),
+}
+
+
+class BrokenCase(Exception):
+    pass
+
+
+def seed_changes(per_kind: int = 20) -> None:
+    """
+    Feed rows for some objects of every kind: datagen bulk-inserts, so no
+    signal records any. They are backdated past CHANGES_SETTLE_SECONDS.
+    """
+    sources = {
+        KIND.MOVIE: Movie.objects, KIND.BOOK: Book.objects, KIND.MOVIE_REVIEW: MovieReview.objects,
+        KIND.BOOK_REVIEW: BookReview.objects, KIND.ASPECT_RATING: MovieAspectRating.objects,
+    }
+    changed = timezone.now() - timedelta(minutes=1)
+    Change.objects.bulk_create([
+        Change(kind=kind, object_id=pk, changed=changed)
+        for kind, manager in sources.items()
+        for pk in manager.order_by("id").values_list("id", flat=True)[:per_kind]
+    ])
+
+
+class QueryCapture(object):
+    """execute_wrapper collecting (sql, params) of the SELECTs issued."""
+
+    def __init__(self) -> None:
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if not many and sql.lstrip().upper().startswith("SELECT"):
+            self.queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+
+def _sqlite_flags(sql: str, params) -> tuple:
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        plan = [row[-1] for row in cursor.fetchall()]
+    flags = set()
+    for detail in plan:
+        if detail.startswith("SCAN ") and " USING " not in detail and detail != "SCAN CONSTANT ROW":
+            flags.add(f"full scan {detail[5:].split()[0]}")
+        elif detail.startswith("USE TEMP B-TREE"):
+            flags.add(f"temp b-tree {detail[len('USE TEMP B-TREE FOR '):].lower()}")
+    return plan, flags
+
+
+def _postgresql_flags(sql: str, params) -> tuple:
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        root = cursor.fetchone()[0]
+    if isinstance(root, str):
+        root = json.loads(root)
+    plan, flags = [], set()
+
+    def walk(node, depth=0):
+        relation = node.get("Relation Name")
+        plan.append("  " * depth + node["Node Type"] + (f" on {relation}" if relation else ""))
+        if node["Node Type"] == "Seq Scan":
+            flags.add(f"full scan {relation}")
+        elif node["Node Type"] == "Sort":
+            flags.add("temp b-tree " + ", ".join(node.get("Sort Key", [])))
+        for child in node.get("Plans", []):
+            walk(child, depth + 1)
+
+    walk(root[0]["Plan"])
+    return plan, flags
+
+
+EXPLAINERS = {"sqlite": _sqlite_flags, "postgresql": _postgresql_flags}
+
+
+def capture_plans(fn) -> dict:
+    """{query fingerprint: {"plan": [...], "flags": [...]}} of the SELECTs ``fn`` issues."""
+    capture = QueryCapture()
+    with connection.execute_wrapper(capture):
+        result = fn()
+    status = getattr(result, "status_code", 200)
+    if not 200 <= status < 300:
+        raise BrokenCase(f"answered {status}")
+    if not capture.queries:
+        raise BrokenCase("ran no queries")
+    explain = EXPLAINERS[connection.vendor]
+    plans = {}
+    for sql, params in capture.queries:
+        plan, flags = explain(sql, params)
+        entry = plans.setdefault(fingerprint(sql), {"plan": plan, "flags": []})
+        entry["flags"] = sorted(set(entry["flags"]) | flags)
+    return plans
+
+
+def collect(args) -> dict:
+    seed(args.size, args)
+    seed_changes()
+    plans = {}
+    for cases in ({**CASES, **VIEW_CASES}, DOCUMENT_CASES):
+        if cases is DOCUMENT_CASES:
+            rebuild_all()
+        for name, fn in cases.items():
+            try:
+                plans[name] = capture_plans(fn)
+            except BrokenCase as exc:
+                raise BrokenCase(f"{name} {exc}") from None
+    return plans
+
+
+def compare(current: dict, expected: dict) -> tuple:
+    """Return (failures, notes): unexpected flags fail, changed query sets are noted."""
+    failures, notes = [], []
+    for case, queries in current.items():
+        before = expected.get(case, {})
+        for shape, entry in queries.items():
+            allowed = set(before.get(shape, {}).get("flags", []))
+            if shape not in before:
+                notes.append(f"{case}: new query {shape[:120]}")
+            for flag in entry["flags"]:
+                if flag not in allowed:
+                    failures.append(f"{case}: {flag}\n  {shape[:300]}\n  plan: " + "\n        ".join(entry["plan"]))
+        for shape in before.keys() - queries.keys():
+            notes.append(f"{case}: query no longer issued {shape[:120]}")
+    return failures, notes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=500, help="Number of movies/books to seed")
+    parser.add_argument("--reviews", type=int, default=5, help="Reviews per title")
+    parser.add_argument("--categories", type=int, default=4, help="Aspect categories")
+    parser.add_argument("--sections", type=int, default=3, help="Sections per book review")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--expectations", default=str(EXPECTATIONS), help="Expected plans file")
+    parser.add_argument("--update", action="store_true", help="Write the current plans as the expectations")
+    args = parser.parse_args(argv)
+
+    call_command("migrate", interactive=False, verbosity=0)
+    if connection.vendor not in EXPLAINERS:
+        print(f"Query plans are not supported on {connection.vendor}", file=sys.stderr)
+        return 1
+
+    try:
+        current = collect(args)
+    except BrokenCase as exc:
+        print(f"Broken case: {exc}", file=sys.stderr)
+        return 1
+    path = Path(args.expectations)
+    stored = json.loads(path.read_text()) if path.exists() else {}
+
+    if args.update:
+        stored[connection.vendor] = current
+        path.write_text(json.dumps(stored, indent=2, sort_keys=True) + "\n")
+        print(f"Wrote {sum(len(q) for q in current.values())} query plans to {path}")
+        return 0
+
+    failures, notes = compare(current, stored.get(connection.vendor, {}))
+    for note in notes:
+        print(note)
+    if failures:
+        print("\nPlan regressions:\n" + "\n\n".join(failures))
+        return 1
+    print("No plan regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""
+Benchmark suite for the serializers, serialization querysets and API views.
+
+    python -m benchmarks.run --sizes 10,100,500 --output bench.json
+    python -m benchmarks.run --sizes 10,100 --compare bench.json
+
+For every dataset size the database is flushed and re-seeded with
+benchmarks.datagen, then each case is timed ``--repeat`` times. The seeded
+rows bypass the signals that fill the document store, so the view cases
+first measure the live rendering fallback; the store is then rebuilt and
+the ``[documents]`` cases measure the pre-rendered path production serves. The query
+count of a single run is recorded next to the timings. Results are written as
+JSON; ``--compare`` loads a previous run and exits non-zero when a case got
+slower than ``--threshold`` or issues more queries than before.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connection, reset_queries  # noqa: E402
+from django.test.client import RequestFactory  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from benchmarks.datagen import DatasetSpec, generate  # noqa: E402
+from reviewapp.api.movies.views import Details, Index  # noqa: E402
+from reviewapp.apps.books.models import Book  # noqa: E402
+from reviewapp.apps.documents.store import rebuild_all  # noqa: E402
+from reviewapp.apps.movies.models import Movie  # noqa: E402
+from reviewapp.core.querysets import books_queryset_for_serialization, movies_queryset_for_serialization  # noqa: E402
+from reviewapp.core.serializers import serialize_book, serialize_movie  # noqa: E402
+
+
+factory = RequestFactory()
+index_view = Index.as_view()
+details_view = Details.as_view()
+
+
+def case_movies_queryset():
+    return list(movies_queryset_for_serialization(Movie.objects.all()))
+
+
+def case_books_queryset():
+    return list(books_queryset_for_serialization(Book.objects.all()))
+
+
+def case_serialize_movie():
+    movies = list(movies_queryset_for_serialization(Movie.objects.all()))
+    return [serialize_movie(m, verbose=True, include_reviews=True, include_aspects=True) for m in movies]
+
+
+def case_serialize_book():
+    books = list(books_queryset_for_serialization(Book.objects.all()))
+    return [serialize_book(b, verbose=True, include_reviews=True) for b in books]
+
+
+def case_index_view():
+    return index_view(factory.get("/api/movies/"))
+
+
+def case_index_view_verbose():
+    return index_view(factory.get("/api/movies/", {"verbose": "true", "include_reviews": "true"}))
+
+
+def case_details_view():
+    return details_view(factory.get("/api/movies/movie-0/"), slug="movie-0")
+
+
+CASES = {
+    "movies_queryset_for_serialization": case_movies_queryset,
+    "books_queryset_for_serialization": case_books_queryset,
+    "serialize_movie": case_serialize_movie,
+    "serialize_book": case_serialize_book,
+    "Index": case_index_view,
+    "Index[verbose]": case_index_view_verbose,
+    "Details": case_details_view,
+}
+
+# run once the documents are built, so the views take the stored path
+DOCUMENT_CASES = {
+    "Index[documents]": case_index_view,
+    "Details[documents]": case_details_view,
+}
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def measure(fn, repeat: int) -> dict:
+    with CaptureQueriesContext(connection) as ctx:
+        fn()
+    queries = len(ctx.captured_queries)
+
+    samples = []
+    for _ in range(repeat):
+        reset_queries()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+
+    return {
+        "queries": queries,
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "max": max(samples),
+        "samples": samples,
+    }
+
+
+def seed(size: int, args) -> DatasetSpec:
+    call_command("flush", interactive=False, verbosity=0)
+    return generate(
+        movies=size,
+        books=size,
+        reviews_per_title=args.reviews,
+        categories=args.categories,
+        sections_per_review=args.sections,
+        seed=args.seed,
+    )
+
+
+def run(args) -> dict:
+    call_command("migrate", interactive=False, verbosity=0)
+    selected = args.cases.split(",") if args.cases else [*CASES, *DOCUMENT_CASES]
+
+    results = []
+    for size in args.sizes:
+        seed(size, args)
+        for cases in (CASES, DOCUMENT_CASES):
+            if cases is DOCUMENT_CASES:
+                rebuild_all()
+            for name in (name for name in selected if name in cases):
+                stats = measure(cases[name], args.repeat)
+                results.append({"case": name, "size": size, **stats})
+                print(f"{name:<36} n={size:<6} queries={stats['queries']:<6} "
+                      f"median={stats['median'] * 1000:9.2f}ms min={stats['min'] * 1000:9.2f}ms")
+
+    return {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "repeat": args.repeat,
+            "dataset": {
+                "reviews_per_title": args.reviews,
+                "categories": args.categories,
+                "sections_per_review": args.sections,
+                "seed": args.seed,
+            },
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """
+    Return human-readable regressions of ``current`` against ``baseline``.
+    Timings are compared on the median; query counts must not grow at all.
+    """
+    previous = {(r["case"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        before = previous.get((result["case"], result["size"]))
+        if before is None:
+            continue
+        ratio = result["median"] / before["median"] if before["median"] else 1.0
+        label = f"{result['case']} n={result['size']}"
+        print(f"{label:<44} {before['median'] * 1000:9.2f}ms -> {result['median'] * 1000:9.2f}ms "
+              f"({ratio:5.2f}x)  queries {before['queries']} -> {result['queries']}")
+        if ratio > 1 + threshold:
+            regressions.append(f"{label}: median {ratio:.2f}x slower")
+        if result["queries"] > before["queries"]:
+            regressions.append(f"{label}: {before['queries']} -> {result['queries']} queries")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=lambda s: [int(x) for x in s.split(",")], default=[10, 100, 500],
+                        help="Comma separated number of movies/books per dataset")
+    parser.add_argument("--reviews", type=int, default=5, help="Reviews per title")
+    parser.add_argument("--categories", type=int, default=4, help="Aspect categories")
+    parser.add_argument("--sections", type=int, default=3, help="Sections per book review")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--cases", help=f"Comma separated subset of: {', '.join([*CASES, *DOCUMENT_CASES])}")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--compare", help="Previous results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed relative slowdown of the median before failing (default 0.2)")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,23 @@
+"""
+Settings used by the benchmark and load-test scripts.
+
+Everything runs against a throwaway SQLite file so the numbers are reproducible
+and never touch a developer's database. Override the location with BENCH_DB.
+"""
+import os
+import tempfile
+
+from reviewapp.settings import *  # noqa
+
+DEBUG = False
+
+ALLOWED_HOSTS = ["testserver", "localhost", "127.0.0.1"]
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ.get("BENCH_DB", os.path.join(tempfile.gettempdir(), "reviewapp-bench.sqlite3")),
+    }
+}
+
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
@@ -0,0 +1,10 @@
+from django.urls import path
+
+from reviewapp.api.analytics.views import AspectAverages
+
+
+app_name = "analytics"
+
+urlpatterns = [
+    path("aspects/", AspectAverages.as_view(), name="aspects"),
+]
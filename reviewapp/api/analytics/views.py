@@ -0,0 +1,47 @@
+from django.http import HttpResponseBadRequest
+from django.views import View
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt
+
+from reviewapp.apps.stats.analytics import DIMENSIONS, aspect_averages
+from reviewapp.core.renderers import render
+from reviewapp.core.routers import replica_reads
+from reviewapp.core.nplusone import budget
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+@method_decorator(replica_reads(), name="dispatch")
+@budget(5)
+class AspectAverages(View):
+    """
+    GET /api/analytics/aspects/  (staff only)
+    Optional query params:
+      - by=all|genre|decade|country (default all)
+      - category=<id> (repeatable or comma separated)
+      - key=<genre id|decade|country id> (repeatable or comma separated)
+      - min_count=<number> (hide slices with fewer ratings)
+    """
+
+    def get(self, request):
+        if not request.user.is_staff:
+            return render(request, {"detail": "Staff only"}, status=403)
+
+        by = request.GET.get("by", "all")
+        if by not in DIMENSIONS:
+            return HttpResponseBadRequest(f"by must be one of {', '.join(DIMENSIONS)}")
+
+        def ids(name):
+            values = [v for value in request.GET.getlist(name) for v in value.split(",") if v.strip()]
+            if not all(v.strip().isdigit() for v in values):
+                raise ValueError(name)
+            return [int(v) for v in values] or None
+
+        try:
+            categories, keys = ids("category"), ids("key")
+        except ValueError as exc:
+            return HttpResponseBadRequest(f"{exc} must be numeric")
+        min_count = request.GET.get("min_count")
+        min_count = int(min_count) if (min_count and min_count.isdigit()) else 1
+
+        data = aspect_averages(by=by, categories=categories, keys=keys, min_count=min_count)
+        return render(request, data)
@@ -0,0 +1,10 @@
+from django.urls import path
+
+from reviewapp.api.books.views import Reviews
+
+
+app_name = "books"
+
+urlpatterns = [
+    path("<slug:slug>/reviews/", Reviews.as_view(), name="reviews"),
+]
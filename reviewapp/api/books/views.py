@@ -0,0 +1,54 @@
+from django.db.models import Prefetch
+from django.http import HttpResponseBadRequest, Http404
+from django.views import View
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt
+
+from reviewapp.apps.books.models import Book, BookReview, ReviewSection
+from reviewapp.core.pagination import InvalidCursor
+from reviewapp.core.reviews import REVIEW_SORTS, decode_review_cursor, review_page
+from reviewapp.core.serializers import serialize_book_review
+from reviewapp.core.renderers import render
+from reviewapp.core.routers import replica_reads
+from reviewapp.core.nplusone import budget
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+@method_decorator(replica_reads(), name="dispatch")
+@budget(3)
+class Reviews(View):
+    """
+    GET /api/books/<slug>/reviews/
+    Optional query params:
+      - sort=newest|oldest|highest|lowest (default newest)
+      - limit=<number> (default 10, max 50)
+      - cursor=<next cursor of the previous page>
+    Full public reviews with their sections, one keyset page at a time.
+    """
+
+    def get(self, request, slug):
+        book_id = Book.objects.filter(slug=slug).values_list("id", flat=True).first()
+        if book_id is None:
+            raise Http404("Book not found")
+
+        sort = request.GET.get("sort", "newest")
+        if sort not in REVIEW_SORTS:
+            return HttpResponseBadRequest(f"sort must be one of {', '.join(REVIEW_SORTS)}")
+        limit = request.GET.get("limit")
+        limit = min(int(limit), 50) if (limit and limit.isdigit() and int(limit) > 0) else 10
+        try:
+            after = decode_review_cursor(request.GET.get("cursor"), sort)
+        except InvalidCursor:
+            return HttpResponseBadRequest("Invalid cursor")
+
+        qs = (
+            BookReview.objects.filter(book_id=book_id, is_public=True)
+            .select_related("created_by")
+            .prefetch_related(Prefetch("sections", ReviewSection.objects.select_related("section_type").order_by("review_id", "order")))
+        )
+        reviews, next_cursor = review_page(qs, sort, limit, after)
+        data = {
+            "results": [serialize_book_review(review) for review in reviews],
+            "next": next_cursor,
+        }
+        return render(request, data)
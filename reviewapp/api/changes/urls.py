@@ -0,0 +1,10 @@
+from django.urls import path
+
+from reviewapp.api.changes.views import Feed
+
+
+app_name = "changes"
+
+urlpatterns = [
+    path("", Feed.as_view(), name="feed"),
+]
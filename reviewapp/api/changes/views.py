@@ -0,0 +1,42 @@
+from django.http import HttpResponseBadRequest
+from django.views import View
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt
+
+from reviewapp.apps.changes.feed import changes_since
+from reviewapp.core.pagination import InvalidCursor, decode_cursor, encode_cursor
+from reviewapp.core.renderers import render
+from reviewapp.core.routers import replica_reads
+from reviewapp.core.nplusone import budget
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+@method_decorator(replica_reads(), name="dispatch")
+@budget(16)
+class Feed(View):
+    """
+    GET /api/changes/
+    Optional query params:
+      - since=<next token of the previous response> (omit for everything)
+      - limit=<number> (default 100, max 1000)
+    Returns {"results": [{"seq", "type", "id", "action": "upsert"|"delete", "data"}, ...],
+             "next": <token>, "has_more": bool}.
+    Mirrors apply results in order and keep polling with `next`; each object
+    appears once, with its latest state.
+    """
+
+    max_limit = 1000
+
+    def get(self, request):
+        limit = request.GET.get("limit")
+        limit = min(int(limit), self.max_limit) if (limit and limit.isdigit() and int(limit) > 0) else 100
+        try:
+            since = decode_cursor(request.GET.get("since"), 1)
+        except InvalidCursor as exc:
+            return HttpResponseBadRequest(str(exc))
+        if since is not None and not isinstance(since[0], int):
+            return HttpResponseBadRequest("Malformed cursor")
+
+        results, last, more = changes_since(since[0] if since else 0, limit)
+        data = {"results": results, "next": encode_cursor(last), "has_more": more}
+        return render(request, data)
@@ -0,0 +1,10 @@
+from django.urls import path
+
+from reviewapp.api.creators.views import Works
+
+
+app_name = "creators"
+
+urlpatterns = [
+    path("<int:pk>/works/", Works.as_view(), name="works"),
+]
@@ -0,0 +1,27 @@
+from django.http import Http404
+from django.views import View
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt
+
+from reviewapp.apps.works.cache import creator_works
+from reviewapp.core.renderers import render
+from reviewapp.core.routers import replica_reads
+from reviewapp.core.nplusone import budget
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+@method_decorator(replica_reads(), name="dispatch")
+@budget(3)
+class Works(View):
+    """
+    GET /api/creators/<id>/works/
+    The creator with the movies they directed and the books they wrote, each
+    with its public average rating and review count. Cached until a credit,
+    title, review or the creator changes.
+    """
+
+    def get(self, request, pk):
+        data = creator_works(pk)
+        if data is None:
+            raise Http404("Creator not found")
+        return render(request, data)
@@ -0,0 +1,10 @@
+from django.urls import path
+
+from reviewapp.api.feed.views import Index
+
+
+app_name = "feed"
+
+urlpatterns = [
+    path("", Index.as_view(), name="index"),
+]
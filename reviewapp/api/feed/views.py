@@ -0,0 +1,40 @@
+from django.http import HttpResponseBadRequest
+from django.views import View
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt
+
+from reviewapp.core.pagination import InvalidCursor
+from reviewapp.core.reviews import decode_feed_cursor, feed_page
+from reviewapp.core.serializers import serialize_feed_review
+from reviewapp.core.renderers import render
+from reviewapp.core.routers import replica_reads
+from reviewapp.core.nplusone import budget
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+@method_decorator(replica_reads(), name="dispatch")
+@budget(3)
+class Index(View):
+    """
+    GET /api/feed/
+    Optional query params:
+      - limit=<number> (default 20, max 100)
+      - cursor=<next cursor of the previous page>
+    Latest public movie and book reviews in one stream, newest first:
+    {"results": [{"type": "movie"|"book", ..., "movie"|"book": {...}}], "next": <cursor>}.
+    """
+
+    def get(self, request):
+        limit = request.GET.get("limit")
+        limit = min(int(limit), 100) if (limit and limit.isdigit() and int(limit) > 0) else 20
+        try:
+            after = decode_feed_cursor(request.GET.get("cursor"))
+        except InvalidCursor:
+            return HttpResponseBadRequest("Invalid cursor")
+
+        reviews, next_cursor = feed_page(limit, after)
+        data = {
+            "results": [serialize_feed_review(review) for review in reviews],
+            "next": next_cursor,
+        }
+        return render(request, data)
@@ -1,11 +1,14 @@
 from django.urls import path
 
-from reviewapp.api.movies.views import Index, Details
+from reviewapp.api.movies.views import Index, Details, Batch, Reviews, Similar
 
 
 app_name = "movies"
 
 urlpatterns = [
     path("", Index.as_view(), name="index"),
+    path("batch/", Batch.as_view(), name="batch"),
     path("<slug:slug>/", Details.as_view(), name="details"),
+    path("<slug:slug>/reviews/", Reviews.as_view(), name="reviews"),
+    path("<slug:slug>/similar/", Similar.as_view(), name="similar"),
 ]
@@ -1,14 +1,30 @@
-from django.http import JsonResponse, Http404
+import json
+
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Prefetch
+from django.http import HttpResponseBadRequest, Http404
 from django.views import View
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.vary import vary_on_headers
 
-from reviewapp.apps.movies.models import Movie
-from reviewapp.core.serializers import serialize_movie
+from reviewapp.apps.documents.store import DETAIL_OPTIONS, encode, join_array, movie_cards, movie_detail, movie_details
+from reviewapp.apps.movies.models import Movie, MovieAspectRating, MovieReview
+from reviewapp.apps.similarity.models import MovieSimilarity
+from reviewapp.core.compression import accepted_encodings
+from reviewapp.core.pagination import InvalidCursor
+from reviewapp.core.reviews import REVIEW_SORTS, decode_review_cursor, review_page
+from reviewapp.core.serializers import serialize_movie, serialize_movie_review
 from reviewapp.core.querysets import movies_queryset_for_serialization
+from reviewapp.core.renderers import JSON, accepted_media_type, render, render_encoded
+from reviewapp.core.routers import get_state, replica_reads
+from reviewapp.core.singleflight import single_flight
+from reviewapp.core.nplusone import budget
 
 
 @method_decorator(csrf_exempt, name="dispatch")
+@method_decorator(replica_reads(), name="dispatch")
+@budget(9)
 class Index(View):
     """
     GET /api/movies
@@ -16,6 +32,7 @@ class Index(View):
       - verbose=true
       - include_reviews=true
       - include_aspects=true
+      - include_histograms=true (rating histograms in reviews_summary, needs verbose)
       - limit=<number> (limit results)
     """
 
@@ -23,11 +40,17 @@ class Index(View):
         verbose = request.GET.get("verbose", "false").lower() == "true"
         include_reviews = request.GET.get("include_reviews", "false").lower() == "true"
         include_aspects = request.GET.get("include_aspects", "false").lower() == "true"
+        include_histograms = verbose and request.GET.get("include_histograms", "false").lower() == "true"
         limit = request.GET.get("limit")
+        limit = int(limit) if (limit and limit.isdigit()) else None
+
+        if not (verbose or include_reviews or include_aspects):
+            # default listing is served from the pre-rendered document store
+            return render_encoded(request, movie_cards(limit))
 
-        qs = movies_queryset_for_serialization(Movie.objects.all())
-        if limit and limit.isdigit():
-            qs = qs[:int(limit)]
+        qs = movies_queryset_for_serialization(Movie.objects.all(), include_histograms=include_histograms)
+        if limit is not None:
+            qs = qs[:limit]
 
         data = [
             serialize_movie(
@@ -35,43 +58,218 @@ class Index(View):
                 verbose=verbose,
                 include_reviews=include_reviews,
                 include_aspects=include_aspects,
+                include_histograms=include_histograms,
             )
             for movie in qs
         ]
-        return JsonResponse(data, safe=False, json_dumps_params={"ensure_ascii": False})
+        return render(request, data)
 
 
 @method_decorator(csrf_exempt, name="dispatch")
+@method_decorator(replica_reads(), name="dispatch")
+@method_decorator(vary_on_headers("Accept-Encoding"), name="dispatch")
+@budget(10)
 class Details(View):
     """
     GET /api/movies/<slug>/
     Optional query params:
-      - verbose=true
-      - include_reviews=true
-      - include_aspects=true
+      - verbose=false
+      - include_reviews=false
+      - include_aspects=false
+      - include_histograms=true (rating histograms in reviews_summary)
       - reviews_limit=<number>
+    Reviews are embedded as summaries; full texts are paged by /api/movies/<slug>/reviews/.
+    The default payload is served pre-rendered, compressed when the client
+    sends a matching Accept-Encoding. Like every API view, it answers in
+    MessagePack when the client's Accept prefers application/msgpack.
     """
 
     def get(self, request, slug):
-        try:
+        reviews_limit = request.GET.get("reviews_limit")
+        reviews_limit = int(reviews_limit) if (reviews_limit and reviews_limit.isdigit()) else 5
+        include_histograms = request.GET.get("include_histograms", "false").lower() == "true"
+        options = dict(
+            verbose=request.GET.get("verbose", "true").lower() == "true",
+            include_reviews=request.GET.get("include_reviews", "true").lower() == "true",
+            include_aspects=request.GET.get("include_aspects", "true").lower() == "true",
+            reviews_limit=reviews_limit,
+            review_summaries=True,
+        )
+
+        if options == DETAIL_OPTIONS and not include_histograms:
+            # MessagePack is re-encoded from the stored JSON, which needs the identity form
+            encodings = accepted_encodings(request) if accepted_media_type(request) == JSON else ()
+            document = movie_detail(slug, encodings)
+            if document is not None:
+                encoding, body = document
+                return render_encoded(request, body, encoding)
+
+        def render():
             movie = movies_queryset_for_serialization(
-                Movie.objects.filter(slug=slug)
-            ).get(slug=slug)
-        except Movie.DoesNotExist:
+                Movie.objects.filter(slug=slug), include_histograms=include_histograms,
+            ).first()
+            if movie is None:
+                return None
+            return encode(serialize_movie(movie, include_histograms=include_histograms, **options))
+
+        # a featured title gets many identical requests at once; render it once for all of them.
+        # Only callers reading the same database share: a client pinned to the primary after
+        # a write must not be handed a body rendered from a lagging replica.
+        alias = get_state().read_alias or DEFAULT_DB_ALIAS
+        flags = "".join(str(int(options[name])) for name in ("verbose", "include_reviews", "include_aspects"))
+        body = single_flight(f"movies:details:{alias}:{slug}:{flags}{int(include_histograms)}:{reviews_limit}", render)
+        if body is None:
             raise Http404("Movie not found")
+        return render_encoded(request, body)
 
-        verbose = request.GET.get("verbose", "true").lower() == "true"
-        include_reviews = request.GET.get("include_reviews", "true").lower() == "true"
-        include_aspects = request.GET.get("include_aspects", "true").lower() == "true"
-        reviews_limit = request.GET.get("reviews_limit")
 
+@method_decorator(csrf_exempt, name="dispatch")
+@method_decorator(replica_reads(), name="dispatch")
+@budget(3)
+class Reviews(View):
+    """
+    GET /api/movies/<slug>/reviews/
+    Optional query params:
+      - sort=newest|oldest|highest|lowest (default newest)
+      - limit=<number> (default 10, max 50)
+      - cursor=<next cursor of the previous page>
+    Full public reviews with their aspect ratings, one keyset page at a time.
+    """
+
+    def get(self, request, slug):
+        movie_id = Movie.objects.filter(slug=slug).values_list("id", flat=True).first()
+        if movie_id is None:
+            raise Http404("Movie not found")
+
+        sort = request.GET.get("sort", "newest")
+        if sort not in REVIEW_SORTS:
+            return HttpResponseBadRequest(f"sort must be one of {', '.join(REVIEW_SORTS)}")
+        limit = request.GET.get("limit")
+        limit = min(int(limit), 50) if (limit and limit.isdigit() and int(limit) > 0) else 10
+        try:
+            after = decode_review_cursor(request.GET.get("cursor"), sort)
+        except InvalidCursor:
+            return HttpResponseBadRequest("Invalid cursor")
+
+        qs = (
+            MovieReview.objects.filter(movie_id=movie_id, is_public=True)
+            .select_related("created_by")
+            .prefetch_related(Prefetch("aspect_ratings", MovieAspectRating.objects.select_related("category")))
+        )
+        reviews, next_cursor = review_page(qs, sort, limit, after)
+        data = {
+            "results": [serialize_movie_review(review) for review in reviews],
+            "next": next_cursor,
+        }
+        return render(request, data)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+@method_decorator(replica_reads(), name="dispatch")
+@budget(10)
+class Batch(View):
+    """
+    GET /api/movies/batch/?slugs=a,b,c
+    POST /api/movies/batch/ for long lists, either as JSON
+        {"slugs": ["a", "b"], "reviews_limit": 3, "include_histograms": true}
+    or with form field slugs=a,b,c (or repeated)
+    Optional params (in a POST body, falling back to the query string):
+      - include_histograms=true
+      - reviews_limit=<number>
+    Returns {"results": [<Details payload>, ...], "missing": [<slug>, ...]};
+    results keep the requested order, unknown slugs are listed in missing.
+    """
+
+    max_slugs = 100
+    options = ("reviews_limit", "include_histograms")
+
+    def get(self, request):
+        return self.respond(request, request.GET.getlist("slugs"), request.GET)
+
+    def post(self, request):
+        if request.content_type == "application/json":
+            try:
+                body = json.loads(request.body or b"{}")
+            except ValueError:
+                return HttpResponseBadRequest("Body is not valid JSON")
+            if not isinstance(body, dict):
+                return HttpResponseBadRequest("Body must be a JSON object")
+            slugs = body.get("slugs", [])
+            slugs = [slugs] if isinstance(slugs, str) else slugs
+            if not isinstance(slugs, list) or not all(isinstance(slug, str) for slug in slugs):
+                return HttpResponseBadRequest("slugs must be a list of strings")
+            # JSON true/3 read like the query string's "true"/"3"
+            options = {name: str(body[name]).lower() for name in self.options if name in body}
+        else:
+            slugs = request.POST.getlist("slugs")
+            options = {name: request.POST[name] for name in self.options if name in request.POST}
+        fallback = {name: request.GET[name] for name in self.options if name in request.GET}
+        return self.respond(request, slugs, {**fallback, **options})
+
+    def respond(self, request, values, options):
+        slugs = []
+        for value in values:
+            slugs.extend(s.strip() for s in value.split(",") if s.strip())
+        slugs = list(dict.fromkeys(slugs))
+        if not slugs:
+            return HttpResponseBadRequest("slugs is required")
+        if len(slugs) > self.max_slugs:
+            return HttpResponseBadRequest(f"At most {self.max_slugs} slugs per request")
+
+        reviews_limit = options.get("reviews_limit")
         reviews_limit = int(reviews_limit) if (reviews_limit and reviews_limit.isdigit()) else 5
+        include_histograms = options.get("include_histograms", "false").lower() == "true"
 
-        data = serialize_movie(
-            movie,
-            verbose=True,
-            include_reviews=True,
-            include_aspects=True,
-            reviews_limit=reviews_limit,
+        stored = reviews_limit == DETAIL_OPTIONS["reviews_limit"] and not include_histograms
+        documents = movie_details(slugs) if stored else {}
+        remaining = [slug for slug in slugs if slug not in documents]
+        if remaining:
+            # one prefetch pass for everything the store could not answer
+            qs = movies_queryset_for_serialization(Movie.objects.filter(slug__in=remaining),
+                                                   include_histograms=include_histograms)
+            for movie in qs:
+                documents[movie.slug] = encode(serialize_movie(
+                    movie, **{**DETAIL_OPTIONS, "reviews_limit": reviews_limit}, include_histograms=include_histograms,
+                ))
+
+        missing = [slug for slug in slugs if slug not in documents]
+        body = (
+            b'{"results":' + join_array(documents[slug] for slug in slugs if slug in documents)
+            + b',"missing":' + encode(missing) + b"}"
         )
-        return JsonResponse(data, safe=False, json_dumps_params={"ensure_ascii": False})
+        return render_encoded(request, body)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+@method_decorator(replica_reads(), name="dispatch")
+@budget(2)
+class Similar(View):
+    """
+    GET /api/movies/<slug>/similar/
+    Optional query params:
+      - limit=<number> (default 10)
+    Served from the precomputed index (manage.py build_similarity).
+    """
+
+    def get(self, request, slug):
+        limit = request.GET.get("limit")
+        limit = int(limit) if (limit and limit.isdigit()) else 10
+
+        rows = list(
+            MovieSimilarity.objects
+            .filter(movie__slug=slug)
+            .order_by("rank")
+            .values_list("score", "similar_id", "similar__title", "similar__slug", "similar__release_year")
+            [:limit]
+        )
+        if not rows and not Movie.objects.filter(slug=slug).exists():
+            raise Http404("Movie not found")
+
+        data = {
+            "slug": slug,
+            "results": [
+                {"id": pk, "title": title, "slug": similar_slug, "release_year": year, "score": round(score, 4)}
+                for score, pk, title, similar_slug, year in rows
+            ],
+        }
+        return render(request, data)
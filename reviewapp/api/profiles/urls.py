@@ -0,0 +1,11 @@
+from django.urls import path
+
+from reviewapp.api.profiles.views import Index, Details
+
+
+app_name = "profiles"
+
+urlpatterns = [
+    path("", Index.as_view(), name="index"),
+    path("<str:name>/", Details.as_view(), name="details"),
+]
@@ -0,0 +1,46 @@
+from django.http import Http404
+from django.views import View
+
+from reviewapp.core.profiling import list_profiles, load_profile
+from reviewapp.core.renderers import render
+
+
+class Index(View):
+    """
+    GET /api/profiles/  (staff only)
+    Requests captured by ProfilingMiddleware, slowest first.
+    Optional query params:
+      - limit=<number> (default 50)
+    """
+
+    def get(self, request):
+        if not request.user.is_staff:
+            return render(request, {"detail": "Staff only"}, status=403)
+        limit = request.GET.get("limit")
+        limit = int(limit) if (limit and limit.isdigit()) else 50
+        return render(request, list_profiles(limit))
+
+
+class Details(View):
+    """
+    GET /api/profiles/<name>/  (staff only)
+    Hottest functions by cumulative time.
+    Optional query params:
+      - all=true (every function, not only the serializers and querysets)
+      - limit=<number> (default 30)
+    """
+
+    def get(self, request, name):
+        if not request.user.is_staff:
+            return render(request, {"detail": "Staff only"}, status=403)
+        limit = request.GET.get("limit")
+        limit = int(limit) if (limit and limit.isdigit()) else 30
+        everything = request.GET.get("all", "false").lower() == "true"
+
+        kwargs = {"limit": limit}
+        if everything:
+            kwargs["focus"] = None
+        data = load_profile(name, **kwargs)
+        if data is None:
+            raise Http404("Profile not found")
+        return render(request, data)
@@ -0,0 +1,10 @@
+from django.urls import path
+
+from reviewapp.api.reviewers.views import Profile
+
+
+app_name = "reviewers"
+
+urlpatterns = [
+    path("<str:username>/", Profile.as_view(), name="profile"),
+]
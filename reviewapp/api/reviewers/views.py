@@ -0,0 +1,148 @@
+from django.contrib.auth.models import User
+from django.db.models import Q
+from django.http import Http404, HttpResponseBadRequest
+from django.utils.dateparse import parse_datetime
+from django.views import View
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt
+
+from reviewapp.apps.books.models import BookReview
+from reviewapp.apps.movies.models import MovieReview
+from reviewapp.apps.stats.models import MEDIA, ReviewerStats
+from reviewapp.core.pagination import InvalidCursor, decode_cursor, encode_cursor
+from reviewapp.core.renderers import render
+from reviewapp.core.routers import replica_reads
+from reviewapp.core.nplusone import budget
+
+from typing import Optional
+
+
+RECENT_SOURCES = (
+    # (media, model, title relation); on equal `created` the higher media sorts first
+    (MEDIA.MOVIE, MovieReview, "movie"),
+    (MEDIA.BOOK, BookReview, "book"),
+)
+
+
+def decode_recent_cursor(token: Optional[str]) -> Optional[list]:
+    """[created, media, id] of a recent_reviews cursor, None for the first page; InvalidCursor for garbage."""
+    cursor = decode_cursor(token, 3)
+    if cursor is None:
+        return None
+    created, media, pk = cursor
+    try:
+        created = parse_datetime(created) if isinstance(created, str) else None
+    except ValueError:
+        created = None
+    if created is None or not all(isinstance(value, int) and not isinstance(value, bool) for value in (media, pk)):
+        raise InvalidCursor("Malformed cursor")
+    if media not in {source[0] for source in RECENT_SOURCES}:
+        raise InvalidCursor("Malformed cursor")
+    return [created, media, pk]
+
+
+def recent_reviews(user: User, limit: int, cursor=None) -> tuple:
+    """
+    One keyset page of the user's public reviews across both media, newest
+    first, ordered by (created, media, id) descending. Each media is read
+    with a bounded range scan on its (created_by, created) index.
+    """
+    items = []
+    for media, model, title in RECENT_SOURCES:
+        qs = model.objects.filter(created_by=user, is_public=True)
+        if cursor is not None:
+            created, cursor_media, cursor_id = cursor
+            if media < cursor_media:
+                qs = qs.filter(created__lte=created)
+            elif media == cursor_media:
+                qs = qs.filter(Q(created__lt=created) | Q(created=created, id__lt=cursor_id))
+            else:
+                qs = qs.filter(created__lt=created)
+        rows = (
+            qs.order_by("-created", "-id")
+            .values_list("id", "created", "overall_rating", "review_summary",
+                         f"{title}_id", f"{title}__title", f"{title}__slug")
+            [:limit + 1]
+        )
+        items.extend((created, media, pk, rest) for pk, created, *rest in rows)
+
+    items.sort(key=lambda item: item[:3], reverse=True)
+    page, more = items[:limit], len(items) > limit
+    next_cursor = None
+    if more and page:
+        created, media, pk, _ = page[-1]
+        next_cursor = encode_cursor(created.isoformat(), media, pk)
+
+    results = [
+        {
+            "media": MEDIA[media].lower(),
+            "id": pk,
+            "overall_rating": rating,
+            "review_summary": summary,
+            "title": {"id": title_id, "title": title, "slug": slug},
+            "created": created,
+        }
+        for created, media, pk, (rating, summary, title_id, title, slug) in page
+    ]
+    return results, next_cursor
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+@method_decorator(replica_reads(), name="dispatch")
+@budget(4)
+class Profile(View):
+    """
+    GET /api/reviewers/<username>/
+    Optional query params:
+      - limit=<number> (recent reviews per page, default 10, max 50)
+      - cursor=<next cursor of the previous page>
+    """
+
+    def get(self, request, username):
+        try:
+            user = User.objects.select_related("review_stats").get(username=username)
+        except User.DoesNotExist:
+            raise Http404("Reviewer not found")
+
+        limit = request.GET.get("limit")
+        limit = min(int(limit), 50) if (limit and limit.isdigit() and int(limit) > 0) else 10
+        try:
+            cursor = decode_recent_cursor(request.GET.get("cursor"))
+        except InvalidCursor:
+            return HttpResponseBadRequest("Invalid cursor")
+
+        try:
+            stats = user.review_stats
+        except ReviewerStats.DoesNotExist:
+            stats = ReviewerStats(user=user)
+
+        distribution = {str(bucket): 0 for bucket in range(1, 11)}
+        by_media = {MEDIA.MOVIE: dict(distribution), MEDIA.BOOK: dict(distribution)}
+        for media, bucket, count in user.rating_buckets.values_list("media", "bucket", "count"):
+            by_media[media][str(bucket)] = count
+            distribution[str(bucket)] += count
+
+        reviews, next_cursor = recent_reviews(user, limit, cursor)
+
+        data = {
+            "id": user.id,
+            "username": user.username,
+            "stats": {
+                "total_reviews": stats.total_reviews,
+                "average_rating": stats.average_rating,
+                "rating_distribution": distribution,
+                "movies": {
+                    "count": stats.movie_reviews,
+                    "average_rating": stats.movie_rating_sum / stats.movie_reviews if stats.movie_reviews else None,
+                    "rating_distribution": by_media[MEDIA.MOVIE],
+                },
+                "books": {
+                    "count": stats.book_reviews,
+                    "average_rating": stats.book_rating_sum / stats.book_reviews if stats.book_reviews else None,
+                    "rating_distribution": by_media[MEDIA.BOOK],
+                },
+            },
+            "recent_reviews": reviews,
+            "next": next_cursor,
+        }
+        return render(request, data)
@@ -0,0 +1,259 @@
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from reviewapp.api.analytics.views import AspectAverages
+from reviewapp.api.books.views import Reviews as BookReviews
+from reviewapp.api.changes.views import Feed as Changes
+from reviewapp.api.creators.views import Works
+from reviewapp.api.feed.views import Index as ReviewFeed
+from reviewapp.api.movies.views import Batch, Details, Index, Reviews, Similar
+from reviewapp.api.reviewers.views import Profile
+from reviewapp.apps.books.models import Book, BookReview
+from reviewapp.apps.documents.store import rebuild_all
+from reviewapp.apps.metadata.models import Creator
+from reviewapp.apps.movies.models import Movie, MovieReview
+from reviewapp.apps.stats.models import MEDIA
+from reviewapp.core.nplusone import QueryBudgetExceeded, query_budget
+from reviewapp.core.pagination import encode_cursor
+from reviewapp.core.querysets import (
+    books_queryset_for_serialization, creators_queryset_for_works, movies_queryset_for_serialization,
+)
+from reviewapp.core.serializers import serialize_book, serialize_creator_works, serialize_movie
+from reviewapp.core.testing import seed_catalogue
+
+
+class QueryBudgetTests(TestCase):
+    """Every view and serializer stays within its declared @budget, however many titles there are."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.catalogue = seed_catalogue(movies=5, books=4, reviewers=4)
+
+    def get(self, view, path: str, params=None):
+        with query_budget(view.query_budget):
+            response = self.client.get(path, params or {})
+        self.assertEqual(response.status_code, 200, path)
+        return response
+
+    def test_movie_views(self):
+        movie = self.catalogue.movies[0]
+        self.get(Index, "/api/movies/")
+        self.get(Index, "/api/movies/", {"verbose": "true", "include_reviews": "true", "include_aspects": "true",
+                                         "include_histograms": "true"})
+        self.get(Details, f"/api/movies/{movie.slug}/")
+        self.get(Details, f"/api/movies/{movie.slug}/", {"include_histograms": "true"})
+        self.get(Batch, "/api/movies/batch/", {"slugs": ",".join(m.slug for m in self.catalogue.movies)})
+        self.get(Reviews, f"/api/movies/{movie.slug}/reviews/", {"sort": "highest"})
+        self.get(Similar, f"/api/movies/{movie.slug}/similar/")
+
+    def test_movie_views_from_stored_documents(self):
+        rebuild_all()
+        movie = self.catalogue.movies[0]
+        self.get(Index, "/api/movies/")
+        self.get(Details, f"/api/movies/{movie.slug}/")
+        self.get(Batch, "/api/movies/batch/", {"slugs": ",".join(m.slug for m in self.catalogue.movies)})
+
+    def test_book_views(self):
+        self.get(BookReviews, f"/api/books/{self.catalogue.books[0].slug}/reviews/")
+        self.get(BookReviews, f"/api/books/{self.catalogue.books[0].slug}/reviews/", {"sort": "lowest"})
+
+    def test_feed_and_profile_views(self):
+        self.get(Changes, "/api/changes/")
+        self.get(ReviewFeed, "/api/feed/")
+        self.get(Profile, f"/api/reviewers/{self.catalogue.users[0].username}/")
+        self.get(Works, f"/api/creators/{self.catalogue.directors[0].pk}/works/")
+        self.get(Works, f"/api/creators/{self.catalogue.authors[0].pk}/works/")
+
+    def test_analytics_views(self):
+        self.client.force_login(User.objects.create(username="staff", is_staff=True))
+        for by in ("all", "genre", "decade", "country"):
+            response = self.get(AspectAverages, "/api/analytics/aspects/", {"by": by})
+            self.assertTrue(response.json())
+
+    def test_serializers_issue_no_queries_on_prefetched_input(self):
+        movies = list(movies_queryset_for_serialization(Movie.objects.all(), include_histograms=True))
+        with query_budget(serialize_movie.query_budget):
+            for movie in movies:
+                serialize_movie(movie, include_histograms=True)
+
+        books = list(books_queryset_for_serialization(Book.objects.all(), include_histograms=True))
+        with query_budget(serialize_book.query_budget):
+            for book in books:
+                serialize_book(book, verbose=True, include_reviews=True, include_histograms=True)
+
+        creators = list(creators_queryset_for_works(Creator.objects.all()))
+        with query_budget(serialize_creator_works.query_budget):
+            for creator in creators:
+                serialize_creator_works(creator)
+
+    def test_unprefetched_input_goes_over_budget(self):
+        movies = list(Movie.objects.all())
+        with self.assertRaises(QueryBudgetExceeded):
+            with query_budget(serialize_movie.query_budget):
+                for movie in movies:
+                    serialize_movie(movie)
+
+
+class ReviewerProfileTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.catalogue = seed_catalogue(movies=5, books=4, reviewers=2)
+        cls.user = cls.catalogue.users[0]
+        # a movie and a book review written at the same instant sort by media, then id
+        tie = timezone.now()
+        MovieReview.objects.filter(created_by=cls.user, movie=cls.catalogue.movies[0]).update(created=tie)
+        BookReview.objects.filter(created_by=cls.user, book=cls.catalogue.books[0]).update(created=tie)
+
+    def profile(self, **params) -> dict:
+        response = self.client.get(f"/api/reviewers/{self.user.username}/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def expected_stats(self) -> dict:
+        movies = list(MovieReview.objects.filter(created_by=self.user, is_public=True)
+                      .values_list("overall_rating", flat=True))
+        books = list(BookReview.objects.filter(created_by=self.user, is_public=True)
+                     .values_list("overall_rating", flat=True))
+        return {
+            "total_reviews": len(movies) + len(books),
+            "movies": len(movies),
+            "books": len(books),
+            "average_rating": sum(movies + books) / len(movies + books),
+        }
+
+    def assertStatsMatch(self, stats: dict):
+        expected = self.expected_stats()
+        self.assertEqual(stats["total_reviews"], expected["total_reviews"])
+        self.assertEqual(stats["movies"]["count"], expected["movies"])
+        self.assertEqual(stats["books"]["count"], expected["books"])
+        self.assertAlmostEqual(stats["average_rating"], expected["average_rating"])
+        self.assertEqual(sum(stats["rating_distribution"].values()), expected["total_reviews"])
+        self.assertEqual(sum(stats["movies"]["rating_distribution"].values()), expected["movies"])
+
+    def test_stats_follow_added_and_hidden_reviews(self):
+        before = self.profile()["stats"]
+        self.assertStatsMatch(before)
+
+        movie = Movie.objects.create(title="Extra", release_year=2020, runtime=100)
+        MovieReview.objects.create(movie=movie, overall_rating=10, detailed_review="text", final_verdict="verdict",
+                                   created_by=self.user)
+        after = self.profile()["stats"]
+        self.assertStatsMatch(after)
+        self.assertEqual(after["movies"]["count"], before["movies"]["count"] + 1)
+        self.assertEqual(after["rating_distribution"]["10"], before["rating_distribution"]["10"] + 1)
+
+        review = BookReview.objects.filter(created_by=self.user, is_public=True).first()
+        review.is_public = False
+        review.save()
+        hidden = self.profile()["stats"]
+        self.assertStatsMatch(hidden)
+        self.assertEqual(hidden["books"]["count"], after["books"]["count"] - 1)
+
+    def test_cursor_pages_through_every_public_review_once(self):
+        expected = sorted(
+            [(created, MEDIA.MOVIE, pk) for pk, created in
+             MovieReview.objects.filter(created_by=self.user, is_public=True).values_list("id", "created")]
+            + [(created, MEDIA.BOOK, pk) for pk, created in
+               BookReview.objects.filter(created_by=self.user, is_public=True).values_list("id", "created")],
+            reverse=True,
+        )
+        seen, cursor = [], None
+        while True:
+            page = self.profile(limit=2, **({"cursor": cursor} if cursor else {}))
+            self.assertLessEqual(len(page["recent_reviews"]), 2)
+            seen.extend((review["media"], review["id"]) for review in page["recent_reviews"])
+            cursor = page["next"]
+            if cursor is None:
+                break
+        self.assertEqual(seen, [(MEDIA[media].lower(), pk) for _, media, pk in expected])
+
+    def test_malformed_cursors_are_rejected(self):
+        created = timezone.now().isoformat()
+        for cursor in (
+            "garbage!",
+            encode_cursor(created, MEDIA.MOVIE),
+            encode_cursor("yesterday", MEDIA.MOVIE, 1),
+            encode_cursor(created, 99, 1),
+            encode_cursor(created, True, 1),
+            encode_cursor(created, MEDIA.BOOK, "1"),
+        ):
+            response = self.client.get(f"/api/reviewers/{self.user.username}/", {"cursor": cursor})
+            self.assertEqual(response.status_code, 400, cursor)
+
+    def test_unknown_reviewer(self):
+        self.assertEqual(self.client.get("/api/reviewers/nobody/").status_code, 404)
+
+
+class BatchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.catalogue = seed_catalogue(movies=3, books=0, reviewers=3)
+        cls.slugs = [movie.slug for movie in cls.catalogue.movies]
+
+    def post_json(self, body, query: str = ""):
+        return self.client.post(f"/api/movies/batch/{query}", json.dumps(body), content_type="application/json")
+
+    def summary(self, response) -> list:
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        return [movie["slug"] for movie in data["results"]], data["missing"]
+
+    def test_results_keep_the_requested_order_and_list_missing_slugs(self):
+        expected = ([self.slugs[2], self.slugs[0]], ["nope", "gone"])
+        slugs = [self.slugs[2], "nope", self.slugs[0], "gone", self.slugs[2]]
+        self.assertEqual(self.summary(self.client.get("/api/movies/batch/", {"slugs": ",".join(slugs)})), expected)
+        self.assertEqual(self.summary(self.client.post("/api/movies/batch/", {"slugs": slugs})), expected)
+        self.assertEqual(self.summary(self.post_json({"slugs": slugs})), expected)
+
+    def test_options_from_the_json_body_fall_back_to_the_query_string(self):
+        def reviews(response):
+            self.assertEqual(response.status_code, 200)
+            return [(len(movie["reviews"]), "histogram" in movie["reviews_summary"])
+                    for movie in response.json()["results"]]
+
+        public = [movie.reviews.filter(is_public=True).count() for movie in self.catalogue.movies]
+        self.assertEqual(reviews(self.post_json({"slugs": self.slugs})), [(count, False) for count in public])
+        self.assertEqual(reviews(self.post_json({"slugs": self.slugs, "reviews_limit": 1, "include_histograms": True})),
+                         [(1, True)] * 3)
+        self.assertEqual(reviews(self.post_json({"slugs": self.slugs}, "?reviews_limit=1&include_histograms=true")),
+                         [(1, True)] * 3)
+        # the body wins over the query string
+        self.assertEqual(reviews(self.post_json({"slugs": self.slugs, "include_histograms": False},
+                                                "?include_histograms=true")),
+                         [(count, False) for count in public])
+        self.assertEqual(reviews(self.client.post("/api/movies/batch/", {"slugs": self.slugs, "reviews_limit": "1"})),
+                         [(1, False)] * 3)
+
+    def test_slug_limit(self):
+        slugs = [f"movie-{i}" for i in range(Batch.max_slugs)]
+        self.assertEqual(self.client.get("/api/movies/batch/", {"slugs": ",".join(slugs)}).status_code, 200)
+        self.assertEqual(self.post_json({"slugs": slugs}).status_code, 200)
+
+        slugs.append("one-too-many")
+        self.assertEqual(self.client.get("/api/movies/batch/", {"slugs": ",".join(slugs)}).status_code, 400)
+        self.assertEqual(self.client.post("/api/movies/batch/", {"slugs": slugs}).status_code, 400)
+        self.assertEqual(self.post_json({"slugs": slugs}).status_code, 400)
+
+    def test_bad_requests(self):
+        self.assertEqual(self.client.get("/api/movies/batch/").status_code, 400)
+        self.assertEqual(self.post_json({"slugs": []}).status_code, 400)
+        self.assertEqual(self.post_json({"slugs": [1, 2]}).status_code, 400)
+        self.assertEqual(self.post_json(["movie-0"]).status_code, 400)
+        response = self.client.post("/api/movies/batch/", "{not json", content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_reserved_slug_is_rewritten(self):
+        movie = Movie.objects.create(title="Batch", release_year=1999, runtime=100)
+        self.assertEqual(movie.slug, "batch-1999")
+        movie = Movie.objects.create(title="Something else", slug="batch", release_year=2001, runtime=100)
+        self.assertEqual(movie.slug, "batch-2001")
+
+        self.assertEqual(self.client.get("/api/movies/batch-1999/").json()["title"], "Batch")
+        # /api/movies/batch/ stays the batch endpoint
+        self.assertEqual(self.summary(self.client.get("/api/movies/batch/", {"slugs": "batch-1999,batch"})),
+                         (["batch-1999"], ["batch"]))
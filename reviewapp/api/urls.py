@@ -5,4 +5,11 @@ app_name = "api"
 
 urlpatterns = [
     path('movies/', include('reviewapp.api.movies.urls')),
+    path('books/', include('reviewapp.api.books.urls')),
+    path('reviewers/', include('reviewapp.api.reviewers.urls')),
+    path('analytics/', include('reviewapp.api.analytics.urls')),
+    path('changes/', include('reviewapp.api.changes.urls')),
+    path('profiles/', include('reviewapp.api.profiles.urls')),
+    path('feed/', include('reviewapp.api.feed.urls')),
+    path('creators/', include('reviewapp.api.creators.urls')),
 ]
@@ -1,8 +1,38 @@
 from django.contrib import admin
 
+from reviewapp.core.admin import LargeTableAdmin
+
 from .models import Book, BookReview, ReviewSection, ReviewSectionType
 
-admin.site.register(Book)
-admin.site.register(BookReview)
-admin.site.register(ReviewSectionType)
-admin.site.register(ReviewSection)
+
+@admin.register(Book)
+class BookAdmin(LargeTableAdmin):
+    list_display = ("title", "publication_year", "publisher", "isbn")
+    list_filter = ("category",)
+    search_fields = ("^title", "slug__exact", "isbn__exact")
+    autocomplete_fields = ("authors", "category", "language", "country")
+
+
+@admin.register(BookReview)
+class BookReviewAdmin(LargeTableAdmin):
+    list_display = ("__str__", "is_public", "created")
+    list_filter = ("is_public",)
+    list_select_related = ("book", "created_by")
+    # title only: OR-ing a second table into the search defeats both indexes.
+    # A reviewer's reviews are at ?created_by__id__exact=<user id>.
+    search_fields = ("^book__title",)
+    autocomplete_fields = ("book", "created_by")
+
+
+@admin.register(ReviewSectionType)
+class ReviewSectionTypeAdmin(admin.ModelAdmin):
+    list_display = ("name", "suggested_for", "is_active")
+    list_filter = ("is_active", "suggested_for")
+
+
+@admin.register(ReviewSection)
+class ReviewSectionAdmin(LargeTableAdmin):
+    list_display = ("__str__", "title", "order")
+    list_filter = ("section_type",)
+    list_select_related = ("review__book", "section_type")
+    raw_id_fields = ("review",)
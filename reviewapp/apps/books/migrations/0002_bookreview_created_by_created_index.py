@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-19 01:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bookreview',
+            index=models.Index(fields=['created_by', 'created'], name='books_bookr_created_6bf745_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-19 01:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0002_bookreview_created_by_created_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bookreview',
+            index=models.Index(fields=['book', 'overall_rating'], name='books_bookr_book_id_da489a_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0003_bookreview_book_rating_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bookreview',
+            index=models.Index(condition=models.Q(('is_public', True)), fields=['book', '-created', '-id', 'overall_rating', 'created_by', 'is_public'], name='books_review_public_recent'),
+        ),
+        migrations.AddIndex(
+            model_name='bookreview',
+            index=models.Index(condition=models.Q(('is_public', True)), fields=['book', '-overall_rating', '-id', 'created', 'created_by', 'is_public'], name='books_review_public_rating'),
+        ),
+        migrations.AddIndex(
+            model_name='reviewsection',
+            index=models.Index(fields=['review', 'order'], name='books_section_review_order'),
+        ),
+    ]
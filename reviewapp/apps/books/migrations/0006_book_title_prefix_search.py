@@ -0,0 +1,14 @@
+from django.db import migrations
+
+from reviewapp.core.indexes import AddPrefixSearchIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0005_public_review_feed_index'),
+    ]
+
+    operations = [
+        AddPrefixSearchIndex('book', 'title', name='books_book_title_prefix'),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:42
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0006_book_title_prefix_search'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='bookreview',
+            name='books_bookr_book_id_84140e_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='bookreview',
+            name='books_bookr_book_id_da489a_idx',
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth.models import User
 from django.urls import reverse
 
@@ -75,8 +76,24 @@ class BookReview(models.Model):
         ordering = ['-created']
         unique_together = ['book', 'created_by']  # One review per user per book
         indexes = [
-            models.Index(fields=['book', 'created']),
             models.Index(fields=['overall_rating']),
+            models.Index(fields=['created_by', 'created']),
+            # public-review access paths: a title's reviews newest first and by
+            # rating. Pages read rows in index order without a sort; the
+            # rating aggregates are answered from the index alone, since the
+            # summary's scalar columns (and is_public, which SQLite needs to
+            # cover the predicate) are trailing keys rather than INCLUDE columns.
+            # They replace the plain (title, created) / (title, rating) indexes.
+            models.Index(
+                fields=['book', '-created', '-id', 'overall_rating', 'created_by', 'is_public'],
+                condition=Q(is_public=True), name='books_review_public_recent',
+            ),
+            models.Index(
+                fields=['book', '-overall_rating', '-id', 'created', 'created_by', 'is_public'],
+                condition=Q(is_public=True), name='books_review_public_rating',
+            ),
+            # the cross-media feed (newest first across all titles)
+            models.Index(fields=['-created', '-id'], condition=Q(is_public=True), name='books_review_public_feed'),
         ]
         verbose_name = "Book Review"
         verbose_name_plural = "Book Reviews"
@@ -126,6 +143,9 @@ class ReviewSection(models.Model):
 
     class Meta:
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['review', 'order'], name='books_section_review_order'),
+        ]
 
     def __str__(self):
         return f"{self.review.book.title} - {self.section_type.name}"
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class ChangesConfig(AppConfig):
+    name = 'reviewapp.apps.changes'
+
+    def ready(self):
+        from . import signals  # noqa
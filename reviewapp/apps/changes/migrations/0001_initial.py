@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-19 01:54
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('seq', models.BigAutoField(primary_key=True, serialize=False)),
+                ('kind', models.PositiveSmallIntegerField(choices=[(1, 'movie'), (2, 'book'), (3, 'movie_review'), (4, 'book_review'), (5, 'aspect_rating')])),
+                ('object_id', models.PositiveIntegerField()),
+                ('changed', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'object_id'], name='changes_cha_kind_35e3ca_idx')],
+            },
+        ),
+    ]
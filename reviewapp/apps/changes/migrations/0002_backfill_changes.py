@@ -0,0 +1,35 @@
+from django.db import migrations
+
+
+# (app label, model, change kind); a feed read from the start is then a full snapshot
+SOURCES = [
+    ('movies', 'Movie', 1),
+    ('books', 'Book', 2),
+    ('movies', 'MovieReview', 3),
+    ('books', 'BookReview', 4),
+    ('movies', 'MovieAspectRating', 5),
+]
+
+
+def backfill(apps, schema_editor):
+    Change = apps.get_model('changes', 'Change')
+    for app_label, model_name, kind in SOURCES:
+        ids = apps.get_model(app_label, model_name).objects.order_by('id').values_list('id', flat=True)
+        Change.objects.bulk_create([Change(kind=kind, object_id=pk) for pk in ids.iterator()], batch_size=1000)
+
+
+def clear(apps, schema_editor):
+    apps.get_model('changes', 'Change').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('changes', '0001_initial'),
+        ('movies', '0004_moviereview_created_by_created_index'),
+        ('books', '0002_bookreview_created_by_created_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, clear),
+    ]
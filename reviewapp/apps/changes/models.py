@@ -0,0 +1,36 @@
+from django.db import models
+from django.utils import timezone
+
+from model_utils.choices import Choices
+
+
+KIND = Choices(
+    (1, 'MOVIE', 'movie'),
+    (2, 'BOOK', 'book'),
+    (3, 'MOVIE_REVIEW', 'movie_review'),
+    (4, 'BOOK_REVIEW', 'book_review'),
+    (5, 'ASPECT_RATING', 'aspect_rating'),
+)
+
+
+class Change(models.Model):
+    """
+    Latest change of a catalog object, in commit order. Each object keeps
+    a single row: a new change replaces it with one at the end of the
+    sequence. Whether it is an update or a delete is decided when the feed is
+    read, from whether the object is still there (and public).
+    """
+    KIND = KIND
+
+    seq = models.BigAutoField(primary_key=True)
+    kind = models.PositiveSmallIntegerField(choices=KIND)
+    object_id = models.PositiveIntegerField()
+    changed = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['kind', 'object_id']),
+        ]
+
+    def __str__(self):
+        return f"#{self.seq} {self.get_kind_display()} {self.object_id}"
@@ -0,0 +1,111 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from reviewapp.apps.books.models import Book, BookReview, ReviewSection, ReviewSectionType
+from reviewapp.apps.metadata.models import Country, Creator, Genre, Language
+from reviewapp.apps.movies.models import Movie, MovieAspectRating, MovieReview, MovieReviewCategory
+
+from .models import KIND
+from .tracking import record
+
+
+TRACKED = {
+    Movie: KIND.MOVIE,
+    Book: KIND.BOOK,
+    MovieReview: KIND.MOVIE_REVIEW,
+    BookReview: KIND.BOOK_REVIEW,
+    MovieAspectRating: KIND.ASPECT_RATING,
+}
+
+
+def object_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        record(TRACKED[sender], [instance.pk])
+
+
+for model in TRACKED:
+    label = model._meta.label_lower
+    post_save.connect(object_changed, sender=model, dispatch_uid=f"changes_{label}_saved")
+    post_delete.connect(object_changed, sender=model, dispatch_uid=f"changes_{label}_deleted")
+
+
+# aspect ratings are only in the feed while their review is public, so
+# publishing or withdrawing a review upserts or deletes them as well
+@receiver(pre_save, sender=MovieReview)
+def review_visibility_loaded(sender, instance, raw=False, using=None, **kwargs):
+    if not raw and instance.pk is not None:
+        instance._was_public = (
+            sender.objects.using(using).filter(pk=instance.pk).values_list("is_public", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=MovieReview)
+def review_visibility_changed(sender, instance, created, raw=False, **kwargs):
+    if raw or created or getattr(instance, "_was_public", instance.is_public) == instance.is_public:
+        return
+    record(KIND.ASPECT_RATING, instance.aspect_ratings.values_list("id", flat=True))
+
+
+# M2M relations embedded in the movie and book payloads: through model -> (kind, owner, field)
+RELATIONS = {
+    **{getattr(Movie, field).through: (KIND.MOVIE, Movie, field) for field in ("genre", "director", "language", "country")},
+    **{getattr(Book, field).through: (KIND.BOOK, Book, field) for field in ("authors", "category", "language", "country")},
+}
+
+
+def relation_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    kind, owner, field = RELATIONS[sender]
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            record(kind, [instance.pk])
+    elif action == "pre_clear":
+        record(kind, owner.objects.filter(**{field: instance.pk}).values_list("id", flat=True))
+    elif action in ("post_add", "post_remove"):
+        record(kind, pk_set)
+
+
+for through, (kind, owner, field) in RELATIONS.items():
+    m2m_changed.connect(relation_changed, sender=through,
+                        dispatch_uid=f"changes_{owner._meta.model_name}_{field}_changed")
+
+
+# metadata is embedded in titles; pre_delete because the M2M rows cascade away
+@receiver([post_save, pre_delete], sender=Genre)
+@receiver([post_save, pre_delete], sender=Creator)
+@receiver([post_save, pre_delete], sender=Language)
+@receiver([post_save, pre_delete], sender=Country)
+def metadata_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    for through, (kind, owner, field) in RELATIONS.items():
+        if owner._meta.get_field(field).related_model is sender:
+            record(kind, owner.objects.filter(**{field: instance.pk}).values_list("id", flat=True))
+
+
+@receiver(post_save, sender=MovieReviewCategory)
+def category_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        record(KIND.ASPECT_RATING, MovieAspectRating.objects.filter(category=instance).values_list("id", flat=True))
+
+
+@receiver([post_save, post_delete], sender=ReviewSection)
+def section_changed(sender, instance, raw=False, **kwargs):
+    # sections are part of the book review payload
+    if not raw:
+        record(KIND.BOOK_REVIEW, [instance.review_id])
+
+
+@receiver(post_save, sender=ReviewSectionType)
+def section_type_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        record(KIND.BOOK_REVIEW, ReviewSection.objects.filter(section_type=instance).values_list("review_id", flat=True))
+
+
+@receiver(post_save, sender=User)
+def reviewer_changed(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    # only the username is embedded in reviews
+    if raw or created or (update_fields is not None and "username" not in update_fields):
+        return
+    record(KIND.MOVIE_REVIEW, MovieReview.objects.filter(created_by=instance).values_list("id", flat=True))
+    record(KIND.BOOK_REVIEW, BookReview.objects.filter(created_by=instance).values_list("id", flat=True))
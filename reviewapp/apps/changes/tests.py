@@ -0,0 +1,100 @@
+from django.contrib.auth.models import User
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.test import TestCase, override_settings
+
+from reviewapp.apps.books.models import Book, BookReview, ReviewSection, ReviewSectionType
+from reviewapp.apps.movies.models import Movie, MovieAspectRating, MovieReview, MovieReviewCategory
+from reviewapp.core.pagination import encode_cursor
+
+from . import tracking
+from .models import KIND, Change
+
+
+@override_settings(CHANGES_SETTLE_SECONDS=0)
+class ReviewVisibilityTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(username="reviewer")
+        movie = Movie.objects.create(title="Alien", release_year=1979, runtime=117)
+        cls.movie_review = MovieReview.objects.create(movie=movie, overall_rating=9, detailed_review="text",
+                                                      final_verdict="great", created_by=user)
+        cls.aspects = [
+            MovieAspectRating.objects.create(review=cls.movie_review, category=category, rating=8)
+            for category in (MovieReviewCategory.objects.create(name=f"Aspect {i}") for i in range(2))
+        ]
+        book = Book.objects.create(title="Dune", publication_year=1965)
+        cls.book_review = BookReview.objects.create(book=book, overall_rating=8, detailed_review="text",
+                                                    final_verdict="good", created_by=user)
+        plot = ReviewSectionType.objects.create(name="Plot", suggested_for=ReviewSectionType.SUGGESTED_GENRES.ALL)
+        ReviewSection.objects.create(review=cls.book_review, section_type=plot, content="text")
+
+    def setUp(self):
+        self.since = encode_cursor(Change.objects.order_by("-seq").values_list("seq", flat=True).first() or 0)
+
+    def changes(self) -> list:
+        """(type, id, action) of the feed entries after ``self.since``."""
+        response = self.client.get("/api/changes/", {"since": self.since})
+        self.assertEqual(response.status_code, 200)
+        return sorted((entry["type"], entry["id"], entry["action"]) for entry in response.json()["results"])
+
+    def save(self, review, **changes):
+        for field, value in changes.items():
+            setattr(review, field, value)
+        with self.captureOnCommitCallbacks(execute=True):
+            review.save()
+
+    def expected(self, action: str) -> list:
+        return sorted([("movie_review", self.movie_review.id, action)]
+                      + [("aspect_rating", aspect.id, action) for aspect in self.aspects])
+
+    def test_unpublishing_a_review_deletes_its_aspect_ratings(self):
+        self.save(self.movie_review, is_public=False)
+        self.assertEqual(self.changes(), self.expected("delete"))
+
+    def test_publishing_a_review_upserts_its_aspect_ratings(self):
+        self.save(self.movie_review, is_public=False)
+        self.setUp()
+
+        self.save(self.movie_review, is_public=True)
+        self.assertEqual(self.changes(), self.expected("upsert"))
+
+    def test_editing_a_review_leaves_its_aspect_ratings_alone(self):
+        self.save(self.movie_review, final_verdict="still great")
+        self.assertEqual(self.changes(), [("movie_review", self.movie_review.id, "upsert")])
+
+    def test_book_review_sections_follow_their_review(self):
+        # sections are embedded in the book review entry rather than listed on their own
+        self.save(self.book_review, is_public=False)
+        self.assertEqual(self.changes(), [("book_review", self.book_review.id, "delete")])
+
+        self.setUp()
+        self.save(self.book_review, is_public=True)
+        response = self.client.get("/api/changes/", {"since": self.since})
+        entry, = response.json()["results"]
+        self.assertEqual(entry["action"], "upsert")
+        self.assertEqual([section["content"] for section in entry["data"]["sections"]], ["text"])
+
+    def test_changes_are_sequenced_at_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.movie_review.final_verdict = "still great"
+            self.movie_review.save()
+            self.assertEqual(self.changes(), [])
+            # the feed write of a transaction that started later but commits first
+            tracking._write(KIND.BOOK_REVIEW, {self.book_review.id}, DEFAULT_DB_ALIAS)
+            self.assertEqual(self.changes(), [("book_review", self.book_review.id, "upsert")])
+
+        response = self.client.get("/api/changes/", {"since": self.since})
+        self.assertEqual([(entry["type"], entry["id"]) for entry in response.json()["results"]],
+                         [("book_review", self.book_review.id), ("movie_review", self.movie_review.id)])
+
+    def test_rolled_back_changes_are_not_recorded(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self.movie_review.final_verdict = "never happened"
+                    self.movie_review.save()
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertEqual(self.changes(), [])
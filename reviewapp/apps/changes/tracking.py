@@ -0,0 +1,46 @@
+"""
+Write side of the change feed.
+
+Readers page through the feed by sequence value, so a change must not take
+its place in the sequence before it commits: a reader that already went past
+a value handed out to a slow transaction would never see that change. The
+feed rows are therefore written after the surrounding transaction commits,
+each write in its own short transaction under the feed lock, so sequence
+values are handed out and committed one writer at a time, in commit order.
+Outside a transaction the write happens at once.
+
+The price is that a process dying between its commit and the feed write
+loses those entries; the objects reappear in the feed on their next change.
+"""
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from typing import Iterable
+
+from .models import Change
+
+
+# pg_advisory_xact_lock key serializing the feed writes ("changes" in ASCII)
+FEED_LOCK = 0x6368616e676573
+
+
+def _lock_feed(using: str) -> None:
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [FEED_LOCK])
+    # SQLite serializes writers by itself: the DELETE below takes the database write lock
+
+
+def _write(kind: int, object_ids: set, using: str) -> None:
+    with transaction.atomic(using=using):
+        _lock_feed(using)
+        Change.objects.using(using).filter(kind=kind, object_id__in=object_ids).delete()
+        Change.objects.using(using).bulk_create([Change(kind=kind, object_id=pk) for pk in sorted(object_ids)])
+
+
+def record(kind: int, object_ids: Iterable[int]) -> None:
+    """Move the objects to the end of the change sequence once the current transaction commits."""
+    object_ids = {pk for pk in object_ids if pk is not None}
+    if not object_ids:
+        return
+    transaction.on_commit(lambda: _write(kind, object_ids, DEFAULT_DB_ALIAS))
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class DocumentsConfig(AppConfig):
+    name = 'reviewapp.apps.documents'
+
+    def ready(self):
+        from . import signals  # noqa
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from reviewapp.apps.documents.store import DOCUMENT_VERSION, rebuild_all, rebuild_movies
+
+
+class Command(BaseCommand):
+    help = "Re-render the pre-encoded movie documents served by the API. Run after migrations and deploys."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--stale", action="store_true",
+                            help="Only render movies without a document of the current version")
+        parser.add_argument("--movie", type=int, action="append", dest="movie_ids",
+                            help="Only re-render this movie id (repeatable)")
+
+    def handle(self, *args, **options):
+        if options["movie_ids"]:
+            count = rebuild_movies(options["movie_ids"])
+        else:
+            count = rebuild_all(stale_only=options["stale"])
+        self.stdout.write(self.style.SUCCESS(f"Rendered {count} movie documents (v{DOCUMENT_VERSION})"))
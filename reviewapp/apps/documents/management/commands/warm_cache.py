@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from reviewapp.apps.documents.warming import warm
+
+
+class Command(BaseCommand):
+    help = "Pre-render the first Index entries and the Details of the most reviewed movies. Run after deploys."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=100, help="Most reviewed movies to warm (default 100)")
+        parser.add_argument("--index", type=int, default=50, help="Leading Index entries to warm (default 50)")
+        parser.add_argument("--workers", type=int, default=4, help="Parallel render workers (default 4)")
+
+    def handle(self, *args, **options):
+        report = warm(top=options["top"], index_limit=options["index"], workers=options["workers"])
+        self.stdout.write(
+            f"{report.targets} movies: {report.ready_before} pre-rendered before, "
+            f"{report.rendered} rendered in {report.seconds:.2f}s"
+        )
+        style = self.style.SUCCESS if report.ready_after == report.targets else self.style.WARNING
+        self.stdout.write(style(f"Hit rate {report.hit_rate:.1%} ({report.ready_after}/{report.targets} ready)"))
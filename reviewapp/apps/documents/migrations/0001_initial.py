@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2026-10-19 01:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('movies', '0003_moviereviewcategory_icon_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MovieDocument',
+            fields=[
+                ('movie', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='document', serialize=False, to='movies.movie')),
+                ('card', models.BinaryField()),
+                ('detail', models.BinaryField()),
+                ('version', models.PositiveIntegerField(help_text='Document format version it was rendered with')),
+                ('updated', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
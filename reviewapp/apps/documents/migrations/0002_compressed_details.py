@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-19 01:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='moviedocument',
+            name='detail_br',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='moviedocument',
+            name='detail_gzip',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
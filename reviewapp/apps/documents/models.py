@@ -0,0 +1,21 @@
+from django.db import models
+
+from reviewapp.apps.movies.models import Movie
+
+
+class MovieDocument(models.Model):
+    """
+    Already encoded JSON for a movie, exactly as the API would send it.
+    `card` is the Index entry, `detail` the default Details payload, also
+    kept gzip (and Brotli) compressed for clients that accept it.
+    """
+    movie = models.OneToOneField(Movie, on_delete=models.CASCADE, primary_key=True, related_name='document')
+    card = models.BinaryField()
+    detail = models.BinaryField()
+    detail_gzip = models.BinaryField(blank=True, null=True)
+    detail_br = models.BinaryField(blank=True, null=True)
+    version = models.PositiveIntegerField(help_text="Document format version it was rendered with")
+    updated = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Document for movie #{self.movie_id} (v{self.version})"
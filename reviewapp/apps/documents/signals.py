@@ -0,0 +1,76 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from reviewapp.apps.metadata.models import Country, Creator, Genre, Language
+from reviewapp.apps.movies.models import Movie, MovieAspectRating, MovieReview, MovieReviewCategory
+
+from .store import schedule_rebuild
+
+
+@receiver(post_save, sender=Movie)
+def movie_saved(sender, instance, **kwargs):
+    schedule_rebuild([instance.id])
+
+
+MOVIE_RELATIONS = {getattr(Movie, field).through: field for field in ("genre", "director", "language", "country")}
+
+
+def movie_relations_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            schedule_rebuild([instance.id])
+    elif action == "pre_clear":
+        # the reverse side of a clear does not receive pk_set
+        lookup = MOVIE_RELATIONS[sender]
+        schedule_rebuild(Movie.objects.filter(**{lookup: instance.id}).values_list("id", flat=True))
+    elif action in ("post_add", "post_remove"):
+        schedule_rebuild(pk_set)
+
+
+for through, field in MOVIE_RELATIONS.items():
+    m2m_changed.connect(movie_relations_changed, sender=through, dispatch_uid=f"documents_movie_{field}_changed")
+
+
+@receiver([post_save, post_delete], sender=MovieReview)
+def review_changed(sender, instance, **kwargs):
+    schedule_rebuild([instance.movie_id])
+
+
+@receiver([post_save, post_delete], sender=MovieAspectRating)
+def aspect_rating_changed(sender, instance, **kwargs):
+    schedule_rebuild(MovieReview.objects.filter(pk=instance.review_id).values_list("movie_id", flat=True))
+
+
+# pre_delete: once deleted, the aspect ratings and M2M rows pointing at them are gone too
+@receiver([post_save, pre_delete], sender=MovieReviewCategory)
+def category_changed(sender, instance, **kwargs):
+    schedule_rebuild(
+        MovieReview.objects.filter(aspect_ratings__category_id=instance.id)
+        .values_list("movie_id", flat=True).distinct()
+    )
+
+
+METADATA_LOOKUPS = {
+    Genre: "genre",
+    Creator: "director",
+    Language: "language",
+    Country: "country",
+}
+
+
+@receiver([post_save, pre_delete], sender=Genre)
+@receiver([post_save, pre_delete], sender=Creator)
+@receiver([post_save, pre_delete], sender=Language)
+@receiver([post_save, pre_delete], sender=Country)
+def metadata_changed(sender, instance, **kwargs):
+    lookup = METADATA_LOOKUPS[sender]
+    schedule_rebuild(Movie.objects.filter(**{lookup: instance.id}).values_list("id", flat=True))
+
+
+@receiver(post_save, sender=User)
+def reviewer_changed(sender, instance, created, update_fields=None, **kwargs):
+    # only the username is embedded; skip e.g. the last_login update on every login
+    if created or (update_fields is not None and "username" not in update_fields):
+        return
+    schedule_rebuild(MovieReview.objects.filter(created_by=instance).values_list("movie_id", flat=True))
@@ -0,0 +1,180 @@
+"""
+Static snapshot of the public movie API for a CDN or plain file server.
+
+The default Index listing and every movie's default Details payload are
+written from the document store into a directory mirroring the URL layout:
+
+    <root>/api/movies/index.json            GET /api/movies/
+    <root>/api/movies/<slug>/index.json     GET /api/movies/<slug>/
+
+with the stored gzip (and Brotli) variants next to each Details file as
+index.json.gz / index.json.br for servers that serve precompressed files.
+Files are replaced atomically, so the server never reads a partial one.
+
+A manifest in the root records the slug and document timestamp each movie
+was written with. The next build only rewrites movies whose document is
+stale or was re-rendered since, removes the directories of deleted or
+renamed movies, and rewrites the Index when anything changed. Stale
+documents are rendered and files written in parallel processes.
+"""
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.db import connection, connections
+
+from reviewapp.apps.movies.models import Movie
+
+from typing import Optional
+
+from .models import MovieDocument
+from .store import DOCUMENT_VERSION, ENCODED_DETAIL_FIELDS, movie_cards, rebuild_movies
+
+
+MANIFEST = ".snapshot.json"
+MOVIES_DIR = Path("api", "movies")
+CHUNK_SIZE = 500
+
+# content-coding -> file suffix of the precompressed variant
+SUFFIXES = {"gzip": ".gz", "br": ".br"}
+
+
+@dataclass
+class SnapshotReport:
+    full: bool
+    written: int
+    removed: int
+    index_written: bool
+    seconds: float
+
+
+def write_file(path: Path, body: bytes) -> None:
+    """Replace ``path`` with ``body`` atomically (rename within the directory)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(body)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def detail_path(root: Path, slug: str) -> Path:
+    return root / MOVIES_DIR / slug / "index.json"
+
+
+def write_detail(root: Path, slug: str, detail: bytes, variants: dict) -> None:
+    path = detail_path(root, slug)
+    write_file(path, detail)
+    for coding, suffix in SUFFIXES.items():
+        variant = path.with_name(path.name + suffix)
+        if variants.get(coding) is not None:
+            write_file(variant, variants[coding])
+        elif variant.exists():
+            variant.unlink()
+
+
+def read_manifest(root: Path) -> Optional[dict]:
+    try:
+        manifest = json.loads((root / MANIFEST).read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+    return manifest if manifest.get("version") == DOCUMENT_VERSION else None
+
+
+def _write_chunk(args: tuple) -> dict:
+    """Render the chunk's stale documents and write its files; returns {movie id: [slug, updated]} written."""
+    root, movie_ids = args
+    try:
+        current = set(
+            MovieDocument.objects.filter(movie_id__in=movie_ids, version=DOCUMENT_VERSION)
+            .values_list("movie_id", flat=True)
+        )
+        rebuild_movies(pk for pk in movie_ids if pk not in current)
+
+        written = {}
+        rows = (
+            MovieDocument.objects.filter(movie_id__in=movie_ids, version=DOCUMENT_VERSION)
+            .values_list("movie_id", "movie__slug", "updated", "detail", *ENCODED_DETAIL_FIELDS.values())
+        )
+        for movie_id, slug, updated, detail, *variants in rows.iterator():
+            write_detail(root, slug, bytes(detail), {
+                coding: bytes(body) if body is not None else None
+                for coding, body in zip(ENCODED_DETAIL_FIELDS, variants)
+            })
+            written[movie_id] = [slug, updated.isoformat()]
+        return written
+    finally:
+        connection.close()
+
+
+def changed_movies(movies: dict, written: dict) -> list:
+    """
+    Ids of the movies to (re)write: those without a current document and
+    those whose slug or document changed since they were written.
+    """
+    return sorted(
+        pk for pk, (slug, updated, version) in movies.items()
+        if version != DOCUMENT_VERSION or written.get(pk) != [slug, updated.isoformat()]
+    )
+
+
+def build(root, full: bool = False, processes: int = 4) -> SnapshotReport:
+    """Write (or bring up to date) the snapshot in ``root``."""
+    started_at = time.monotonic()
+    root = Path(root)
+    manifest = read_manifest(root)
+    full = full or manifest is None
+    previous = {int(pk): entry for pk, entry in (manifest or {}).get("movies", {}).items()}
+
+    rows = Movie.objects.values_list("id", "slug", "document__updated", "document__version")
+    movies = {pk: (slug, updated, version) for pk, slug, updated, version in rows}
+    changed = sorted(movies) if full else changed_movies(movies, previous)
+    chunks = [(root, changed[i:i + CHUNK_SIZE]) for i in range(0, len(changed), CHUNK_SIZE)]
+
+    written = {}
+    if processes > 1 and len(chunks) > 1:
+        # children must not share the parent's database connections
+        connections.close_all()
+        with multiprocessing.get_context("fork").Pool(processes) as pool:
+            for result in pool.imap_unordered(_write_chunk, chunks):
+                written.update(result)
+    else:
+        for chunk in chunks:
+            written.update(_write_chunk(chunk))
+
+    # directories of deleted movies and old slugs of renamed ones
+    live_slugs = {slug for slug, updated, version in movies.values()}
+    removed = 0
+    for slug in {slug for slug, updated in previous.values()} - live_slugs:
+        shutil.rmtree(detail_path(root, slug).parent, ignore_errors=True)
+        removed += 1
+
+    index_written = full or bool(changed) or bool(removed)
+    if index_written:
+        write_file(root / MOVIES_DIR / "index.json", movie_cards())
+
+    unchanged = movies.keys() - set(changed)
+    entries = {pk: entry for pk, entry in previous.items() if pk in unchanged}
+    entries.update(written)
+    write_file(root / MANIFEST, json.dumps({
+        "version": DOCUMENT_VERSION,
+        "movies": {str(pk): entry for pk, entry in sorted(entries.items())},
+    }, separators=(",", ":")).encode())
+
+    return SnapshotReport(
+        full=full,
+        written=len(written),
+        removed=removed,
+        index_written=index_written,
+        seconds=time.monotonic() - started_at,
+    )
@@ -0,0 +1,148 @@
+from django.db import transaction
+
+from reviewapp.apps.jobs.queue import enqueue, register
+from reviewapp.apps.movies.models import Movie
+from reviewapp.core.compression import compress
+from reviewapp.core.querysets import movies_queryset_for_serialization
+from reviewapp.core.renderers import to_json
+from reviewapp.core.serializers import serialize_movie
+
+from typing import Iterable, Optional
+
+from .models import MovieDocument
+
+
+# Bump whenever serialize_movie or the options below change shape; documents
+# rendered with another version are ignored until `rebuild_documents` runs.
+DOCUMENT_VERSION = 3
+
+CARD_OPTIONS = dict(verbose=False, include_reviews=False, include_aspects=False)
+DETAIL_OPTIONS = dict(verbose=True, include_reviews=True, include_aspects=True, reviews_limit=5, review_summaries=True)
+
+BATCH_SIZE = 200
+
+ENCODED_DETAIL_FIELDS = {"gzip": "detail_gzip", "br": "detail_br"}
+
+
+def encode(data) -> bytes:
+    # the API's JSON renderer, so stored and live bytes are interchangeable
+    return to_json(data)
+
+
+def join_array(items: Iterable[bytes]) -> bytes:
+    """Concatenate encoded items into the bytes to_json would give for the list."""
+    return b"[" + b",".join(items) + b"]"
+
+
+def render_movie(movie: Movie) -> MovieDocument:
+    detail = encode(serialize_movie(movie, **DETAIL_OPTIONS))
+    variants = compress(detail)
+    return MovieDocument(
+        movie_id=movie.id,
+        card=encode(serialize_movie(movie, **CARD_OPTIONS)),
+        detail=detail,
+        detail_gzip=variants.get("gzip"),
+        detail_br=variants.get("br"),
+        version=DOCUMENT_VERSION,
+    )
+
+
+def rebuild_movies(movie_ids: Iterable[int]) -> int:
+    """
+    Re-render the documents of the given movies. Ids of deleted movies are
+    ignored (their documents went away with the cascade).
+    """
+    movie_ids = sorted(set(movie_ids))
+    rebuilt = 0
+    for start in range(0, len(movie_ids), BATCH_SIZE):
+        batch = movie_ids[start:start + BATCH_SIZE]
+        documents = [
+            render_movie(movie)
+            for movie in movies_queryset_for_serialization(Movie.objects.filter(id__in=batch))
+        ]
+        with transaction.atomic():
+            MovieDocument.objects.filter(movie_id__in=batch).delete()
+            MovieDocument.objects.bulk_create(documents)
+        rebuilt += len(documents)
+    return rebuilt
+
+
+def rebuild_all(stale_only: bool = False) -> int:
+    movies = Movie.objects.all()
+    if stale_only:
+        # also documents rendered before the compressed variants existed
+        movies = movies.exclude(document__version=DOCUMENT_VERSION, document__detail_gzip__isnull=False)
+    return rebuild_movies(movies.values_list("id", flat=True))
+
+
+REBUILD_JOB = "documents.rebuild_movies"
+
+
+@register(REBUILD_JOB)
+def rebuild_job(keys: list) -> None:
+    rebuild_movies(int(key) for key in keys)
+
+
+def schedule_rebuild(movie_ids: Iterable[int]) -> None:
+    """
+    Mark the movies' documents stale and queue them for re-rendering by the
+    job workers. Until a worker gets to them the API renders these movies
+    live, so readers never see a stale document.
+    """
+    movie_ids = {pk for pk in movie_ids if pk is not None}
+    if not movie_ids:
+        return
+    MovieDocument.objects.filter(movie_id__in=movie_ids, version=DOCUMENT_VERSION).update(version=0)
+    enqueue(REBUILD_JOB, movie_ids)
+
+
+def movie_cards(limit: Optional[int] = None) -> bytes:
+    """
+    Encoded Index array (default options) in Movie ordering. Rows are read
+    with values_list, so no model is instantiated; movies without a current
+    document are serialized live.
+    """
+    rows = Movie.objects.values_list("id", "document__card", "document__version")
+    if limit is not None:
+        rows = rows[:limit]
+    rows = list(rows)
+
+    missing = [pk for pk, card, version in rows if card is None or version != DOCUMENT_VERSION]
+    live = {}
+    if missing:
+        live = {
+            movie.id: encode(serialize_movie(movie, **CARD_OPTIONS))
+            for movie in movies_queryset_for_serialization(Movie.objects.filter(id__in=missing))
+        }
+    documents = (live.get(pk, card) for pk, card, version in rows)
+    return join_array(doc for doc in documents if doc is not None)
+
+
+def movie_detail(slug: str, encodings: Iterable[str] = ()) -> Optional[tuple]:
+    """
+    Stored default Details payload for ``slug`` as (content-coding, body),
+    using the first of ``encodings`` that was stored and the identity form
+    (coding None) otherwise. None when it has to be rendered live.
+    """
+    encodings = [coding for coding in encodings if coding in ENCODED_DETAIL_FIELDS]
+    row = (
+        MovieDocument.objects
+        .filter(movie__slug=slug, version=DOCUMENT_VERSION)
+        .values_list("detail", *(ENCODED_DETAIL_FIELDS[coding] for coding in encodings))
+        .first()
+    )
+    if row is None:
+        return None
+    for coding, body in zip(encodings, row[1:]):
+        if body is not None:
+            return coding, body
+    return None, row[0]
+
+
+def movie_details(slugs: Iterable[str]) -> dict:
+    """Stored default Details payloads keyed by slug; slugs without a current document are left out."""
+    return dict(
+        MovieDocument.objects
+        .filter(movie__slug__in=list(slugs), version=DOCUMENT_VERSION)
+        .values_list("movie__slug", "detail")
+    )
@@ -0,0 +1,190 @@
+import gzip
+import io
+import json
+import tempfile
+
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+
+from reviewapp.apps.jobs.models import Job
+from reviewapp.apps.jobs.queue import claim, run
+from reviewapp.apps.movies.models import Movie
+from reviewapp.core.testing import seed_catalogue
+
+from . import store, warming
+from .models import MovieDocument
+from .snapshot import MANIFEST, SUFFIXES, build
+from .store import DOCUMENT_VERSION, ENCODED_DETAIL_FIELDS, REBUILD_JOB, movie_cards, movie_detail, rebuild_all
+
+
+class InvalidationTests(TestCase):
+    """Writes mark the stored documents they affect stale and queue them for the workers."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.catalogue = seed_catalogue(movies=4, books=0, reviewers=2)
+        rebuild_all()
+        Job.objects.all().delete()
+
+    def stale(self) -> set:
+        return set(MovieDocument.objects.exclude(version=DOCUMENT_VERSION).values_list("movie_id", flat=True))
+
+    def queued(self) -> set:
+        return {int(key) for key in Job.objects.filter(name=REBUILD_JOB).values_list("key", flat=True)}
+
+    def assertInvalidated(self, movies):
+        ids = {movie.id for movie in movies}
+        self.assertEqual(self.stale(), ids)
+        self.assertEqual(self.queued(), ids)
+        for movie in movies:
+            # until a worker re-renders it, the API renders the movie live
+            self.assertIsNone(movie_detail(Movie.objects.get(pk=movie.pk).slug))
+
+    def detail(self, movie) -> bytes:
+        movie = Movie.objects.get(pk=movie.pk)
+        coding, body = movie_detail(movie.slug)
+        return body
+
+    def test_review_edit(self):
+        movie = self.catalogue.movies[1]
+        review = movie.reviews.first()
+        review.review_summary = "A changed mind"
+        review.save()
+        self.assertInvalidated([movie])
+
+        self.assertTrue(run(claim()))
+        self.assertEqual(self.stale(), set())
+        self.assertIn(b"A changed mind", self.detail(movie))
+
+    def test_title_edit(self):
+        movie = self.catalogue.movies[0]
+        movie.title = "Retitled"
+        movie.save()
+        self.assertInvalidated([movie])
+
+        self.assertTrue(run(claim()))
+        self.assertIn(b'"title":"Retitled"', self.detail(movie))
+
+    def test_creator_edit(self):
+        director = self.catalogue.directors[0]
+        director.name = "Renamed Director"
+        director.save()
+        movies = list(Movie.objects.filter(director=director))
+        self.assertTrue(movies)
+        self.assertInvalidated(movies)
+
+        self.assertTrue(run(claim()))
+        for movie in movies:
+            self.assertIn(b"Renamed Director", self.detail(movie))
+
+    def test_unrelated_edits_leave_documents_alone(self):
+        self.catalogue.authors[0].name = "Renamed Author"
+        self.catalogue.authors[0].save()
+        self.assertEqual((self.stale(), self.queued()), (set(), set()))
+
+    def test_version_bump_forces_a_rebuild(self):
+        movie = self.catalogue.movies[0]
+        self.assertIsNotNone(movie_detail(movie.slug))
+        with mock.patch.object(store, "DOCUMENT_VERSION", DOCUMENT_VERSION + 1):
+            self.assertIsNone(movie_detail(movie.slug))
+            self.assertEqual(rebuild_all(stale_only=True), len(self.catalogue.movies))
+            self.assertIsNotNone(movie_detail(movie.slug))
+            self.assertEqual(rebuild_all(stale_only=True), 0)
+        self.assertEqual(set(MovieDocument.objects.values_list("version", flat=True)), {DOCUMENT_VERSION + 1})
+
+
+class WarmingTests(TransactionTestCase):
+    # warm() renders on a thread pool, whose threads use their own connections
+
+    def setUp(self):
+        self.catalogue = seed_catalogue(movies=5, books=0, reviewers=2)
+
+    def test_warm_renders_the_missing_documents(self):
+        report = warming.warm(top=2, index_limit=3, workers=1)
+        self.assertEqual((report.ready_before, report.rendered, report.ready_after), (0, report.targets, report.targets))
+        self.assertEqual(report.hit_rate, 1.0)
+        self.assertGreaterEqual(report.targets, 3)
+        self.assertEqual(MovieDocument.objects.filter(version=DOCUMENT_VERSION).count(), report.targets)
+
+        # only what went stale since is rendered again
+        movie = self.catalogue.movies[0]
+        movie.tagline = "In space no one can hear you scream"
+        movie.save()
+        again = warming.warm(top=2, index_limit=3, workers=1)
+        self.assertEqual(again.targets, report.targets)
+        self.assertEqual((again.ready_before, again.rendered), (report.targets - 1, 1))
+        self.assertIn(movie.tagline.encode(), MovieDocument.objects.get(movie=movie).detail)
+
+
+class SnapshotTests(TransactionTestCase):
+    # build() closes the connection after each chunk, which a TestCase transaction does not survive
+
+    def setUp(self):
+        self.catalogue = seed_catalogue(movies=3, books=0, reviewers=2)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+
+    def files(self) -> set:
+        return {str(path.relative_to(self.root)) for path in self.root.rglob("*") if path.is_file()}
+
+    def test_full_then_incremental_build(self):
+        report = build(self.root, processes=1)
+        self.assertEqual((report.full, report.written, report.removed, report.index_written), (True, 3, 0, True))
+
+        slugs = list(Movie.objects.values_list("slug", flat=True))
+        # Brotli variants are only stored when the brotli package is installed
+        variants = [suffix for coding, suffix in SUFFIXES.items()
+                    if MovieDocument.objects.filter(**{f"{ENCODED_DETAIL_FIELDS[coding]}__isnull": False}).exists()]
+        self.assertIn(".gz", variants)
+        self.assertEqual(self.files(), {MANIFEST, "api/movies/index.json"} | {
+            f"api/movies/{slug}/index.json{suffix}" for slug in slugs for suffix in ["", *variants]
+        })
+
+        # the files hold the bytes the API serves
+        self.assertEqual((self.root / "api/movies/index.json").read_bytes(), movie_cards())
+        for slug in slugs:
+            path = self.root / "api/movies" / slug / "index.json"
+            self.assertEqual(path.read_bytes(), self.client.get(f"/api/movies/{slug}/").content)
+            self.assertEqual(gzip.decompress(path.with_name("index.json.gz").read_bytes()), path.read_bytes())
+        manifest = json.loads((self.root / MANIFEST).read_text())
+        self.assertEqual(manifest["version"], DOCUMENT_VERSION)
+        self.assertEqual(sorted(entry[0] for entry in manifest["movies"].values()), sorted(slugs))
+
+        report = build(self.root, processes=1)
+        self.assertEqual((report.full, report.written, report.removed, report.index_written), (False, 0, 0, False))
+
+        edited, deleted = self.catalogue.movies[:2]
+        edited.tagline = "Edited"
+        edited.save()
+        deleted.delete()
+        report = build(self.root, processes=1)
+        self.assertEqual((report.written, report.removed, report.index_written), (1, 1, True))
+        self.assertFalse((self.root / "api/movies" / deleted.slug).exists())
+        self.assertIn(b'"tagline":"Edited"', (self.root / "api/movies" / edited.slug / "index.json").read_bytes())
+        self.assertNotIn(deleted.slug.encode(), (self.root / "api/movies/index.json").read_bytes())
+
+    def test_command(self):
+        out = io.StringIO()
+        call_command("build_static_api", str(self.root), "--processes", "1", stdout=out)
+        self.assertIn("Full build: wrote 3 movies", out.getvalue())
+        self.assertTrue((self.root / MANIFEST).exists())
+        self.assertEqual(len(list(self.root.glob("api/movies/*/index.json"))), 3)
+
+
+class WarmOnStartupTests(SimpleTestCase):
+
+    @override_settings(WARM_CACHE_ON_STARTUP=True)
+    def test_enabled(self):
+        with mock.patch.object(warming, "warm_in_background") as warm_in_background:
+            warming.warm_on_startup()
+        warm_in_background.assert_called_once_with()
+
+    @override_settings(WARM_CACHE_ON_STARTUP=False)
+    def test_disabled(self):
+        with mock.patch.object(warming, "warm_in_background") as warm_in_background:
+            warming.warm_on_startup()
+        warm_in_background.assert_not_called()
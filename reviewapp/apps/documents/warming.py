@@ -0,0 +1,110 @@
+"""
+Cache warming for deploys and cold starts. Makes sure the payloads the first
+wave of traffic asks for (the first Index entries and the Details of the most
+reviewed titles) have a current pre-rendered document, renders the missing
+ones in parallel, then reads them once so the database has them in memory.
+"""
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.db.models import Sum
+
+from reviewapp.apps.movies.models import Movie
+from reviewapp.apps.stats.models import MovieRatingBucket
+
+from typing import Iterable
+
+from .models import MovieDocument
+from .store import DOCUMENT_VERSION, movie_cards, movie_details, rebuild_movies
+
+
+CHUNK_SIZE = 50
+
+
+@dataclass
+class WarmReport:
+    targets: int
+    ready_before: int
+    rendered: int
+    ready_after: int
+    seconds: float
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of the warmed payloads the API can now serve pre-rendered."""
+        return self.ready_after / self.targets if self.targets else 1.0
+
+
+def most_reviewed_movies(limit: int) -> list:
+    # read from the histogram aggregates instead of counting reviews
+    return list(
+        MovieRatingBucket.objects.values("movie_id").annotate(total=Sum("count"))
+        .order_by("-total", "movie_id").values_list("movie_id", flat=True)[:limit]
+    )
+
+
+def _current(movie_ids: Iterable[int]) -> set:
+    return set(
+        MovieDocument.objects.filter(movie_id__in=list(movie_ids), version=DOCUMENT_VERSION)
+        .values_list("movie_id", flat=True)
+    )
+
+
+def _render(movie_ids: list) -> int:
+    try:
+        return rebuild_movies(movie_ids)
+    finally:
+        connection.close()
+
+
+def warm(top: int = 100, index_limit: int = 50, workers: int = 4) -> WarmReport:
+    started = time.monotonic()
+    index_ids = list(Movie.objects.values_list("id", flat=True)[:index_limit])
+    targets = list(dict.fromkeys(index_ids + most_reviewed_movies(top)))
+
+    ready = _current(targets)
+    stale = [pk for pk in targets if pk not in ready]
+    chunks = [stale[i:i + CHUNK_SIZE] for i in range(0, len(stale), CHUNK_SIZE)]
+    rendered = 0
+    if chunks:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            rendered = sum(pool.map(_render, chunks))
+
+    # read them the way the API does, pulling the rows into the database cache
+    movie_cards(index_limit)
+    movie_details(Movie.objects.filter(id__in=targets).values_list("slug", flat=True))
+
+    return WarmReport(
+        targets=len(targets),
+        ready_before=len(ready),
+        rendered=rendered,
+        ready_after=len(_current(targets)),
+        seconds=time.monotonic() - started,
+    )
+
+
+def warm_on_startup() -> None:
+    """
+    Called by the server entry points (reviewapp.wsgi / reviewapp.asgi) once
+    the application is loaded, so management commands never warm.
+    """
+    if getattr(settings, "WARM_CACHE_ON_STARTUP", False):
+        warm_in_background()
+
+
+def warm_in_background() -> None:
+    def run():
+        try:
+            warm(top=getattr(settings, "WARM_CACHE_TOP", 100))
+        except DatabaseError:
+            # e.g. started before migrations ran; the next start will warm
+            pass
+        finally:
+            connection.close()
+
+    threading.Thread(target=run, name="warm_cache", daemon=True).start()
@@ -0,0 +1,13 @@
+from django.contrib import admin
+
+from reviewapp.core.admin import LargeTableAdmin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(LargeTableAdmin):
+    list_display = ("name", "key", "status", "attempts", "run_after", "locked_by")
+    list_filter = ("status", "name")
+    search_fields = ("key__exact",)
+    readonly_fields = ("locked_by", "locked_until", "last_error", "created")
@@ -0,0 +1,97 @@
+import multiprocessing
+import os
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+
+from reviewapp.apps.jobs.queue import claim, requeue_expired, run
+
+
+def work(stop: threading.Event, batch_size: int, poll: float, once: bool, names, counts: dict,
+         lock: threading.Lock) -> None:
+    try:
+        while not stop.is_set():
+            requeue_expired()
+            jobs = claim(batch_size, names)
+            if jobs:
+                key = "done" if run(jobs) else "failed"
+                with lock:
+                    counts[key] = counts.get(key, 0) + len(jobs)
+            elif once:
+                break
+            else:
+                stop.wait(poll)
+    finally:
+        connection.close()
+
+
+def serve(threads: int, batch_size: int, poll: float, once: bool, names) -> dict:
+    stop = threading.Event()
+    previous = {signum: signal.signal(signum, lambda *args: stop.set()) for signum in (signal.SIGINT, signal.SIGTERM)}
+
+    counts, lock = {}, threading.Lock()
+    pool = [
+        threading.Thread(target=work, args=(stop, batch_size, poll, once, names, counts, lock), daemon=True)
+        for _ in range(threads)
+    ]
+    try:
+        for thread in pool:
+            thread.start()
+        # join with a timeout so the main thread keeps handling signals
+        while any(thread.is_alive() for thread in pool):
+            for thread in pool:
+                thread.join(0.5)
+    finally:
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+    return counts
+
+
+def serve_process(*args) -> None:
+    serve(*args)
+
+
+class Command(BaseCommand):
+    help = "Run background job workers (document rebuilds and other post-write work) until interrupted."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=1, help="Worker processes (default 1)")
+        parser.add_argument("--threads", type=int, default=1, help="Worker threads per process (default 1)")
+        parser.add_argument("--batch", type=int, default=100, help="Jobs claimed and handled together (default 100)")
+        parser.add_argument("--poll", type=float, default=1.0, help="Seconds to sleep when the queue is empty")
+        parser.add_argument("--once", action="store_true", help="Exit once no job is due instead of polling")
+        parser.add_argument("--job", action="append", dest="names", help="Only run jobs with this name (repeatable)")
+
+    def handle(self, *args, **options):
+        params = (options["threads"], options["batch"], options["poll"], options["once"], options["names"])
+        if options["processes"] <= 1:
+            counts = serve(*params)
+            self.stdout.write(self.style.SUCCESS(
+                f"Ran {counts.get('done', 0)} jobs, {counts.get('failed', 0)} failed"
+            ))
+            return
+
+        # children must not share the parent's database connections
+        connections.close_all()
+        context = multiprocessing.get_context("fork")
+        processes = [context.Process(target=serve_process, args=params) for _ in range(options["processes"])]
+        for process in processes:
+            process.start()
+
+        # stop the children gracefully: each finishes its current batch
+        def forward(signum, frame):
+            for process in processes:
+                if process.is_alive():
+                    os.kill(process.pid, signum)
+
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, forward)
+        while any(process.is_alive() for process in processes):
+            for process in processes:
+                process.join(0.5)
+        failed = sum(1 for process in processes if process.exitcode)
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(processes)} worker processes stopped" + (f", {failed} with an error" if failed else "")
+        ))
@@ -0,0 +1,43 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+from model_utils.choices import Choices
+
+
+STATUS = Choices(
+    (1, 'PENDING', 'Pending'),
+    (2, 'RUNNING', 'Running'),
+    (3, 'FAILED', 'Failed'),
+)
+
+
+class Job(models.Model):
+    """
+    A unit of deferred work, run by `manage.py run_workers`. Finished jobs are
+    deleted; failed ones are kept for inspection once out of attempts.
+    """
+    STATUS = STATUS
+
+    name = models.CharField(max_length=100, help_text="Registered handler, e.g. documents.rebuild_movies")
+    key = models.CharField(max_length=100, help_text="What the job is about, e.g. a movie id")
+    status = models.PositiveSmallIntegerField(choices=STATUS, default=STATUS.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=64, blank=True)
+    locked_until = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            # duplicate work queued before a worker picks it up is coalesced into one job
+            models.UniqueConstraint(fields=['name', 'key'], condition=Q(status=STATUS.PENDING),
+                                    name='jobs_job_pending_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'run_after']),
+        ]
+
+    def __str__(self):
+        return f"{self.name}({self.key}) - {self.get_status_display()}"
@@ -0,0 +1,124 @@
+"""
+A small job queue kept in the main database, so post-write work needs no
+broker. Handlers are registered by name and receive the keys of a batch of
+jobs:
+
+    @register("documents.rebuild_movies")
+    def rebuild(keys):
+        rebuild_movies(int(key) for key in keys)
+
+    enqueue("documents.rebuild_movies", [movie.id])
+
+Enqueuing inside a transaction commits the jobs together with the change
+that caused them. Pending jobs with the same name and key are coalesced.
+Workers claim jobs with a guarded UPDATE (no SELECT ... FOR UPDATE needed, so
+SQLite works too), hold them for JOBS_LEASE_SECONDS and retry failures with
+exponential backoff up to JOBS_MAX_ATTEMPTS.
+"""
+import traceback
+import uuid
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from typing import Callable, Iterable, Optional
+
+from .models import Job
+
+
+_handlers = {}
+
+
+def register(name: str) -> Callable:
+    def decorator(func: Callable[[list], None]) -> Callable[[list], None]:
+        _handlers[name] = func
+        return func
+    return decorator
+
+
+def enqueue(name: str, keys: Iterable) -> None:
+    Job.objects.bulk_create(
+        [Job(name=name, key=str(key)) for key in {str(key) for key in keys}],
+        ignore_conflicts=True,
+    )
+
+
+def lease_seconds() -> int:
+    return getattr(settings, "JOBS_LEASE_SECONDS", 300)
+
+
+def max_attempts() -> int:
+    return getattr(settings, "JOBS_MAX_ATTEMPTS", 5)
+
+
+def claim(batch_size: int = 100, names: Optional[Iterable[str]] = None) -> list:
+    """
+    Claim up to ``batch_size`` due jobs sharing one name, oldest first, so a
+    handler can process them together. Returns [] when nothing is due.
+    """
+    now = timezone.now()
+    due = Job.objects.filter(status=Job.STATUS.PENDING, run_after__lte=now)
+    if names is not None:
+        due = due.filter(name__in=list(names))
+    name = due.order_by("run_after", "id").values_list("name", flat=True).first()
+    if name is None:
+        return []
+
+    ids = list(due.filter(name=name).order_by("run_after", "id").values_list("id", flat=True)[:batch_size])
+    token = uuid.uuid4().hex
+    # another worker may claim some of these first; the status guard makes that safe
+    Job.objects.filter(id__in=ids, status=Job.STATUS.PENDING).update(
+        status=Job.STATUS.RUNNING, locked_by=token, locked_until=now + timedelta(seconds=lease_seconds()),
+        attempts=F("attempts") + 1,
+    )
+    return list(Job.objects.filter(id__in=ids, locked_by=token))
+
+
+def run(jobs: list) -> bool:
+    """Run a claimed batch; on success the jobs are deleted, otherwise released for a retry."""
+    if not jobs:
+        return True
+    handler = _handlers.get(jobs[0].name)
+    try:
+        if handler is None:
+            raise LookupError(f"No handler registered for job {jobs[0].name!r}")
+        handler([job.key for job in jobs])
+    except Exception:
+        release(jobs, traceback.format_exc())
+        return False
+    Job.objects.filter(id__in=[job.id for job in jobs], locked_by=jobs[0].locked_by).delete()
+    return True
+
+
+def release(jobs: list, error: str) -> None:
+    """
+    Give claimed jobs back for a retry, or fail them once out of attempts.
+    Only jobs still held under the claim's token are touched: after its lease
+    expired a job may have been released and claimed by another worker.
+    """
+    now = timezone.now()
+    for job in jobs:
+        held = Job.objects.filter(pk=job.pk, status=Job.STATUS.RUNNING, locked_by=job.locked_by)
+        if job.attempts >= max_attempts():
+            held.update(status=Job.STATUS.FAILED, locked_until=None, last_error=error)
+            continue
+        try:
+            with transaction.atomic():
+                held.update(
+                    status=Job.STATUS.PENDING, locked_by="", locked_until=None, last_error=error,
+                    run_after=now + timedelta(seconds=2 ** job.attempts),
+                )
+        except IntegrityError:
+            # the same work was queued again meanwhile; that job covers this one
+            held.delete()
+
+
+def requeue_expired() -> int:
+    """Release jobs whose worker died or overran its lease."""
+    expired = list(Job.objects.filter(status=Job.STATUS.RUNNING, locked_until__lt=timezone.now()))
+    release(expired, "Lease expired")
+    return len(expired)
@@ -0,0 +1,139 @@
+import io
+
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from .models import Job
+from .queue import claim, enqueue, register, release, requeue_expired, run
+
+
+handled = []
+
+
+@register("tests.record")
+def record_keys(keys):
+    handled.append(sorted(keys))
+
+
+@register("tests.fail")
+def fail(keys):
+    raise RuntimeError("handler failed")
+
+
+@override_settings(JOBS_LEASE_SECONDS=60, JOBS_MAX_ATTEMPTS=2)
+class QueueTests(TestCase):
+
+    def setUp(self):
+        handled.clear()
+
+    def test_pending_duplicates_are_coalesced(self):
+        enqueue("tests.record", [1, 2, "2"])
+        enqueue("tests.record", [2, 3])
+        self.assertEqual(sorted(Job.objects.values_list("key", flat=True)), ["1", "2", "3"])
+
+        # the constraint only covers pending jobs: work queued while a job runs is kept
+        claim(names=["tests.record"])
+        enqueue("tests.record", [1])
+        self.assertEqual(Job.objects.filter(key="1").count(), 2)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Job.objects.create(name="tests.record", key="1")
+
+    def test_claim_takes_one_name_oldest_first(self):
+        enqueue("tests.fail", [1])
+        enqueue("tests.record", [1, 2, 3])
+        Job.objects.filter(name="tests.fail").update(run_after=timezone.now() - timedelta(minutes=1))
+        Job.objects.filter(name="tests.record", key="3").update(run_after=timezone.now() + timedelta(minutes=1))
+
+        jobs = claim()
+        self.assertEqual([(job.name, job.key) for job in jobs], [("tests.fail", "1")])
+        jobs = claim(batch_size=10)
+        self.assertEqual(sorted(job.key for job in jobs), ["1", "2"])  # 3 is not due yet
+        job = jobs[0]
+        self.assertEqual((job.status, job.attempts), (Job.STATUS.RUNNING, 1))
+        self.assertTrue(job.locked_by)
+        self.assertGreater(job.locked_until, timezone.now() + timedelta(seconds=50))
+        self.assertEqual(claim(), [])
+
+    def test_claim_filters_by_name(self):
+        enqueue("tests.fail", [1])
+        enqueue("tests.record", [1])
+        self.assertEqual([job.name for job in claim(names=["tests.record"])], ["tests.record"])
+        self.assertEqual(claim(names=["tests.record"]), [])
+
+    def test_successful_jobs_are_deleted(self):
+        enqueue("tests.record", [1, 2])
+        self.assertTrue(run(claim()))
+        self.assertEqual(handled, [["1", "2"]])
+        self.assertFalse(Job.objects.exists())
+
+    def test_failures_are_retried_with_backoff_then_kept(self):
+        enqueue("tests.fail", [1])
+        before = timezone.now()
+        self.assertFalse(run(claim()))
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts, job.locked_by), (Job.STATUS.PENDING, 1, ""))
+        self.assertIn("handler failed", job.last_error)
+        self.assertGreaterEqual(job.run_after, before + timedelta(seconds=2))
+        self.assertEqual(claim(), [])  # backing off
+
+        Job.objects.update(run_after=timezone.now())
+        self.assertFalse(run(claim()))
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts), (Job.STATUS.FAILED, 2))
+        self.assertEqual(claim(), [])
+
+    def test_unknown_handler_fails_the_job(self):
+        enqueue("tests.missing", [1])
+        self.assertFalse(run(claim()))
+        self.assertIn("No handler registered", Job.objects.get().last_error)
+
+    def test_release_drops_a_job_queued_again_meanwhile(self):
+        enqueue("tests.fail", [1])
+        jobs = claim()
+        enqueue("tests.fail", [1])
+        release(jobs, "failed")
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts, job.last_error), (Job.STATUS.PENDING, 0, ""))
+
+    def test_expired_leases_are_requeued(self):
+        enqueue("tests.record", [1])
+        claim()
+        self.assertEqual(requeue_expired(), 0)
+        Job.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(requeue_expired(), 1)
+        self.assertEqual(Job.objects.get().status, Job.STATUS.PENDING)
+
+    def test_release_ignores_jobs_claimed_by_another_worker(self):
+        enqueue("tests.record", [1])
+        stale = claim()
+        Job.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        requeue_expired()
+        Job.objects.update(run_after=timezone.now())
+        current = claim()
+
+        # the first worker finally gives up on its batch
+        release(stale, "too late")
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.locked_by), (Job.STATUS.RUNNING, current[0].locked_by))
+        self.assertTrue(run(current))
+        self.assertFalse(Job.objects.exists())
+
+
+class RunWorkersTests(TransactionTestCase):
+    # the worker threads use their own database connections
+
+    def setUp(self):
+        handled.clear()
+
+    def test_once_runs_every_due_job_and_exits(self):
+        enqueue("tests.record", [1, 2, 3])
+        enqueue("tests.fail", [1])
+        out = io.StringIO()
+        call_command("run_workers", "--once", "--batch", "2", stdout=out)
+        self.assertIn("Ran 3 jobs, 1 failed", out.getvalue())
+        self.assertEqual(sorted(key for keys in handled for key in keys), ["1", "2", "3"])
+        self.assertEqual(list(Job.objects.values_list("name", flat=True)), ["tests.fail"])
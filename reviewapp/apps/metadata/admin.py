@@ -1,8 +1,31 @@
 from django.contrib import admin
 
+from reviewapp.core.admin import LargeTableAdmin
+
 from .models import Language, Country, Genre, Creator
 
-admin.site.register(Language)
-admin.site.register(Country)
-admin.site.register(Genre)
-admin.site.register(Creator)
+
+@admin.register(Language)
+class LanguageAdmin(admin.ModelAdmin):
+    list_display = ("name", "code")
+    search_fields = ("^name", "code__exact")
+
+
+@admin.register(Country)
+class CountryAdmin(admin.ModelAdmin):
+    list_display = ("name", "code")
+    search_fields = ("^name", "code__exact")
+
+
+@admin.register(Genre)
+class GenreAdmin(admin.ModelAdmin):
+    list_display = ("name", "type")
+    list_filter = ("type",)
+    search_fields = ("^name",)
+
+
+@admin.register(Creator)
+class CreatorAdmin(LargeTableAdmin):
+    list_display = ("name", "type", "birth_date")
+    list_filter = ("type",)
+    search_fields = ("^name",)
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-19 01:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('metadata', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='creator',
+            index=models.Index(fields=['name'], name='metadata_cr_name_29b34a_idx'),
+        ),
+    ]
@@ -0,0 +1,14 @@
+from django.db import migrations
+
+from reviewapp.core.indexes import AddPrefixSearchIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('metadata', '0002_creator_name_index'),
+    ]
+
+    operations = [
+        AddPrefixSearchIndex('creator', 'name', name='metadata_creator_name_prefix'),
+    ]
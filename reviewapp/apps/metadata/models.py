@@ -52,6 +52,9 @@ class Creator(models.Model):
     
     class Meta:
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['name']),
+        ]
     
     def __str__(self):
         return self.name + " (" + self.get_type_display() + ")"
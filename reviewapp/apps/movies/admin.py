@@ -1,8 +1,39 @@
 from django.contrib import admin
 
+from reviewapp.core.admin import LargeTableAdmin
+
 from .models import Movie, MovieReview, MovieAspectRating, MovieReviewCategory
 
-admin.site.register(Movie)
-admin.site.register(MovieReview)
-admin.site.register(MovieAspectRating)
-admin.site.register(MovieReviewCategory)
+
+@admin.register(Movie)
+class MovieAdmin(LargeTableAdmin):
+    list_display = ("title", "release_year", "runtime", "imdb_id")
+    list_filter = ("genre",)
+    search_fields = ("^title", "slug__exact", "imdb_id__exact")
+    autocomplete_fields = ("genre", "director", "language", "country")
+
+
+@admin.register(MovieReview)
+class MovieReviewAdmin(LargeTableAdmin):
+    list_display = ("__str__", "is_public", "created")
+    list_filter = ("is_public",)
+    list_select_related = ("movie", "created_by")
+    # title only: OR-ing a second table into the search defeats both indexes.
+    # A reviewer's reviews are at ?created_by__id__exact=<user id>.
+    search_fields = ("^movie__title",)
+    autocomplete_fields = ("movie", "created_by")
+
+
+@admin.register(MovieAspectRating)
+class MovieAspectRatingAdmin(LargeTableAdmin):
+    list_display = ("__str__", "rating")
+    list_filter = ("category",)
+    list_select_related = ("review__movie", "category")
+    raw_id_fields = ("review",)
+
+
+@admin.register(MovieReviewCategory)
+class MovieReviewCategoryAdmin(admin.ModelAdmin):
+    list_display = ("name", "type", "weight")
+    list_filter = ("type",)
+    search_fields = ("^name",)
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-19 01:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0003_moviereviewcategory_icon_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='moviereview',
+            index=models.Index(fields=['created_by', 'created'], name='movies_movi_created_fed565_idx'),
+        ),
+    ]
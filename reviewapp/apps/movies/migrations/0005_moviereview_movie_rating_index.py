@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-19 01:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0004_moviereview_created_by_created_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='moviereview',
+            index=models.Index(fields=['movie', 'overall_rating'], name='movies_movi_movie_i_c6e405_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0005_moviereview_movie_rating_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='moviereview',
+            index=models.Index(condition=models.Q(('is_public', True)), fields=['movie', '-created', '-id', 'overall_rating', 'created_by', 'is_public'], name='movies_review_public_recent'),
+        ),
+        migrations.AddIndex(
+            model_name='moviereview',
+            index=models.Index(condition=models.Q(('is_public', True)), fields=['movie', '-overall_rating', '-id', 'created', 'created_by', 'is_public'], name='movies_review_public_rating'),
+        ),
+    ]
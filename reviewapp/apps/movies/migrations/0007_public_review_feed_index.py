@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0006_public_review_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='moviereview',
+            index=models.Index(condition=models.Q(('is_public', True)), fields=['-created', '-id'], name='movies_review_public_feed'),
+        ),
+    ]
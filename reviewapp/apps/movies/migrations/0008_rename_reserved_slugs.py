@@ -0,0 +1,36 @@
+from django.db import migrations
+
+
+# kept in step with movies.models.RESERVED_SLUGS
+RESERVED_SLUGS = ['batch']
+
+
+def rename(apps, schema_editor):
+    Movie = apps.get_model('movies', 'Movie')
+    MovieDocument = apps.get_model('documents', 'MovieDocument')
+    Change = apps.get_model('changes', 'Change')
+
+    renamed = []
+    for movie in Movie.objects.filter(slug__in=RESERVED_SLUGS):
+        movie.slug = f'{movie.slug}-{movie.release_year}'
+        movie.save(update_fields=['slug'])
+        renamed.append(movie.id)
+    if renamed:
+        # historical models send no signals: mark the documents stale and
+        # move the movies to the end of the change feed by hand
+        MovieDocument.objects.filter(movie_id__in=renamed).update(version=0)
+        Change.objects.filter(kind=1, object_id__in=renamed).delete()
+        Change.objects.bulk_create([Change(kind=1, object_id=pk) for pk in renamed])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0007_public_review_feed_index'),
+        ('documents', '0002_compressed_details'),
+        ('changes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(rename, migrations.RunPython.noop),
+    ]
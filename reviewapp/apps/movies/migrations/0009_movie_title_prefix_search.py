@@ -0,0 +1,14 @@
+from django.db import migrations
+
+from reviewapp.core.indexes import AddPrefixSearchIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0008_rename_reserved_slugs'),
+    ]
+
+    operations = [
+        AddPrefixSearchIndex('movie', 'title', name='movies_movie_title_prefix'),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:42
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0009_movie_title_prefix_search'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='moviereview',
+            name='movies_movi_movie_i_04ed54_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='moviereview',
+            name='movies_movi_movie_i_c6e405_idx',
+        ),
+    ]
@@ -1,5 +1,5 @@
 from django.db import models
-from django.db.models import Avg
+from django.db.models import Avg, Q
 from django.contrib.auth.models import User
 from django.urls import reverse
 from django.utils.text import slugify
@@ -11,6 +11,10 @@ from reviewapp.apps.metadata.models import Language, Country, Genre, Creator
 from reviewapp.core.utils import FilenameGenerator
 
 
+# path segments of the /api/movies/ routes that would shadow a movie's Details
+RESERVED_SLUGS = frozenset({"batch"})
+
+
 class Movie(models.Model):
     title = models.CharField(max_length=200)
     slug = models.SlugField(max_length=255, unique=True, blank=True)
@@ -36,6 +40,8 @@ class Movie(models.Model):
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
+        if self.slug in RESERVED_SLUGS:
+            self.slug = f"{self.slug}-{self.release_year}"
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -46,7 +52,8 @@ class Movie(models.Model):
 
     @property
     def average_rating(self):
-        return self.reviews.aggregate(avg=Avg('overall_rating'))['avg']
+        """Mean overall rating of the public reviews, like every other rating the API shows."""
+        return self.reviews.filter(is_public=True).aggregate(avg=Avg('overall_rating'))['avg']
 
 
 class MovieReview(models.Model):
@@ -70,8 +77,24 @@ class MovieReview(models.Model):
         ordering = ['-created']
         unique_together = ['movie', 'created_by']  # One review per user per movie
         indexes = [
-            models.Index(fields=['movie', 'created']),
             models.Index(fields=['overall_rating']),
+            models.Index(fields=['created_by', 'created']),
+            # public-review access paths: a title's reviews newest first and by
+            # rating. Pages read rows in index order without a sort; the
+            # rating aggregates are answered from the index alone, since the
+            # summary's scalar columns (and is_public, which SQLite needs to
+            # cover the predicate) are trailing keys rather than INCLUDE columns.
+            # They replace the plain (title, created) / (title, rating) indexes.
+            models.Index(
+                fields=['movie', '-created', '-id', 'overall_rating', 'created_by', 'is_public'],
+                condition=Q(is_public=True), name='movies_review_public_recent',
+            ),
+            models.Index(
+                fields=['movie', '-overall_rating', '-id', 'created', 'created_by', 'is_public'],
+                condition=Q(is_public=True), name='movies_review_public_rating',
+            ),
+            # the cross-media feed (newest first across all titles)
+            models.Index(fields=['-created', '-id'], condition=Q(is_public=True), name='movies_review_public_feed'),
         ]
 
     def __str__(self):
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from reviewapp.apps.ratings.sync import BATCH_SIZE, SPECS, open_dump, sync
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream an offline ratings dump (CSV/TSV, optionally .gz, keyed by imdb_id or isbn) into the "
+        "external ratings of movie or book reviews, writing only the reviews whose ratings changed. "
+        "E.g. for IMDb's title.ratings.tsv.gz: "
+        "sync_external_ratings movies title.ratings.tsv.gz --delimiter tab --key tconst --column imdb_rating=averageRating"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("media", choices=sorted(SPECS))
+        parser.add_argument("path", help="Dump file; .gz files are decompressed on the fly")
+        parser.add_argument("--key", help="Key column of the dump (default imdb_id / isbn)")
+        parser.add_argument("--column", action="append", default=[], metavar="FIELD=COLUMN",
+                            help="Rating field and the dump column holding it; repeatable "
+                                 "(default: every rating field, under its own name)")
+        parser.add_argument("--delimiter", default=",", help="Field delimiter, 'tab' for TSV (default ',')")
+        parser.add_argument("--batch", type=int, default=BATCH_SIZE,
+                            help=f"Dump rows per query batch and transaction (default {BATCH_SIZE})")
+        parser.add_argument("--dry-run", action="store_true", help="Count the changes without writing them")
+
+    def handle(self, *args, **options):
+        spec = SPECS[options["media"]]
+        columns = {}
+        for item in options["column"]:
+            field, sep, column = item.partition("=")
+            if not sep or not field or not column:
+                raise CommandError(f"--column expects FIELD=COLUMN, got {item!r}")
+            columns[field] = column
+        delimiter = "\t" if options["delimiter"] in ("tab", "\\t") else options["delimiter"]
+
+        def progress(report):
+            if options["verbosity"] > 1:
+                self.stdout.write(f"{report.rows} rows, {report.changed} reviews changed, "
+                                  f"{report.rows_per_second:,.0f} rows/s")
+
+        try:
+            with open_dump(options["path"]) as lines:
+                report = sync(spec, lines, key_column=options["key"], columns=columns, delimiter=delimiter,
+                              batch_size=options["batch"], dry_run=options["dry_run"], progress=progress)
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(
+            f"{report.rows} rows in {report.seconds:.2f}s ({report.rows_per_second:,.0f} rows/s): "
+            f"{report.matched} matched titles, {report.invalid} invalid rows, {report.reviews} reviews compared"
+        )
+        verb = "would change" if options["dry_run"] else "changed"
+        self.stdout.write(self.style.SUCCESS(f"{report.changed} reviews {verb}"))
@@ -0,0 +1,186 @@
+"""
+Sync of the external ratings kept on reviews (IMDb and Rotten Tomatoes on
+movie reviews, Goodreads and Amazon on book reviews) from offline dumps.
+
+A dump is delimited text with a header row, optionally gzipped, keyed by
+imdb_id or isbn, and may be much larger than memory. It is streamed through
+a large read buffer and processed BATCH_SIZE rows at a time: one query maps
+the batch's keys to our titles, one loads the reviews of those titles (only
+the rating columns), and the reviews whose values differ are written in one
+transaction per batch. Unchanged reviews are not written.
+
+Writes are grouped into one UPDATE ... WHERE id IN (...) per distinct
+(field, rating): ratings have few distinct values and every review of a title
+gets the same ones, so this is far cheaper than bulk_update's per-row CASE.
+The updates send no signals; the changed reviews are recorded in the change
+feed directly. Nothing else derived from reviews depends on these ratings.
+"""
+import csv
+import gzip
+import io
+import time
+
+from collections import defaultdict
+from dataclasses import dataclass
+from itertools import islice
+
+from django.db import transaction
+from django.utils import timezone
+
+from reviewapp.apps.books.models import Book, BookReview
+from reviewapp.apps.changes.models import KIND
+from reviewapp.apps.changes.tracking import record
+from reviewapp.apps.movies.models import Movie, MovieReview
+
+from typing import Callable, Iterable, Iterator, Optional
+
+
+BATCH_SIZE = 5000
+READ_BUFFER = 1 << 20
+UPDATE_CHUNK = 900  # ids per UPDATE, below SQLite's host parameter limit
+
+# values meaning "no rating" in common dumps; they never clear a stored rating
+MISSING = {"", "\\N", "NA", "N/A", "null", "None"}
+
+
+@dataclass(frozen=True)
+class RatingsSpec:
+    title_model: type
+    review_model: type
+    key_field: str
+    title_field: str
+    fields: tuple
+    change_kind: int
+    normalize: Callable[[str], str] = str.strip
+
+
+MOVIES = RatingsSpec(
+    title_model=Movie,
+    review_model=MovieReview,
+    key_field="imdb_id",
+    title_field="movie",
+    fields=("imdb_rating", "rottentomatoes_rating"),
+    change_kind=KIND.MOVIE_REVIEW,
+)
+
+BOOKS = RatingsSpec(
+    title_model=Book,
+    review_model=BookReview,
+    key_field="isbn",
+    title_field="book",
+    fields=("goodreads_rating", "amazon_rating"),
+    change_kind=KIND.BOOK_REVIEW,
+    normalize=lambda isbn: isbn.replace("-", "").strip(),
+)
+
+SPECS = {"movies": MOVIES, "books": BOOKS}
+
+
+@dataclass
+class SyncReport:
+    rows: int = 0       # dump rows read
+    invalid: int = 0    # rows without a key or with an unparsable rating
+    matched: int = 0    # rows whose key is one of our titles
+    reviews: int = 0    # reviews of the matched titles compared
+    changed: int = 0    # reviews written
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def open_dump(path: str) -> io.TextIOBase:
+    if str(path).endswith(".gz"):
+        return io.TextIOWrapper(io.BufferedReader(gzip.open(path), READ_BUFFER), encoding="utf-8", newline="")
+    return open(path, encoding="utf-8", newline="", buffering=READ_BUFFER)
+
+
+def read_dump(lines: Iterable[str], key_column: str, columns: dict, delimiter: str,
+              report: SyncReport) -> Iterator[tuple]:
+    """(key, {field: rating}) per dump row; ``columns`` maps our fields to dump columns."""
+    reader = csv.reader(lines, delimiter=delimiter)
+    header = next(reader, [])
+    missing = [name for name in (key_column, *columns.values()) if name not in header]
+    if missing:
+        raise ValueError(f"Dump has no column(s) {', '.join(missing)}; header is {header}")
+    key_index = header.index(key_column)
+    indexes = [(field, header.index(column)) for field, column in columns.items()]
+
+    for row in reader:
+        report.rows += 1
+        try:
+            key = row[key_index]
+            values = {field: float(row[i]) for field, i in indexes if row[i] not in MISSING}
+        except (IndexError, ValueError):
+            report.invalid += 1
+            continue
+        if not key:
+            report.invalid += 1
+        elif values:
+            yield key, values
+
+
+def apply_batch(spec: RatingsSpec, rows: dict, report: SyncReport, dry_run: bool = False) -> None:
+    """Write the ratings of one batch ({normalized key: {field: rating}}) to the reviews that differ."""
+    titles = dict(
+        spec.title_model.objects.filter(**{f"{spec.key_field}__in": list(rows)})
+        .values_list("id", spec.key_field)
+    )
+    report.matched += len(titles)
+    if not titles:
+        return
+
+    title_id = f"{spec.title_field}_id"
+    updates = defaultdict(list)  # (field, rating) -> ids of the reviews to set it on
+    changed = set()
+    for review in (spec.review_model.objects.filter(**{f"{title_id}__in": list(titles)})
+                   .values_list("id", title_id, *spec.fields).order_by()):
+        report.reviews += 1
+        current = dict(zip(spec.fields, review[2:]))
+        for field, value in rows[titles[review[1]]].items():
+            if current[field] != value:
+                updates[(field, value)].append(review[0])
+                changed.add(review[0])
+
+    report.changed += len(changed)
+    if changed and not dry_run:
+        now = timezone.now()  # update() skips auto_now
+        with transaction.atomic():
+            for (field, value), ids in updates.items():
+                for start in range(0, len(ids), UPDATE_CHUNK):
+                    spec.review_model.objects.filter(id__in=ids[start:start + UPDATE_CHUNK]).update(
+                        **{field: value}, updated=now,
+                    )
+            record(spec.change_kind, changed)
+
+
+def sync(spec: RatingsSpec, lines: Iterable[str], key_column: Optional[str] = None, columns: Optional[dict] = None,
+         delimiter: str = ",", batch_size: int = BATCH_SIZE, dry_run: bool = False,
+         progress: Optional[Callable[[SyncReport], None]] = None) -> SyncReport:
+    """
+    Apply a dump to the reviews of ``spec``'s titles. ``columns`` maps our
+    rating fields to dump columns (default: same names, all of spec.fields)
+    and ``key_column`` names the dump's key column (default: spec.key_field).
+    """
+    columns = columns or {field: field for field in spec.fields}
+    unknown = set(columns) - set(spec.fields)
+    if unknown:
+        raise ValueError(f"Unknown rating field(s) {', '.join(sorted(unknown))}; expected {', '.join(spec.fields)}")
+
+    report = SyncReport()
+    start = time.perf_counter()
+    entries = read_dump(lines, key_column or spec.key_field, columns, delimiter, report)
+    while True:
+        batch = list(islice(entries, batch_size))
+        if not batch:
+            break
+        rows = {}
+        for key, values in batch:
+            rows.setdefault(spec.normalize(key), {}).update(values)
+        apply_batch(spec, rows, report, dry_run)
+        report.seconds = time.perf_counter() - start
+        if progress is not None:
+            progress(report)
+    report.seconds = time.perf_counter() - start
+    return report
@@ -0,0 +1,106 @@
+import io
+import tempfile
+
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from reviewapp.apps.books.models import BookReview
+from reviewapp.apps.changes.models import KIND, Change
+from reviewapp.apps.movies.models import Movie, MovieReview
+from reviewapp.core.testing import seed_catalogue
+
+from .sync import BOOKS, MOVIES, sync
+
+
+MOVIE_DUMP = """imdb_id,imdb_rating,rottentomatoes_rating
+tt0000,7.5,\\N
+tt0001,6.0,80
+tt9999,9.0,99
+tt0002,not a number,
+,5.0,
+"""
+
+
+class RatingsSyncTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.catalogue = seed_catalogue(movies=3, books=2, reviewers=2)
+        for i, movie in enumerate(cls.catalogue.movies):
+            Movie.objects.filter(pk=movie.pk).update(imdb_id=f"tt000{i}")
+        # the second movie's reviews already hold the dump's ratings
+        MovieReview.objects.filter(movie=cls.catalogue.movies[1]).update(imdb_rating=6.0, rottentomatoes_rating=80)
+        cls.catalogue.books[0].isbn = "9780441013593"
+        cls.catalogue.books[0].save()
+
+    def reviews(self, movie) -> dict:
+        return {pk: (imdb, rt, updated) for pk, imdb, rt, updated in MovieReview.objects.filter(movie=movie)
+                .values_list("id", "imdb_rating", "rottentomatoes_rating", "updated")}
+
+    def feed(self, kind: int, after: int = 0) -> set:
+        return set(Change.objects.filter(kind=kind, seq__gt=after).values_list("object_id", flat=True))
+
+    def last_seq(self) -> int:
+        return Change.objects.order_by("-seq").values_list("seq", flat=True).first() or 0
+
+    def test_only_changed_reviews_are_written(self):
+        changed, unchanged = self.catalogue.movies[:2]
+        before, untouched = self.reviews(changed), self.reviews(unchanged)
+        seq = self.last_seq()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            report = sync(MOVIES, io.StringIO(MOVIE_DUMP))
+        self.assertEqual((report.rows, report.invalid, report.matched, report.reviews, report.changed),
+                         (5, 2, 2, 4, 2))
+
+        after = self.reviews(changed)
+        for pk, (imdb, rt, updated) in after.items():
+            self.assertEqual((imdb, rt), (7.5, None))  # \N never clears a rating
+            self.assertGreater(updated, before[pk][2])
+        self.assertEqual(self.reviews(unchanged), untouched)
+        self.assertEqual(self.feed(KIND.MOVIE_REVIEW, after=seq), set(after))
+
+    def test_a_second_run_changes_nothing(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            sync(MOVIES, io.StringIO(MOVIE_DUMP))
+        changes = Change.objects.count()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            report = sync(MOVIES, io.StringIO(MOVIE_DUMP))
+        self.assertEqual(callbacks, [])
+        self.assertEqual((report.reviews, report.changed), (4, 0))
+        self.assertEqual(Change.objects.count(), changes)
+
+    def test_dry_run_writes_nothing(self):
+        before = self.reviews(self.catalogue.movies[0])
+        changes = list(Change.objects.values_list("seq", "kind", "object_id"))
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            report = sync(MOVIES, io.StringIO(MOVIE_DUMP), dry_run=True)
+        self.assertEqual(callbacks, [])
+        self.assertEqual(report.changed, 2)
+        self.assertEqual(self.reviews(self.catalogue.movies[0]), before)
+        self.assertEqual(list(Change.objects.values_list("seq", "kind", "object_id")), changes)
+
+    def test_command_syncs_a_csv_file(self):
+        book = self.catalogue.books[0]
+        seq = self.last_seq()
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "books.csv"
+            path.write_text("isbn\tgr\n978-0-441-01359-3\t4.25\n978-0-000-00000-0\t3.0\n")
+            out = io.StringIO()
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command("sync_external_ratings", "books", str(path), "--delimiter", "tab",
+                             "--column", "goodreads_rating=gr", stdout=out)
+        self.assertIn("2 reviews changed", out.getvalue())
+        ids = set(BookReview.objects.filter(book=book, goodreads_rating=4.25).values_list("id", flat=True))
+        self.assertEqual(len(ids), 2)
+        self.assertEqual(self.feed(KIND.BOOK_REVIEW, after=seq), ids)
+        self.assertFalse(BookReview.objects.exclude(book=book).filter(goodreads_rating__isnull=False).exists())
+
+    def test_unknown_columns_are_rejected(self):
+        with self.assertRaises(ValueError):
+            sync(BOOKS, io.StringIO("isbn,goodreads_rating\n"), columns={"imdb_rating": "goodreads_rating"})
+        with self.assertRaises(ValueError):
+            sync(BOOKS, io.StringIO("isbn,rating\n1,2\n"))
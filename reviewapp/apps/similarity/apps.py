@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class SimilarityConfig(AppConfig):
+    name = 'reviewapp.apps.similarity'
+
+    def ready(self):
+        from . import signals  # noqa
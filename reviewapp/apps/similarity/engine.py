@@ -0,0 +1,290 @@
+"""
+Offline "more like this" index.
+
+Every title becomes a feature vector made of weighted, L2-normalised groups:
+one-hot genres, creators and languages, plus (movies only) the per-category
+aspect rating profile centred on the category mean. The dot product of two
+vectors is then a weighted sum of per-group cosine similarities.
+
+The one-hot groups are kept sparse (a title has a handful of genres and
+creators out of the whole vocabulary), so memory grows with the number of
+links rather than titles x vocabulary; the aspect profile, which nearly every
+movie fills, stays a small dense block of titles x categories. The scores of
+a block of titles against all titles are accumulated from the entries they
+share plus one matrix product for the dense part, and the top-K neighbours
+are picked per block.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from django.db import transaction
+from django.db.models import Avg
+
+from reviewapp.apps.books.models import Book
+from reviewapp.apps.movies.models import Movie, MovieAspectRating
+
+from typing import Iterable, Optional
+
+from .models import BookSimilarity, MovieSimilarity, PendingSimilarity
+
+
+TOP_K = 10
+BLOCK_SIZE = 256  # rows scored together; memory is BLOCK_SIZE x titles floats
+PAIR_CHUNK = 1 << 22  # shared entries accumulated at once
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    media: int
+    model: type
+    similarity_model: type
+    source_field: str
+    relations: tuple  # (M2M field name, weight)
+    aspect_weight: float = 0.0
+
+
+MOVIES = IndexSpec(
+    media=PendingSimilarity.MEDIA.MOVIE,
+    model=Movie,
+    similarity_model=MovieSimilarity,
+    source_field="movie",
+    relations=(("genre", 0.35), ("director", 0.2), ("language", 0.1)),
+    aspect_weight=0.35,
+)
+
+BOOKS = IndexSpec(
+    media=PendingSimilarity.MEDIA.BOOK,
+    model=Book,
+    similarity_model=BookSimilarity,
+    source_field="book",
+    relations=(("category", 0.5), ("authors", 0.35), ("language", 0.15)),
+)
+
+SPECS = {MOVIES.media: MOVIES, BOOKS.media: BOOKS}
+
+
+class Features(object):
+    """
+    Feature matrix: the sparse part as row-major (CSR) arrays with a
+    column-major (CSC) copy of the same entries, built from (row, column,
+    value) triples with unique (row, column), next to an optional dense
+    (n_rows, d) part.
+    """
+
+    def __init__(self, n_rows: int, rows: np.ndarray, cols: np.ndarray, values: np.ndarray,
+                 dense: Optional[np.ndarray] = None) -> None:
+        self.n_rows = n_rows
+        self.dense = dense
+        n_cols = int(cols.max()) + 1 if len(cols) else 0
+        order = np.lexsort((cols, rows))
+        self.indptr = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=n_rows))))
+        self.indices, self.data = cols[order], values[order].astype(np.float32)
+        order = np.lexsort((rows, cols))
+        self.col_ptr = np.concatenate(([0], np.cumsum(np.bincount(cols, minlength=n_cols))))
+        self.col_rows, self.col_data = rows[order], values[order].astype(np.float32)
+
+    def dot(self, rows: np.ndarray) -> np.ndarray:
+        """Dense (len(rows), n_rows) block of the dot products of ``rows`` with every row."""
+        if self.dense is not None:
+            scores = self.dense[rows] @ self.dense.T
+        else:
+            scores = np.zeros((len(rows), self.n_rows), dtype=np.float32)
+        counts = self.indptr[rows + 1] - self.indptr[rows]
+        local = np.repeat(np.arange(len(rows)), counts)
+        entries = _ranges(self.indptr[rows], counts)
+        cols, values = self.indices[entries], self.data[entries]
+
+        # every entry pairs with each entry of its column; expand in bounded chunks
+        pairs = self.col_ptr[cols + 1] - self.col_ptr[cols]
+        total = np.cumsum(pairs)
+        flat = scores.reshape(-1)
+        start = 0
+        while start < len(pairs):
+            done = total[start - 1] if start else 0
+            stop = max(int(np.searchsorted(total, done + PAIR_CHUNK, side="right")), start + 1)
+            chunk = slice(start, stop)
+            targets = _ranges(self.col_ptr[cols[chunk]], pairs[chunk])
+            np.add.at(
+                flat,
+                np.repeat(local[chunk], pairs[chunk]) * self.n_rows + self.col_rows[targets],
+                np.repeat(values[chunk], pairs[chunk]) * self.col_data[targets],
+            )
+            start = stop
+        return scores
+
+
+def _ranges(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Concatenation of range(start, start + count) for each pair."""
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(starts, counts) + offsets
+
+
+def _one_hot(pairs: np.ndarray, row_of: dict, weight: float) -> tuple:
+    """
+    (rows, local columns, values) of a one-hot group from an (n, 2) array of
+    (title id, related id) pairs, each row L2-normalised and weighted.
+    """
+    if not len(pairs):
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+    columns, col_index = np.unique(pairs[:, 1], return_inverse=True)
+    rows = np.fromiter((row_of[pk] for pk in pairs[:, 0]), dtype=np.int64, count=len(pairs))
+    per_row = np.bincount(rows)
+    values = np.sqrt(weight) / np.sqrt(per_row[rows])
+    return rows, col_index.ravel(), values.astype(np.float32)
+
+
+def _aspect_profile(row_of: dict, n_rows: int, weight: float) -> np.ndarray:
+    rows = list(
+        MovieAspectRating.objects.filter(review__is_public=True)
+        .values_list("review__movie_id", "category_id")
+        .annotate(avg=Avg("rating"))
+    )
+    if not rows:
+        return np.zeros((n_rows, 0), dtype=np.float32)
+    data = np.array(rows, dtype=np.float64)
+    categories, col_index = np.unique(data[:, 1], return_inverse=True)
+    row_index = np.fromiter((row_of[int(pk)] for pk in data[:, 0]), dtype=np.int64, count=len(data))
+
+    values = np.zeros((n_rows, len(categories)), dtype=np.float32)
+    present = np.zeros((n_rows, len(categories)), dtype=bool)
+    values[row_index, col_index] = data[:, 2]
+    present[row_index, col_index] = True
+
+    # centre each category on its mean so the profile captures relative strengths
+    counts = present.sum(axis=0)
+    means = np.divide(values.sum(axis=0), counts, out=np.zeros(len(categories), dtype=np.float32), where=counts > 0)
+    block = np.where(present, values - means, 0.0).astype(np.float32)
+    norms = np.linalg.norm(block, axis=1, keepdims=True)
+    np.divide(block, norms, out=block, where=norms > 0)
+    return block * np.float32(np.sqrt(weight))
+
+
+def build_features(spec: IndexSpec) -> tuple:
+    """Return (ids, features) with one feature row per title, ordered by id."""
+    ids = np.array(spec.model.objects.order_by("id").values_list("id", flat=True), dtype=np.int64)
+    row_of = {int(pk): i for i, pk in enumerate(ids)}
+
+    # lay the one-hot groups' columns side by side
+    offset, rows, cols, values = 0, [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.int64)], []
+    for field, weight in spec.relations:
+        through = getattr(spec.model, field).through
+        target = spec.model._meta.get_field(field).m2m_reverse_name()
+        pairs = np.array(
+            through.objects.values_list(f"{spec.source_field}_id", target), dtype=np.int64
+        ).reshape(-1, 2)
+        group_rows, group_cols, group_values = _one_hot(pairs, row_of, weight)
+        rows.append(group_rows)
+        cols.append(group_cols + offset)
+        values.append(group_values)
+        offset += int(group_cols.max()) + 1 if len(group_cols) else 0
+
+    dense = _aspect_profile(row_of, len(ids), spec.aspect_weight) if spec.aspect_weight else None
+    return ids, Features(
+        len(ids), np.concatenate(rows), np.concatenate(cols),
+        np.concatenate(values + [np.zeros(0, dtype=np.float32)]), dense,
+    )
+
+
+def top_k(ids: np.ndarray, features: Features, rows: np.ndarray, k: int = TOP_K) -> dict:
+    """Neighbours of ``rows`` (row positions) as {title id: [(similar id, score), ...]}."""
+    neighbours = {}
+    for start in range(0, len(rows), BLOCK_SIZE):
+        block_rows = rows[start:start + BLOCK_SIZE]
+        scores = features.dot(block_rows)
+        scores[np.arange(len(block_rows)), block_rows] = -np.inf  # never similar to itself
+
+        kk = min(k, scores.shape[1] - 1)
+        if kk <= 0:
+            for row in block_rows:
+                neighbours[int(ids[row])] = []
+            continue
+        candidates = np.argpartition(-scores, kk - 1, axis=1)[:, :kk]
+        candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+        order = np.argsort(-candidate_scores, axis=1, kind="stable")
+        candidates = np.take_along_axis(candidates, order, axis=1)
+        candidate_scores = np.take_along_axis(candidate_scores, order, axis=1)
+
+        for row, cols, vals in zip(block_rows, candidates, candidate_scores):
+            neighbours[int(ids[row])] = [
+                (int(ids[col]), float(val)) for col, val in zip(cols, vals) if val > 0
+            ]
+    return neighbours
+
+
+def _store(spec: IndexSpec, neighbours: dict) -> None:
+    model = spec.similarity_model
+    source_id = f"{spec.source_field}_id"
+    with transaction.atomic():
+        model.objects.filter(**{f"{source_id}__in": list(neighbours)}).delete()
+        model.objects.bulk_create([
+            model(**{source_id: title_id}, similar_id=similar_id, rank=rank, score=score)
+            for title_id, entries in neighbours.items()
+            for rank, (similar_id, score) in enumerate(entries)
+        ], batch_size=1000)
+
+
+def rebuild(spec: IndexSpec, k: int = TOP_K) -> int:
+    """Recompute the whole index for one media type."""
+    ids, features = build_features(spec)
+    neighbours = top_k(ids, features, np.arange(len(ids)), k)
+    with transaction.atomic():
+        spec.similarity_model.objects.exclude(**{f"{spec.source_field}_id__in": list(neighbours)}).delete()
+        _store(spec, neighbours)
+        PendingSimilarity.objects.filter(media=spec.media).delete()
+    return len(neighbours)
+
+
+def update(spec: IndexSpec, changed_ids: Optional[Iterable[int]] = None, k: int = TOP_K) -> int:
+    """
+    Refresh the index for changed titles (default: the pending ones). Besides
+    the changed titles themselves, every title whose list contains one of them
+    or whose K-th score is now beaten by one of them is recomputed.
+
+    The recomputed lists are the ones a full rebuild would produce. Lists not
+    recomputed keep their scores, which is exact for one-hot changes; aspect
+    ratings also move the category means every movie's profile is centred
+    on, so those lists drift slightly until the next ``rebuild``.
+    """
+    pending = PendingSimilarity.objects.filter(media=spec.media)
+    if changed_ids is None:
+        changed_ids = list(pending.values_list("title_id", flat=True))
+    changed_ids = set(changed_ids)
+    if not changed_ids:
+        return 0
+
+    ids, features = build_features(spec)
+    row_of = {int(pk): i for i, pk in enumerate(ids)}
+    changed_rows = np.array([row_of[pk] for pk in changed_ids if pk in row_of], dtype=np.int64)
+
+    model = spec.similarity_model
+    source_id = f"{spec.source_field}_id"
+    affected = set(int(ids[row]) for row in changed_rows)
+    affected.update(model.objects.filter(similar_id__in=changed_ids).values_list(source_id, flat=True))
+
+    if len(changed_rows):
+        kth = np.zeros(len(ids), dtype=np.float32)
+        listed = np.zeros(len(ids), dtype=bool)
+        for title_id, score in model.objects.filter(rank=k - 1).values_list(source_id, "score"):
+            if title_id in row_of:
+                kth[row_of[title_id]] = score
+                listed[row_of[title_id]] = True
+        # titles with a short list accept any positive score, full lists only a better one
+        threshold = np.where(listed, kth, 0.0)
+        beaten = np.zeros(len(ids), dtype=bool)
+        for start in range(0, len(changed_rows), BLOCK_SIZE):
+            beaten |= (features.dot(changed_rows[start:start + BLOCK_SIZE]) > threshold).any(axis=0)
+        affected.update(int(pk) for pk in ids[beaten])
+
+    rows = np.array(sorted(row_of[pk] for pk in affected if pk in row_of), dtype=np.int64)
+    with transaction.atomic():
+        _store(spec, top_k(ids, features, rows, k))
+        pending.filter(title_id__in=changed_ids).delete()
+    return len(rows)
+
+
+def mark_changed(spec: IndexSpec, title_ids: Iterable[int]) -> None:
+    PendingSimilarity.objects.bulk_create(
+        [PendingSimilarity(media=spec.media, title_id=pk) for pk in set(title_ids) if pk is not None],
+        ignore_conflicts=True,
+    )
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from reviewapp.apps.similarity.engine import SPECS, TOP_K, rebuild, update
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the \"more like this\" index. Incremental (pending titles only) unless --full is given; "
+        "run --full periodically, as aspect rating changes shift every movie's profile slightly."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Recompute every title")
+        parser.add_argument("--media", choices=["movie", "book"], help="Only this media type")
+        parser.add_argument("-k", type=int, default=TOP_K, help=f"Neighbours per title (default {TOP_K})")
+
+    def handle(self, *args, **options):
+        for spec in SPECS.values():
+            label = spec.source_field
+            if options["media"] and options["media"] != label:
+                continue
+            if options["full"]:
+                count = rebuild(spec, k=options["k"])
+            else:
+                count = update(spec, k=options["k"])
+            self.stdout.write(self.style.SUCCESS(f"Indexed {count} {label} titles"))
@@ -0,0 +1,55 @@
+from django.db import models
+
+from model_utils.choices import Choices
+
+from reviewapp.apps.books.models import Book
+from reviewapp.apps.movies.models import Movie
+
+
+class MovieSimilarity(models.Model):
+    """Precomputed "more like this" neighbours of a movie, best first."""
+    movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='similar_entries')
+    similar = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ['movie', 'rank']
+        unique_together = ['movie', 'rank']  # also the index the API lookup walks
+        verbose_name_plural = "Movie similarities"
+
+    def __str__(self):
+        return f"#{self.movie_id} ~ #{self.similar_id} ({self.score:.3f})"
+
+
+class BookSimilarity(models.Model):
+    """Precomputed "more like this" neighbours of a book, best first."""
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name='similar_entries')
+    similar = models.ForeignKey(Book, on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ['book', 'rank']
+        unique_together = ['book', 'rank']
+        verbose_name_plural = "Book similarities"
+
+    def __str__(self):
+        return f"#{self.book_id} ~ #{self.similar_id} ({self.score:.3f})"
+
+
+class PendingSimilarity(models.Model):
+    """Titles whose features changed since the index was last built."""
+    MEDIA = Choices(
+        (1, 'MOVIE', 'Movie'),
+        (2, 'BOOK', 'Book'),
+    )
+    media = models.PositiveSmallIntegerField(choices=MEDIA)
+    title_id = models.BigIntegerField()
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ['media', 'title_id']
+
+    def __str__(self):
+        return f"{self.get_media_display()} #{self.title_id}"
@@ -0,0 +1,64 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from reviewapp.apps.books.models import Book
+from reviewapp.apps.movies.models import Movie, MovieAspectRating, MovieReview
+
+from .engine import BOOKS, MOVIES, mark_changed
+from .models import BookSimilarity, MovieSimilarity
+
+
+@receiver(post_save, sender=Movie)
+def movie_saved(sender, instance, created, **kwargs):
+    if created:
+        mark_changed(MOVIES, [instance.id])
+
+
+@receiver(post_save, sender=Book)
+def book_saved(sender, instance, created, **kwargs):
+    if created:
+        mark_changed(BOOKS, [instance.id])
+
+
+@receiver(pre_delete, sender=Movie)
+def movie_deleted(sender, instance, **kwargs):
+    # titles listing the deleted one lose an entry through the cascade and need a refill
+    mark_changed(MOVIES, MovieSimilarity.objects.filter(similar=instance).values_list("movie_id", flat=True))
+
+
+@receiver(pre_delete, sender=Book)
+def book_deleted(sender, instance, **kwargs):
+    mark_changed(BOOKS, BookSimilarity.objects.filter(similar=instance).values_list("book_id", flat=True))
+
+
+def relations_changed(spec, sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        mark_changed(spec, [instance.id])
+    elif action == "pre_clear":
+        field = next(f for f, _ in spec.relations if getattr(spec.model, f).through is sender)
+        mark_changed(spec, spec.model.objects.filter(**{field: instance.id}).values_list("id", flat=True))
+    else:
+        mark_changed(spec, pk_set)
+
+
+for spec in (MOVIES, BOOKS):
+    for field, _ in spec.relations:
+        m2m_changed.connect(
+            lambda sender, spec=spec, **kwargs: relations_changed(spec, sender, **kwargs),
+            sender=getattr(spec.model, field).through,
+            weak=False,
+            dispatch_uid=f"similarity_{spec.source_field}_{field}_changed",
+        )
+
+
+@receiver([post_save, post_delete], sender=MovieAspectRating)
+def aspect_rating_changed(sender, instance, **kwargs):
+    mark_changed(MOVIES, MovieReview.objects.filter(pk=instance.review_id).values_list("movie_id", flat=True))
+
+
+@receiver([post_save, post_delete], sender=MovieReview)
+def review_changed(sender, instance, **kwargs):
+    # toggling is_public adds or removes the review's aspect ratings from the profile
+    mark_changed(MOVIES, [instance.movie_id])
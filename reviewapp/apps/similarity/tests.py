@@ -0,0 +1,87 @@
+from collections import defaultdict
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from reviewapp.apps.metadata.models import Creator, Genre, Language
+from reviewapp.apps.movies.models import Movie, MovieAspectRating, MovieReview, MovieReviewCategory
+
+from .engine import MOVIES, rebuild, update
+from .models import MovieSimilarity, PendingSimilarity
+
+
+# larger than the catalogue, so lists hold every positive neighbour and ties
+# at the cut-off cannot make two correct indexes differ
+K = 20
+
+
+def snapshot() -> dict:
+    """{movie id: {score rounded: neighbour ids}}, which is insensitive to the order of tied neighbours."""
+    index = defaultdict(lambda: defaultdict(set))
+    for movie_id, similar_id, score in MovieSimilarity.objects.values_list("movie_id", "similar_id", "score"):
+        index[movie_id][round(score, 5)].add(similar_id)
+    return {movie_id: dict(scores) for movie_id, scores in index.items()}
+
+
+class IncrementalUpdateTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        genres = [Genre.objects.create(name=f"Genre {i}", type=Genre.TYPE.MOVIE) for i in range(4)]
+        directors = [Creator.objects.create(name=f"Director {i}", type=Creator.TYPE.Director) for i in range(5)]
+        languages = [Language.objects.create(name=f"Language {i}", code=f"l{i}") for i in range(3)]
+        cls.categories = [MovieReviewCategory.objects.create(name=f"Aspect {i}") for i in range(3)]
+        cls.user = User.objects.create(username="reviewer")
+
+        cls.movies = []
+        for i in range(12):
+            movie = Movie.objects.create(title=f"Movie {i}", release_year=2000 + i, runtime=100)
+            movie.genre.set([genres[i % 4], genres[(i * 3 + 1) % 4]])
+            movie.director.set([directors[i % 5]])
+            movie.language.set([languages[i % 3]])
+            if i % 3:
+                review = MovieReview.objects.create(movie=movie, overall_rating=5 + i % 5, detailed_review="text",
+                                                    final_verdict="ok", created_by=cls.user)
+                for j, category in enumerate(cls.categories):
+                    MovieAspectRating.objects.create(review=review, category=category, rating=1 + (i * 7 + j * 3) % 10)
+            cls.movies.append(movie)
+
+    def setUp(self):
+        rebuild(MOVIES, k=K)
+        self.assertFalse(PendingSimilarity.objects.exists())
+
+    def full_rebuild(self) -> dict:
+        rebuild(MOVIES, k=K)
+        return snapshot()
+
+    def test_update_matches_rebuild_after_relation_changes(self):
+        movie = self.movies[4]
+        movie.genre.set(self.movies[9].genre.all())
+        movie.director.set(self.movies[7].director.all())
+        self.movies[10].language.clear()
+
+        self.assertGreater(update(MOVIES, k=K), 0)
+        self.assertFalse(PendingSimilarity.objects.exists())
+        self.assertEqual(snapshot(), self.full_rebuild())
+
+    def test_update_matches_rebuild_after_new_and_deleted_titles(self):
+        movie = Movie.objects.create(title="Newcomer", release_year=2024, runtime=90)
+        movie.genre.set(self.movies[2].genre.all())
+        movie.director.set(self.movies[2].director.all())
+        self.movies[5].delete()
+
+        update(MOVIES, k=K)
+        self.assertEqual(snapshot(), self.full_rebuild())
+
+    def test_update_recomputes_changed_titles_after_aspect_changes(self):
+        # the new ratings move the category means, so only the recomputed
+        # lists are guaranteed to match a full rebuild
+        review = MovieReview.objects.create(movie=self.movies[0], overall_rating=9, detailed_review="text",
+                                            final_verdict="great", created_by=self.user)
+        for category in self.categories:
+            MovieAspectRating.objects.create(review=review, category=category, rating=10)
+
+        update(MOVIES, k=K)
+        updated = snapshot()
+        expected = self.full_rebuild()
+        self.assertEqual(updated[self.movies[0].id], expected[self.movies[0].id])
@@ -0,0 +1,60 @@
+"""
+Read side of the aspect rollups. Only AspectRollup and the small lookup tables
+(categories, genres, countries) are queried, never the review tables.
+"""
+from reviewapp.apps.metadata.models import Country, Genre
+from reviewapp.apps.movies.models import MovieReviewCategory
+
+from typing import Iterable, Optional
+
+from .models import AspectRollup
+
+
+DIMENSIONS = {
+    "all": AspectRollup.DIMENSION.ALL,
+    "genre": AspectRollup.DIMENSION.GENRE,
+    "decade": AspectRollup.DIMENSION.DECADE,
+    "country": AspectRollup.DIMENSION.COUNTRY,
+}
+
+
+def _labels(dimension: int, keys: Iterable[int]) -> dict:
+    if dimension == AspectRollup.DIMENSION.GENRE:
+        return dict(Genre.objects.filter(pk__in=keys).values_list("id", "name"))
+    if dimension == AspectRollup.DIMENSION.COUNTRY:
+        return dict(Country.objects.filter(pk__in=keys).values_list("id", "name"))
+    if dimension == AspectRollup.DIMENSION.DECADE:
+        return {key: f"{key}s" for key in keys}
+    return {key: "All movies" for key in keys}
+
+
+def aspect_averages(by: str = "all", categories: Optional[Iterable[int]] = None,
+                    keys: Optional[Iterable[int]] = None, min_count: int = 1) -> list:
+    """
+    Average aspect rating per category and slice:
+        aspect_averages(by="decade", categories=[3])
+        -> [{"category": {...}, "slice": {"key": 1990, "label": "1990s"}, "average": 7.4, "count": 812}, ...]
+    """
+    dimension = DIMENSIONS[by]
+    qs = AspectRollup.objects.filter(dimension=dimension, rating_count__gte=max(min_count, 1))
+    if categories is not None:
+        qs = qs.filter(category_id__in=list(categories))
+    if keys is not None:
+        qs = qs.filter(key__in=list(keys))
+    rows = list(qs.order_by("category_id", "key").values_list("category_id", "key", "rating_sum", "rating_count"))
+
+    labels = _labels(dimension, {key for _, key, _, _ in rows})
+    category_ids = {category_id for category_id, _, _, _ in rows}
+    names = {
+        pk: {"id": pk, "name": name, "type": MovieReviewCategory.TYPE[kind] if kind else None}
+        for pk, name, kind in MovieReviewCategory.objects.filter(pk__in=category_ids).values_list("id", "name", "type")
+    }
+    return [
+        {
+            "category": names[category_id],
+            "slice": {"dimension": by, "key": key, "label": labels.get(key)},
+            "average": total / count,
+            "count": count,
+        }
+        for category_id, key, total, count in rows
+    ]
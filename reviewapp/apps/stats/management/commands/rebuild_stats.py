@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from reviewapp.apps.stats.tracking import rebuild
+
+
+class Command(BaseCommand):
+    help = "Recompute the review aggregates (reviewer stats, rating histograms, aspect rollups) from scratch, e.g. after bulk imports."
+
+    def handle(self, *args, **options):
+        rebuild()
+        self.stdout.write(self.style.SUCCESS("Review aggregates rebuilt"))
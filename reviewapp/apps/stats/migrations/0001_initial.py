@@ -0,0 +1,44 @@
+# Generated by Django 5.2.7 on 2026-10-19 01:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewerStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='review_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('movie_reviews', models.PositiveIntegerField(default=0)),
+                ('movie_rating_sum', models.FloatField(default=0)),
+                ('book_reviews', models.PositiveIntegerField(default=0)),
+                ('book_rating_sum', models.FloatField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'Reviewer stats',
+            },
+        ),
+        migrations.CreateModel(
+            name='ReviewerRatingBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('media', models.PositiveSmallIntegerField(choices=[(1, 'Movie'), (2, 'Book')])),
+                ('bucket', models.PositiveSmallIntegerField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rating_buckets', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'media', 'bucket')},
+            },
+        ),
+    ]
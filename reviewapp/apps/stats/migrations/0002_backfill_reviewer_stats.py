@@ -0,0 +1,39 @@
+from django.db import migrations
+from django.db.models import Count, Sum
+
+
+def backfill(apps, schema_editor):
+    ReviewerStats = apps.get_model('stats', 'ReviewerStats')
+    ReviewerRatingBucket = apps.get_model('stats', 'ReviewerRatingBucket')
+
+    stats = {}
+    buckets = {}
+    for media, (app_label, model_name, prefix) in enumerate(
+            [('movies', 'MovieReview', 'movie'), ('books', 'BookReview', 'book')], start=1):
+        public = apps.get_model(app_label, model_name).objects.filter(is_public=True).order_by()
+        for user_id, count, total in public.values_list('created_by_id').annotate(c=Count('id'), s=Sum('overall_rating')):
+            row = stats.setdefault(user_id, ReviewerStats(user_id=user_id))
+            setattr(row, f'{prefix}_reviews', count)
+            setattr(row, f'{prefix}_rating_sum', total)
+        for user_id, rating in public.values_list('created_by_id', 'overall_rating').iterator():
+            key = (user_id, media, min(max(int(rating + 0.5), 1), 10))
+            buckets[key] = buckets.get(key, 0) + 1
+
+    ReviewerStats.objects.bulk_create(stats.values(), batch_size=1000)
+    ReviewerRatingBucket.objects.bulk_create([
+        ReviewerRatingBucket(user_id=user_id, media=media, bucket=bucket, count=count)
+        for (user_id, media, bucket), count in buckets.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stats', '0001_initial'),
+        ('movies', '0004_moviereview_created_by_created_index'),
+        ('books', '0002_bookreview_created_by_created_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
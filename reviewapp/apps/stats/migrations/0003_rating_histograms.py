@@ -0,0 +1,53 @@
+# Generated by Django 5.2.7 on 2026-10-19 01:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0002_bookreview_created_by_created_index'),
+        ('movies', '0004_moviereview_created_by_created_index'),
+        ('stats', '0002_backfill_reviewer_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AspectRatingBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.PositiveSmallIntegerField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='movies.moviereviewcategory')),
+                ('movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aspect_buckets', to='movies.movie')),
+            ],
+            options={
+                'unique_together': {('movie', 'category', 'bucket')},
+            },
+        ),
+        migrations.CreateModel(
+            name='BookRatingBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.PositiveSmallIntegerField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rating_buckets', to='books.book')),
+            ],
+            options={
+                'unique_together': {('book', 'bucket')},
+            },
+        ),
+        migrations.CreateModel(
+            name='MovieRatingBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.PositiveSmallIntegerField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rating_buckets', to='movies.movie')),
+            ],
+            options={
+                'unique_together': {('movie', 'bucket')},
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+from collections import Counter
+
+from django.db import migrations
+
+
+def bucket(rating):
+    return min(max(int(rating + 0.5), 1), 10)
+
+
+def backfill(apps, schema_editor):
+    MovieReview = apps.get_model('movies', 'MovieReview')
+    BookReview = apps.get_model('books', 'BookReview')
+    MovieAspectRating = apps.get_model('movies', 'MovieAspectRating')
+    MovieRatingBucket = apps.get_model('stats', 'MovieRatingBucket')
+    BookRatingBucket = apps.get_model('stats', 'BookRatingBucket')
+    AspectRatingBucket = apps.get_model('stats', 'AspectRatingBucket')
+
+    for review_model, bucket_model, field in ((MovieReview, MovieRatingBucket, 'movie_id'),
+                                              (BookReview, BookRatingBucket, 'book_id')):
+        counts = Counter(
+            (title_id, bucket(rating))
+            for title_id, rating in review_model.objects.filter(is_public=True)
+            .values_list(field, 'overall_rating').iterator()
+        )
+        bucket_model.objects.bulk_create([
+            bucket_model(**{field: title_id}, bucket=b, count=count) for (title_id, b), count in counts.items()
+        ], batch_size=1000)
+
+    counts = Counter(
+        (movie_id, category_id, bucket(rating))
+        for movie_id, category_id, rating in MovieAspectRating.objects.filter(review__is_public=True)
+        .values_list('review__movie_id', 'category_id', 'rating').iterator()
+    )
+    AspectRatingBucket.objects.bulk_create([
+        AspectRatingBucket(movie_id=movie_id, category_id=category_id, bucket=b, count=count)
+        for (movie_id, category_id, b), count in counts.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stats', '0003_rating_histograms'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
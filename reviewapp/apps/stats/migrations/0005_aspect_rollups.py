@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-19 01:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0004_moviereview_created_by_created_index'),
+        ('stats', '0004_backfill_rating_histograms'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AspectRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.PositiveSmallIntegerField(choices=[(1, 'All movies'), (2, 'Genre'), (3, 'Release decade'), (4, 'Country')])),
+                ('key', models.IntegerField()),
+                ('rating_sum', models.FloatField(default=0)),
+                ('rating_count', models.PositiveIntegerField(default=0)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='movies.moviereviewcategory')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['dimension', 'key'], name='stats_aspec_dimensi_0395ab_idx')],
+                'unique_together': {('category', 'dimension', 'key')},
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+from collections import defaultdict
+
+from django.db import migrations
+
+
+ALL, GENRE, DECADE, COUNTRY = 1, 2, 3, 4
+
+
+def backfill(apps, schema_editor):
+    Movie = apps.get_model('movies', 'Movie')
+    MovieAspectRating = apps.get_model('movies', 'MovieAspectRating')
+    AspectRollup = apps.get_model('stats', 'AspectRollup')
+
+    slices = defaultdict(list)
+    for movie_id, year in Movie.objects.values_list('id', 'release_year').iterator():
+        slices[movie_id] += [(ALL, 0), (DECADE, year // 10 * 10)]
+    for movie_id, genre_id in Movie.genre.through.objects.values_list('movie_id', 'genre_id').iterator():
+        slices[movie_id].append((GENRE, genre_id))
+    for movie_id, country_id in Movie.country.through.objects.values_list('movie_id', 'country_id').iterator():
+        slices[movie_id].append((COUNTRY, country_id))
+
+    totals = defaultdict(lambda: [0.0, 0])
+    for movie_id, category_id, rating in MovieAspectRating.objects.filter(review__is_public=True) \
+            .values_list('review__movie_id', 'category_id', 'rating').iterator():
+        for dimension, key in slices[movie_id]:
+            entry = totals[(category_id, dimension, key)]
+            entry[0] += rating
+            entry[1] += 1
+
+    AspectRollup.objects.bulk_create([
+        AspectRollup(category_id=category_id, dimension=dimension, key=key, rating_sum=total, rating_count=count)
+        for (category_id, dimension, key), (total, count) in totals.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stats', '0005_aspect_rollups'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
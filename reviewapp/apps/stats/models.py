@@ -0,0 +1,122 @@
+from django.db import models
+from django.contrib.auth.models import User
+
+from model_utils.choices import Choices
+
+from reviewapp.apps.books.models import Book
+from reviewapp.apps.movies.models import Movie, MovieReviewCategory
+
+
+MEDIA = Choices(
+    (1, 'MOVIE', 'Movie'),
+    (2, 'BOOK', 'Book'),
+)
+
+
+class ReviewerStats(models.Model):
+    """Running totals over a user's public reviews, kept up to date on review writes."""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='review_stats')
+    movie_reviews = models.PositiveIntegerField(default=0)
+    movie_rating_sum = models.FloatField(default=0)
+    book_reviews = models.PositiveIntegerField(default=0)
+    book_rating_sum = models.FloatField(default=0)
+
+    class Meta:
+        verbose_name_plural = "Reviewer stats"
+
+    def __str__(self):
+        return f"Stats for user #{self.user_id}"
+
+    @property
+    def total_reviews(self):
+        return self.movie_reviews + self.book_reviews
+
+    @property
+    def average_rating(self):
+        total = self.total_reviews
+        return (self.movie_rating_sum + self.book_rating_sum) / total if total else None
+
+
+class ReviewerRatingBucket(models.Model):
+    """Number of a user's public reviews per media type and rounded overall_rating (1-10)."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='rating_buckets')
+    media = models.PositiveSmallIntegerField(choices=MEDIA)
+    bucket = models.PositiveSmallIntegerField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ['user', 'media', 'bucket']
+
+    def __str__(self):
+        return f"User #{self.user_id} {self.get_media_display()} {self.bucket}: {self.count}"
+
+
+class MovieRatingBucket(models.Model):
+    """Number of public reviews of a movie per rounded overall_rating (1-10)."""
+    movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='rating_buckets')
+    bucket = models.PositiveSmallIntegerField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ['movie', 'bucket']
+
+    def __str__(self):
+        return f"Movie #{self.movie_id} {self.bucket}: {self.count}"
+
+
+class BookRatingBucket(models.Model):
+    """Number of public reviews of a book per rounded overall_rating (1-10)."""
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name='rating_buckets')
+    bucket = models.PositiveSmallIntegerField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ['book', 'bucket']
+
+    def __str__(self):
+        return f"Book #{self.book_id} {self.bucket}: {self.count}"
+
+
+class AspectRatingBucket(models.Model):
+    """Number of public aspect ratings of a movie per category and rounded rating (1-10)."""
+    movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='aspect_buckets')
+    category = models.ForeignKey(MovieReviewCategory, on_delete=models.CASCADE, related_name='+')
+    bucket = models.PositiveSmallIntegerField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ['movie', 'category', 'bucket']
+
+    def __str__(self):
+        return f"Movie #{self.movie_id} category #{self.category_id} {self.bucket}: {self.count}"
+
+
+class AspectRollup(models.Model):
+    """
+    Sum and count of public aspect ratings per category, sliced by one movie
+    dimension. `key` is the genre/country id, the decade (e.g. 1990), or 0 for ALL.
+    """
+    DIMENSION = Choices(
+        (1, 'ALL', 'All movies'),
+        (2, 'GENRE', 'Genre'),
+        (3, 'DECADE', 'Release decade'),
+        (4, 'COUNTRY', 'Country'),
+    )
+    category = models.ForeignKey(MovieReviewCategory, on_delete=models.CASCADE, related_name='+')
+    dimension = models.PositiveSmallIntegerField(choices=DIMENSION)
+    key = models.IntegerField()
+    rating_sum = models.FloatField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ['category', 'dimension', 'key']
+        indexes = [
+            models.Index(fields=['dimension', 'key']),
+        ]
+
+    def __str__(self):
+        return f"Category #{self.category_id} {self.get_dimension_display()} {self.key}"
+
+    @property
+    def average(self):
+        return self.rating_sum / self.rating_count if self.rating_count else None
@@ -0,0 +1,123 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from reviewapp.apps.metadata.models import Country, Genre
+from reviewapp.apps.movies.models import Movie, MovieAspectRating
+
+from .models import AspectRollup
+from .tracking import (
+    REVIEW_MODELS, apply_rollups, aspect_contribution, contribution, decade, deleting_movies, movie_slices,
+    movie_totals, replace, replace_aspect, stored_aspect_contribution, stored_contribution,
+)
+
+
+def review_pre_save(sender, instance, raw=False, **kwargs):
+    instance._stats_previous = None if raw else stored_contribution(sender, instance.pk)
+
+
+def review_post_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    replace(getattr(instance, "_stats_previous", None), contribution(instance), review_id=instance.pk)
+    instance._stats_previous = contribution(instance)
+
+
+def review_post_delete(sender, instance, **kwargs):
+    # its aspect ratings were deleted (and subtracted) first by the cascade
+    replace(contribution(instance), None)
+
+
+for model in REVIEW_MODELS:
+    label = model._meta.label_lower
+    pre_save.connect(review_pre_save, sender=model, dispatch_uid=f"stats_{label}_pre_save")
+    post_save.connect(review_post_save, sender=model, dispatch_uid=f"stats_{label}_post_save")
+    post_delete.connect(review_post_delete, sender=model, dispatch_uid=f"stats_{label}_post_delete")
+
+
+@receiver(pre_save, sender=MovieAspectRating)
+def aspect_pre_save(sender, instance, raw=False, **kwargs):
+    instance._stats_previous = None if raw else stored_aspect_contribution(instance.pk)
+
+
+@receiver(post_save, sender=MovieAspectRating)
+def aspect_post_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    current = aspect_contribution(instance)
+    replace_aspect(getattr(instance, "_stats_previous", None), current)
+    instance._stats_previous = current
+
+
+@receiver(post_delete, sender=MovieAspectRating)
+def aspect_post_delete(sender, instance, **kwargs):
+    replace_aspect(aspect_contribution(instance), None)
+
+
+# Rollup slices: when a movie changes decade, genres or countries, or goes
+# away, its whole aspect total moves between slices.
+
+@receiver(pre_save, sender=Movie)
+def movie_pre_save(sender, instance, raw=False, **kwargs):
+    instance._stats_year = None
+    if not raw and instance.pk is not None:
+        instance._stats_year = Movie.objects.filter(pk=instance.pk).values_list("release_year", flat=True).first()
+
+
+@receiver(post_save, sender=Movie)
+def movie_post_save(sender, instance, created, raw=False, **kwargs):
+    previous = getattr(instance, "_stats_year", None)
+    if raw or created or previous is None or decade(previous) == decade(instance.release_year):
+        return
+    totals = movie_totals(instance.pk)
+    with transaction.atomic():
+        apply_rollups(instance.pk, [(AspectRollup.DIMENSION.DECADE, decade(previous))], totals, -1)
+        apply_rollups(instance.pk, [(AspectRollup.DIMENSION.DECADE, decade(instance.release_year))], totals, +1)
+    instance._stats_year = instance.release_year
+
+
+@receiver(pre_delete, sender=Movie)
+def movie_pre_delete(sender, instance, **kwargs):
+    apply_rollups(instance.pk, movie_slices(instance.pk), movie_totals(instance.pk), -1)
+    deleting_movies().add(instance.pk)
+
+
+@receiver(post_delete, sender=Movie)
+def movie_post_delete(sender, instance, **kwargs):
+    deleting_movies().discard(instance.pk)
+
+
+ROLLUP_RELATIONS = {
+    Movie.genre.through: AspectRollup.DIMENSION.GENRE,
+    Movie.country.through: AspectRollup.DIMENSION.COUNTRY,
+}
+
+
+def movie_slice_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    dimension = ROLLUP_RELATIONS[sender]
+    sign = {"post_add": +1, "post_remove": -1, "pre_clear": -1}.get(action)
+    if sign is None:
+        return
+    if not reverse:
+        if action == "pre_clear":
+            pk_set = {key for dim, key in movie_slices(instance.pk) if dim == dimension}
+        apply_rollups(instance.pk, [(dimension, key) for key in pk_set], movie_totals(instance.pk), sign)
+    else:
+        field = "genre" if dimension == AspectRollup.DIMENSION.GENRE else "country"
+        if action == "pre_clear":
+            pk_set = Movie.objects.filter(**{field: instance.pk}).values_list("id", flat=True)
+        for movie_id in pk_set:
+            apply_rollups(movie_id, [(dimension, instance.pk)], movie_totals(movie_id), sign)
+
+
+for through in ROLLUP_RELATIONS:
+    m2m_changed.connect(movie_slice_changed, sender=through,
+                        dispatch_uid=f"stats_{through._meta.label_lower}_changed")
+
+
+@receiver(pre_delete, sender=Genre)
+@receiver(pre_delete, sender=Country)
+def slice_deleted(sender, instance, **kwargs):
+    # the M2M rows go with the cascade without m2m_changed
+    dimension = AspectRollup.DIMENSION.GENRE if sender is Genre else AspectRollup.DIMENSION.COUNTRY
+    AspectRollup.objects.filter(dimension=dimension, key=instance.pk).delete()
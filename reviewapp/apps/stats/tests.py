@@ -0,0 +1,173 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from reviewapp.apps.books.models import BookReview
+from reviewapp.apps.movies.models import Movie, MovieAspectRating, MovieReview
+from reviewapp.core.testing import seed_catalogue
+
+from . import tracking
+from .models import (
+    AspectRatingBucket, AspectRollup, BookRatingBucket, MovieRatingBucket, ReviewerRatingBucket, ReviewerStats,
+)
+
+
+# Rows as rebuild() writes them; the incremental path may leave emptied rows
+# behind, which rebuild() does not create.
+SNAPSHOTS = {
+    ReviewerStats: (("user_id", "movie_reviews", "movie_rating_sum", "book_reviews", "book_rating_sum"),
+                    ("movie_reviews", "book_reviews")),
+    ReviewerRatingBucket: (("user_id", "media", "bucket", "count"), ("count",)),
+    MovieRatingBucket: (("movie_id", "bucket", "count"), ("count",)),
+    BookRatingBucket: (("book_id", "bucket", "count"), ("count",)),
+    AspectRatingBucket: (("movie_id", "category_id", "bucket", "count"), ("count",)),
+    AspectRollup: (("category_id", "dimension", "key", "rating_sum", "rating_count"), ("rating_count",)),
+}
+
+
+def snapshot() -> dict:
+    tables = {}
+    for model, (fields, counts) in SNAPSHOTS.items():
+        rows = (row for row in model.objects.values_list(*fields) if any(row[fields.index(f)] for f in counts))
+        tables[model.__name__] = sorted(
+            tuple(round(value, 6) if isinstance(value, float) else value for value in row) for row in rows
+        )
+    return tables
+
+
+class RebuildEquivalenceMixin:
+    """Every write below leaves the aggregates exactly as tracking.rebuild() computes them."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.catalogue = seed_catalogue(movies=4, books=3, reviewers=3)
+
+    def assertMatchesRebuild(self):
+        incremental = snapshot()
+        tracking.rebuild()
+        self.assertEqual(incremental, snapshot())
+        self.assertTrue(incremental["AspectRollup"])
+
+
+class ReviewStatsTests(RebuildEquivalenceMixin, TestCase):
+
+    def test_seeded_catalogue(self):
+        self.assertMatchesRebuild()
+
+    def test_review_create_and_delete(self):
+        user = User.objects.create(username="newcomer")
+        movie = self.catalogue.movies[1]
+        review = MovieReview.objects.create(movie=movie, overall_rating=6.5, detailed_review="text",
+                                            final_verdict="fine", created_by=user)
+        MovieAspectRating.objects.create(review=review, category=self.catalogue.categories[0], rating=4)
+        BookReview.objects.create(book=self.catalogue.books[0], overall_rating=9, detailed_review="text",
+                                  final_verdict="great", created_by=user)
+        self.assertMatchesRebuild()
+
+        review.delete()
+        self.catalogue.users[0].reviews.first().delete()
+        BookReview.objects.filter(created_by=user).delete()
+        self.assertMatchesRebuild()
+
+    def test_rating_edit(self):
+        for review in MovieReview.objects.all()[:3]:
+            review.overall_rating = 10 - review.overall_rating
+            review.save()
+        self.assertMatchesRebuild()
+
+    def test_visibility_flips(self):
+        for model in (MovieReview, BookReview):
+            for review in model.objects.all():
+                review.is_public = not review.is_public
+                review.save()
+        self.assertMatchesRebuild()
+
+        review = MovieReview.objects.filter(is_public=True).first()
+        review.is_public = False
+        review.save()
+        review.is_public = True
+        review.save()
+        self.assertMatchesRebuild()
+
+    def test_review_moves_to_another_movie(self):
+        target = Movie.objects.create(title="Sequel", release_year=2011, runtime=100)
+        target.genre.set([self.catalogue.genres[1]])
+        target.country.set([self.catalogue.countries[0]])
+        public = MovieReview.objects.filter(movie=self.catalogue.movies[0], is_public=True).first()
+        public.movie = target
+        public.save()
+        hidden = MovieReview.objects.filter(is_public=False).first()
+        hidden.movie = target
+        hidden.save()
+        self.assertMatchesRebuild()
+
+    def test_release_year_changes(self):
+        movie = Movie.objects.get(pk=self.catalogue.movies[0].pk)
+        movie.release_year += 1  # same decade
+        movie.save()
+        self.assertMatchesRebuild()
+
+        movie.release_year = 2021  # next decades over
+        movie.save()
+        self.assertMatchesRebuild()
+
+    def test_m2m_changes_and_clears(self):
+        movie = self.catalogue.movies[0]
+        movie.genre.add(self.catalogue.genres[1])
+        movie.country.remove(*movie.country.all())
+        self.assertMatchesRebuild()
+
+        movie.genre.clear()
+        self.catalogue.movies[1].country.clear()
+        self.assertMatchesRebuild()
+
+        # from the other side of the relation
+        self.catalogue.genres[1].movie_set.clear()
+        self.catalogue.countries[0].movie_set.add(*self.catalogue.movies)
+        self.assertMatchesRebuild()
+
+    def test_movie_and_slice_deletes(self):
+        self.catalogue.movies[2].delete()
+        self.catalogue.genres[0].delete()
+        self.catalogue.countries[1].delete()
+        self.assertMatchesRebuild()
+
+
+class AspectStatsTests(RebuildEquivalenceMixin, TestCase):
+    """AspectRatingBucket and AspectRollup in particular."""
+
+    def test_aspect_rating_add_edit_delete(self):
+        first, second, third = self.catalogue.categories
+        public = MovieReview.objects.filter(is_public=True).first()
+        hidden = MovieReview.objects.filter(is_public=False).first()
+        MovieAspectRating.objects.filter(review__in=[public, hidden], category=first).delete()
+        self.assertMatchesRebuild()
+
+        MovieAspectRating.objects.create(review=public, category=first, rating=7.5, review_text="new")
+        MovieAspectRating.objects.create(review=hidden, category=first, rating=2, review_text="new")
+        self.assertMatchesRebuild()
+
+        for aspect in MovieAspectRating.objects.all()[:5]:
+            aspect.rating = 11 - aspect.rating
+            aspect.save()
+        # a rating moving to another category
+        public.aspect_ratings.filter(category=third).delete()
+        aspect = public.aspect_ratings.get(category=second)
+        aspect.category = third
+        aspect.save()
+        self.assertMatchesRebuild()
+
+    def test_review_visibility_moves_its_aspect_ratings(self):
+        review = MovieReview.objects.filter(is_public=True).first()
+        review.is_public = False
+        review.save()
+        self.assertMatchesRebuild()
+
+        for review in MovieReview.objects.filter(is_public=False):
+            review.is_public = True
+            review.save()
+        self.assertMatchesRebuild()
+
+    def test_review_delete_removes_its_aspect_ratings(self):
+        MovieReview.objects.filter(is_public=True).first().delete()
+        MovieReview.objects.filter(is_public=False).first().delete()
+        self.assertMatchesRebuild()
@@ -0,0 +1,311 @@
+"""
+Incremental maintenance of the review aggregates.
+
+Each public review contributes to its reviewer's totals and rating
+distribution and to its title's rating histogram; each of its aspect ratings
+contributes to the title's per-category histogram and to the category
+rollups of every slice (genre, decade, country) the movie belongs to. On
+every write the previous contribution is subtracted and the new one added
+with atomic F() updates, so concurrent writes never lose counts.
+"""
+import threading
+
+from collections import defaultdict
+from dataclasses import dataclass
+
+import numpy as np
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+
+from reviewapp.apps.books.models import BookReview
+from reviewapp.apps.movies.models import Movie, MovieAspectRating, MovieReview
+
+from typing import Optional
+
+from .models import (
+    MEDIA, AspectRatingBucket, AspectRollup, BookRatingBucket, MovieRatingBucket, ReviewerRatingBucket,
+    ReviewerStats,
+)
+
+
+REVIEW_MODELS = {MovieReview: MEDIA.MOVIE, BookReview: MEDIA.BOOK}
+
+STATS_FIELDS = {
+    MEDIA.MOVIE: ("movie_reviews", "movie_rating_sum"),
+    MEDIA.BOOK: ("book_reviews", "book_rating_sum"),
+}
+
+TITLE_BUCKETS = {
+    MEDIA.MOVIE: (MovieRatingBucket, "movie_id"),
+    MEDIA.BOOK: (BookRatingBucket, "book_id"),
+}
+
+
+def rating_bucket(rating: float) -> int:
+    """Round half up into the 1-10 histogram buckets."""
+    return min(max(int(rating + 0.5), 1), 10)
+
+
+def rating_buckets(ratings: np.ndarray) -> np.ndarray:
+    """Vectorised rating_bucket."""
+    return np.clip(np.floor(np.asarray(ratings, dtype=np.float64) + 0.5), 1, 10).astype(np.int64)
+
+
+@dataclass(frozen=True)
+class Contribution:
+    media: int
+    user_id: int
+    title_id: int
+    rating: float
+
+
+@dataclass(frozen=True)
+class AspectContribution:
+    movie_id: int
+    category_id: int
+    rating: float
+
+
+def contribution(review) -> Optional[Contribution]:
+    """What ``review`` adds to the aggregates; hidden reviews add nothing."""
+    if review is None or not review.is_public:
+        return None
+    media = REVIEW_MODELS[type(review)]
+    title_id = review.movie_id if media == MEDIA.MOVIE else review.book_id
+    return Contribution(media, review.created_by_id, title_id, review.overall_rating)
+
+
+def stored_contribution(model, pk) -> Optional[Contribution]:
+    """Contribution of the row as it is in the database, before a pending save."""
+    if pk is None:
+        return None
+    return contribution(model.objects.filter(pk=pk).only(
+        "is_public", "created_by_id", "overall_rating",
+        "movie_id" if model is MovieReview else "book_id",
+    ).first())
+
+
+def aspect_contribution(aspect: Optional[MovieAspectRating]) -> Optional[AspectContribution]:
+    if aspect is None:
+        return None
+    review = MovieReview.objects.filter(pk=aspect.review_id, is_public=True).values_list("movie_id", flat=True)
+    movie_id = review.first()
+    if movie_id is None:
+        return None
+    return AspectContribution(movie_id, aspect.category_id, aspect.rating)
+
+
+def stored_aspect_contribution(pk) -> Optional[AspectContribution]:
+    if pk is None:
+        return None
+    return aspect_contribution(MovieAspectRating.objects.filter(pk=pk).only("review_id", "category_id", "rating").first())
+
+
+def review_aspect_contributions(review_id: int, movie_id: int) -> list:
+    return [
+        AspectContribution(movie_id, category_id, rating)
+        for category_id, rating in MovieAspectRating.objects.filter(review_id=review_id)
+        .values_list("category_id", "rating")
+    ]
+
+
+def _increment(model, lookup: dict, **deltas) -> None:
+    if not model.objects.filter(**lookup).update(**{f: F(f) + d for f, d in deltas.items()}):
+        if all(d <= 0 for d in deltas.values()):
+            # nothing to subtract from, e.g. the row went away in the same cascade
+            return
+        model.objects.get_or_create(**lookup)
+        model.objects.filter(**lookup).update(**{f: F(f) + d for f, d in deltas.items()})
+
+
+def apply(item: Optional[Contribution], sign: int) -> None:
+    if item is None:
+        return
+    bucket = rating_bucket(item.rating)
+    count_field, sum_field = STATS_FIELDS[item.media]
+    _increment(ReviewerStats, {"user_id": item.user_id}, **{count_field: sign, sum_field: sign * item.rating})
+    _increment(ReviewerRatingBucket, {"user_id": item.user_id, "media": item.media, "bucket": bucket}, count=sign)
+    model, title_field = TITLE_BUCKETS[item.media]
+    _increment(model, {title_field: item.title_id, "bucket": bucket}, count=sign)
+
+
+def decade(year: int) -> int:
+    return year // 10 * 10
+
+
+def movie_slices(movie_id: int) -> list:
+    """(dimension, key) pairs of the rollups a movie's aspect ratings count towards."""
+    year = Movie.objects.filter(pk=movie_id).values_list("release_year", flat=True).first()
+    if year is None:
+        return []
+    dimension = AspectRollup.DIMENSION
+    return (
+        [(dimension.ALL, 0), (dimension.DECADE, decade(year))]
+        + [(dimension.GENRE, pk) for pk in
+           Movie.genre.through.objects.filter(movie_id=movie_id).values_list("genre_id", flat=True)]
+        + [(dimension.COUNTRY, pk) for pk in
+           Movie.country.through.objects.filter(movie_id=movie_id).values_list("country_id", flat=True)]
+    )
+
+
+def movie_totals(movie_id: int) -> list:
+    """(category id, rating sum, rating count) of a movie's public aspect ratings."""
+    return list(
+        MovieAspectRating.objects.filter(review__movie_id=movie_id, review__is_public=True)
+        .order_by().values_list("category_id").annotate(total=Sum("rating"), count=Count("id"))
+    )
+
+
+def apply_rollups(movie_id: int, slices: list, totals: list, sign: int) -> None:
+    for category_id, total, count in totals:
+        for dimension, key in slices:
+            _increment(AspectRollup, {"category_id": category_id, "dimension": dimension, "key": key},
+                       rating_sum=sign * total, rating_count=sign * count)
+
+
+# Movies whose slices were already subtracted as a whole in pre_delete; the
+# cascade that follows must not subtract their aspect ratings a second time.
+_deleting = threading.local()
+
+
+def deleting_movies() -> set:
+    if not hasattr(_deleting, "ids"):
+        _deleting.ids = set()
+    return _deleting.ids
+
+
+def apply_aspect(item: Optional[AspectContribution], sign: int) -> None:
+    if item is None:
+        return
+    _increment(AspectRatingBucket,
+               {"movie_id": item.movie_id, "category_id": item.category_id, "bucket": rating_bucket(item.rating)},
+               count=sign)
+    if item.movie_id not in deleting_movies():
+        apply_rollups(item.movie_id, movie_slices(item.movie_id), [(item.category_id, item.rating, 1)], sign)
+
+
+def replace(old: Optional[Contribution], new: Optional[Contribution], review_id: Optional[int] = None) -> None:
+    """
+    Swap a review's contribution. When a movie review becomes visible, hidden
+    or moves to another movie, its aspect ratings follow it.
+    """
+    if old == new:
+        return
+    with transaction.atomic():
+        apply(old, -1)
+        apply(new, +1)
+
+        media = (old or new).media
+        old_title = old.title_id if old else None
+        new_title = new.title_id if new else None
+        if media == MEDIA.MOVIE and review_id is not None and old_title != new_title:
+            for movie_id, sign in ((old_title, -1), (new_title, +1)):
+                if movie_id is not None:
+                    for item in review_aspect_contributions(review_id, movie_id):
+                        apply_aspect(item, sign)
+
+
+def replace_aspect(old: Optional[AspectContribution], new: Optional[AspectContribution]) -> None:
+    if old == new:
+        return
+    with transaction.atomic():
+        apply_aspect(old, -1)
+        apply_aspect(new, +1)
+
+
+def _histogram(columns: list) -> tuple:
+    """Count rows per distinct key tuple; returns (unique keys, counts)."""
+    stacked = np.column_stack(columns)
+    if not len(stacked):
+        return stacked, np.zeros(0, dtype=np.int64)
+    return np.unique(stacked, axis=0, return_counts=True)
+
+
+def rebuild() -> None:
+    """
+    Recompute every aggregate from the review tables. Ratings are fetched as
+    flat columns and bucketed/counted with NumPy instead of one GROUP BY per
+    aggregate.
+    """
+    with transaction.atomic():
+        for model in (ReviewerStats, ReviewerRatingBucket, MovieRatingBucket, BookRatingBucket,
+                      AspectRatingBucket, AspectRollup):
+            model.objects.all().delete()
+
+        stats = {}
+        reviewer_buckets = []
+        for review_model, media in REVIEW_MODELS.items():
+            bucket_model, title_field = TITLE_BUCKETS[media]
+            rows = np.array(
+                review_model.objects.filter(is_public=True).order_by()
+                .values_list("created_by_id", title_field, "overall_rating"),
+                dtype=np.float64,
+            ).reshape(-1, 3)
+            users, titles = rows[:, 0].astype(np.int64), rows[:, 1].astype(np.int64)
+            ratings = rows[:, 2]
+            buckets = rating_buckets(ratings)
+
+            count_field, sum_field = STATS_FIELDS[media]
+            user_ids, inverse = np.unique(users, return_inverse=True)
+            counts = np.bincount(inverse, minlength=len(user_ids))
+            sums = np.bincount(inverse, weights=ratings, minlength=len(user_ids))
+            for user_id, count, total in zip(user_ids.tolist(), counts.tolist(), sums.tolist()):
+                row = stats.setdefault(user_id, ReviewerStats(user_id=user_id))
+                setattr(row, count_field, count)
+                setattr(row, sum_field, total)
+
+            keys, counts = _histogram([users, buckets])
+            reviewer_buckets.extend(
+                ReviewerRatingBucket(user_id=user_id, media=media, bucket=bucket, count=count)
+                for (user_id, bucket), count in zip(keys.tolist(), counts.tolist())
+            )
+            keys, counts = _histogram([titles, buckets])
+            bucket_model.objects.bulk_create([
+                bucket_model(**{title_field: title_id}, bucket=bucket, count=count)
+                for (title_id, bucket), count in zip(keys.tolist(), counts.tolist())
+            ], batch_size=1000)
+
+        rows = np.array(
+            MovieAspectRating.objects.filter(review__is_public=True).order_by()
+            .values_list("review__movie_id", "category_id", "rating"),
+            dtype=np.float64,
+        ).reshape(-1, 3)
+        keys, counts = _histogram([rows[:, 0].astype(np.int64), rows[:, 1].astype(np.int64), rating_buckets(rows[:, 2])])
+        AspectRatingBucket.objects.bulk_create([
+            AspectRatingBucket(movie_id=movie_id, category_id=category_id, bucket=bucket, count=count)
+            for (movie_id, category_id, bucket), count in zip(keys.tolist(), counts.tolist())
+        ], batch_size=1000)
+
+        ReviewerStats.objects.bulk_create(stats.values(), batch_size=1000)
+        ReviewerRatingBucket.objects.bulk_create(reviewer_buckets, batch_size=1000)
+        AspectRollup.objects.bulk_create(_rollups(rows), batch_size=1000)
+
+
+def _rollups(rows: np.ndarray) -> list:
+    """Rollup rows from (movie id, category id, rating) public aspect ratings."""
+    if not len(rows):
+        return []
+    keys, inverse = np.unique(rows[:, :2].astype(np.int64), axis=0, return_inverse=True)
+    sums = np.bincount(inverse.ravel(), weights=rows[:, 2], minlength=len(keys))
+    counts = np.bincount(inverse.ravel(), minlength=len(keys))
+
+    dimension = AspectRollup.DIMENSION
+    slices = defaultdict(list)
+    for movie_id, year in Movie.objects.values_list("id", "release_year"):
+        slices[movie_id] += [(dimension.ALL, 0), (dimension.DECADE, decade(year))]
+    for movie_id, genre_id in Movie.genre.through.objects.values_list("movie_id", "genre_id"):
+        slices[movie_id].append((dimension.GENRE, genre_id))
+    for movie_id, country_id in Movie.country.through.objects.values_list("movie_id", "country_id"):
+        slices[movie_id].append((dimension.COUNTRY, country_id))
+
+    totals = defaultdict(lambda: [0.0, 0])
+    for (movie_id, category_id), total, count in zip(keys.tolist(), sums.tolist(), counts.tolist()):
+        for dim, key in slices[movie_id]:
+            entry = totals[(category_id, dim, key)]
+            entry[0] += total
+            entry[1] += count
+    return [
+        AspectRollup(category_id=category_id, dimension=dim, key=key, rating_sum=total, rating_count=count)
+        for (category_id, dim, key), (total, count) in totals.items()
+    ]
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class WorksConfig(AppConfig):
+    name = 'reviewapp.apps.works'
+
+    def ready(self):
+        from . import signals  # noqa
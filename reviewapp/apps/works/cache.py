@@ -0,0 +1,56 @@
+"""
+Cached creator filmographies/bibliographies (/api/creators/<id>/works/).
+
+Each creator's payload is cached under a per-creator version token.
+Invalidation replaces the token after the writing transaction commits, so a
+reader that loaded the old state concurrently can only store it under the
+old, no longer reachable, token. Misses are loaded from the primary even
+inside ``replica_reads``: a replica may not have replayed the write yet, and
+what it returned would be cached under the new token for the full timeout.
+"""
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from reviewapp.apps.metadata.models import Creator
+from reviewapp.core.querysets import creators_queryset_for_works
+from reviewapp.core.serializers import serialize_creator_works
+
+from typing import Iterable, Optional
+
+
+def _version_key(creator_id: int) -> str:
+    return f"creator-works:version:{creator_id}"
+
+
+def _version(creator_id: int) -> str:
+    key = _version_key(creator_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def creator_works(creator_id: int) -> Optional[dict]:
+    """serialize_creator_works payload of the creator; None when there is no such creator."""
+    key = f"creator-works:{creator_id}:{_version(creator_id)}"
+    data = cache.get(key)
+    if data is None:
+        creator = creators_queryset_for_works(Creator.objects.using(DEFAULT_DB_ALIAS).filter(pk=creator_id)).first()
+        if creator is None:
+            return None
+        data = serialize_creator_works(creator)
+        cache.set(key, data, getattr(settings, "CREATOR_WORKS_CACHE_SECONDS", 3600))
+    return data
+
+
+def invalidate(creator_ids: Iterable[int]) -> None:
+    creator_ids = {pk for pk in creator_ids if pk is not None}
+    if not creator_ids:
+        return
+    transaction.on_commit(lambda: cache.set_many({
+        _version_key(pk): uuid.uuid4().hex for pk in creator_ids
+    }, None))
@@ -0,0 +1,73 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from reviewapp.apps.books.models import Book, BookReview
+from reviewapp.apps.metadata.models import Creator
+from reviewapp.apps.movies.models import Movie, MovieReview
+
+from .cache import invalidate
+
+
+# title model -> its creators' M2M field
+CREDITS = {Movie: "director", Book: "authors"}
+
+
+def creators_of(model, title_ids) -> list:
+    through = getattr(model, CREDITS[model]).through
+    return list(through.objects.filter(**{f"{model._meta.model_name}_id__in": list(title_ids)})
+                .values_list("creator_id", flat=True))
+
+
+def credits_changed(sender, instance, action, reverse, pk_set, model, **kwargs):
+    if reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            invalidate([instance.pk])
+    elif action == "pre_clear":
+        # the forward side of a clear does not receive pk_set
+        invalidate(creators_of(type(instance), [instance.pk]))
+    elif action in ("post_add", "post_remove"):
+        invalidate(pk_set)
+
+
+for title, field in CREDITS.items():
+    m2m_changed.connect(credits_changed, sender=getattr(title, field).through,
+                        dispatch_uid=f"works_{title._meta.model_name}_{field}_changed")
+
+
+# pre_delete: the credits cascade away with the title
+@receiver([post_save, pre_delete], sender=Movie)
+@receiver([post_save, pre_delete], sender=Book)
+def title_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate(creators_of(sender, [instance.pk]))
+
+
+@receiver([post_save, post_delete], sender=Creator)
+def creator_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate([instance.pk])
+
+
+# review model -> title model; ratings are part of the payload
+REVIEWED = {MovieReview: Movie, BookReview: Book}
+
+
+@receiver(pre_save, sender=MovieReview)
+@receiver(pre_save, sender=BookReview)
+def review_saving(sender, instance, raw=False, **kwargs):
+    # remember the stored title, a review moved to another title changes both
+    field = f"{REVIEWED[sender]._meta.model_name}_id"
+    instance._works_title_id = (
+        sender.objects.filter(pk=instance.pk).values_list(field, flat=True).first()
+        if instance.pk is not None and not raw else None
+    )
+
+
+@receiver([post_save, post_delete], sender=MovieReview)
+@receiver([post_save, post_delete], sender=BookReview)
+def review_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    title = REVIEWED[sender]
+    title_ids = {getattr(instance, f"{title._meta.model_name}_id"), getattr(instance, "_works_title_id", None)}
+    invalidate(creators_of(title, title_ids - {None}))
@@ -0,0 +1,31 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from reviewapp.apps.metadata.models import Creator
+from reviewapp.apps.movies.models import Movie
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class CreatorWorksCacheTests(TestCase):
+    """'replica' is not in this test case's databases, so any query routed there fails."""
+
+    def setUp(self):
+        cache.clear()
+        self.director = Creator.objects.create(name="Ridley Scott", type=Creator.TYPE.Director)
+        self.movie = Movie.objects.create(title="Alien", release_year=1979, runtime=117)
+        self.movie.director.set([self.director])
+
+    def works(self) -> dict:
+        response = self.client.get(f"/api/creators/{self.director.pk}/works/")
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_misses_are_loaded_from_the_primary(self):
+        self.assertEqual([movie["title"] for movie in self.works()["movies"]], ["Alien"])
+
+    def test_a_write_is_visible_on_the_next_read(self):
+        self.works()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.movie.title = "Alien: Director's Cut"
+            self.movie.save()
+        self.assertEqual([movie["title"] for movie in self.works()["movies"]], ["Alien: Director's Cut"])
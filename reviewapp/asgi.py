@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'reviewapp.settings')
 
 application = get_asgi_application()
+
+# after setup, so the warming thread finds the apps loaded
+from reviewapp.apps.documents.warming import warm_on_startup  # noqa: E402
+
+warm_on_startup()
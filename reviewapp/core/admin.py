@@ -0,0 +1,15 @@
+from django.contrib import admin
+
+from reviewapp.core.pagination import EstimatedCountPaginator
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Base ModelAdmin for tables that grow with usage (titles, reviews and
+    their children). Subclasses should also set ``list_select_related`` for
+    whatever ``__str__``/``list_display`` touches and use autocomplete or raw
+    id widgets for foreign keys, so pages do not scale with table size.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False  # skip the second, unfiltered COUNT(*) when searching
+    list_per_page = 50
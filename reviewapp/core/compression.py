@@ -0,0 +1,66 @@
+"""
+Pre-compressed response bodies. Payloads that are rendered once and served
+many times (e.g. the stored movie documents) are compressed when rendered
+and the variant the client accepts is picked per request, instead of
+compressing identical bytes on every response.
+
+Brotli variants are produced only when the optional ``brotli`` package is
+installed.
+"""
+import gzip
+
+from django.http import HttpResponse
+
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def compress(body: bytes) -> dict:
+    """Encoded variants of ``body`` keyed by content-coding."""
+    # mtime=0 keeps the output deterministic for identical input
+    variants = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(body)
+    return variants
+
+
+# preference when the client weighs several codings equally
+SUPPORTED = ("br", "gzip")
+
+
+def accepted_encodings(request) -> list:
+    """Supported content-codings the client accepts, most preferred first."""
+    weights = {}
+    for item in request.META.get("HTTP_ACCEPT_ENCODING", "").split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+
+    def weight(coding):
+        return weights.get(coding, weights.get("*", 0.0))
+
+    candidates = [coding for coding in SUPPORTED if weight(coding) > 0]
+    return sorted(candidates, key=lambda coding: -weight(coding))
+
+
+def encoded_response(body: bytes, encoding: Optional[str] = None,
+                     content_type: str = "application/json") -> HttpResponse:
+    """Response for an already encoded body; views serving variants should also vary on Accept-Encoding."""
+    response = HttpResponse(body, content_type=content_type)
+    if encoding:
+        response["Content-Encoding"] = encoding
+    return response
@@ -0,0 +1,168 @@
+"""
+N+1 query detection for development and tests.
+
+Every SQL statement is reduced to a fingerprint (literals and IN lists
+replaced by placeholders) and attributed to the innermost frame of project
+code that issued it. The same fingerprint coming THRESHOLD or more times
+from the same call site is almost always a per-item lookup that should have
+been a select_related/prefetch_related.
+
+NPlusOneMiddleware reports offenders of each request (enable it with
+NPLUSONE_ENABLED, on by default when DEBUG). In tests, ``query_budget``
+fails the block on offenders or when it exceeds its declared number of
+queries:
+
+    with query_budget(Index.query_budget):
+        client.get("/api/movies/?verbose=true")
+
+    with query_budget(serialize_movie.query_budget):
+        [serialize_movie(m) for m in movies_queryset_for_serialization()]
+"""
+import logging
+import re
+import traceback
+
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+from typing import Callable, Iterator, Optional
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THRESHOLD = 3
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*(?:\?|%s)\s*,?)+\)", re.IGNORECASE)
+_SPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql: str) -> str:
+    """Shape of a statement, independent of its parameters."""
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("IN (...)", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+def budget(queries: int) -> Callable:
+    """Declare how many queries a view or serializer may issue (given prefetched input)."""
+    def decorator(obj):
+        obj.query_budget = queries
+        return obj
+    return decorator
+
+
+class NPlusOneError(AssertionError):
+    pass
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryTracker(object):
+    """Records the queries issued on every connection while active."""
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.counts = Counter()
+        self.stacks = {}
+        self._root = str(Path(settings.BASE_DIR).resolve())
+        self._this = str(Path(__file__).resolve())
+
+    def __call__(self, execute, sql, params, many, context):
+        self.total += 1
+        stack = self.project_stack()
+        key = (fingerprint(sql), stack[-1] if stack else None)
+        self.counts[key] += 1
+        self.stacks.setdefault(key, stack)
+        return execute(sql, params, many, context)
+
+    def project_stack(self) -> list:
+        return [
+            f"{frame.filename}:{frame.lineno} in {frame.name}"
+            for frame in traceback.extract_stack()[:-2]
+            if frame.filename.startswith(self._root) and frame.filename != self._this
+            and "site-packages" not in frame.filename
+        ]
+
+    def repeated(self, threshold: int = DEFAULT_THRESHOLD) -> list:
+        return [
+            {"sql": sql, "call_site": site, "count": count, "stack": self.stacks[(sql, site)]}
+            for (sql, site), count in self.counts.most_common()
+            if count >= threshold
+        ]
+
+    @contextmanager
+    def active(self) -> Iterator["QueryTracker"]:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self))
+            yield self
+
+
+def describe(offenders: list) -> str:
+    return "\n\n".join(
+        f"{item['count']}x {item['sql'][:300]}\n  from " + "\n  from ".join(reversed(item["stack"][-8:]))
+        for item in offenders
+    )
+
+
+@contextmanager
+def query_budget(queries: Optional[int] = None, threshold: int = DEFAULT_THRESHOLD) -> Iterator[QueryTracker]:
+    """
+    Fail the block with QueryBudgetExceeded when it issues more than
+    ``queries`` queries (None: no limit) or repeats a query shape
+    ``threshold`` times from one call site.
+    """
+    tracker = QueryTracker()
+    with tracker.active():
+        yield tracker
+    offenders = tracker.repeated(threshold)
+    if offenders:
+        raise QueryBudgetExceeded(f"Repeated queries (N+1):\n{describe(offenders)}")
+    if queries is not None and tracker.total > queries:
+        raise QueryBudgetExceeded(f"{tracker.total} queries, budget is {queries}")
+
+
+class NPlusOneMiddleware(object):
+    """
+    Logs (or with NPLUSONE_RAISE, raises) repeated query shapes per request
+    and requests going over their view's declared query budget.
+    """
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, "NPLUSONE_ENABLED", settings.DEBUG):
+            return self.get_response(request)
+
+        tracker = QueryTracker()
+        with tracker.active():
+            response = self.get_response(request)
+
+        problems = []
+        offenders = tracker.repeated(getattr(settings, "NPLUSONE_THRESHOLD", DEFAULT_THRESHOLD))
+        if offenders:
+            problems.append(f"N+1 queries:\n{describe(offenders)}")
+        limit = getattr(request, "_query_budget", None)
+        if limit is not None and tracker.total > limit:
+            problems.append(f"{tracker.total} queries, budget is {limit}")
+        if problems:
+            message = f"{request.method} {request.get_full_path()}: " + "\n".join(problems)
+            if getattr(settings, "NPLUSONE_RAISE", False):
+                raise NPlusOneError(message)
+            logger.warning(message)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view = getattr(view_func, "view_class", view_func)
+        request._query_budget = getattr(view, "query_budget", None)
+        return None
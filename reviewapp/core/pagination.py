@@ -0,0 +1,71 @@
+import base64
+import json
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import AutoField, BigAutoField, Max, QuerySet
+from django.utils.functional import cached_property
+
+from typing import Optional
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(*values) -> str:
+    """
+    Opaque keyset cursor for the position after the last item of a page, e.g.
+        encode_cursor(review.created.isoformat(), review.id)
+    """
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: Optional[str], size: int) -> Optional[list]:
+    """Values given to encode_cursor, None for the first page; InvalidCursor for garbage."""
+    if not token:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (ValueError, TypeError):
+        raise InvalidCursor("Malformed cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursor("Malformed cursor")
+    return values
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator whose count stays cheap on big tables. Counts are exact up to
+    ``exact_limit`` (a COUNT over a LIMITed subquery); beyond that the table
+    size is estimated from the planner statistics (PostgreSQL) or the highest
+    integer primary key, which only needs the primary key index.
+    """
+    exact_limit = 10000
+
+    @cached_property
+    def count(self) -> int:
+        qs = self.object_list
+        if not isinstance(qs, QuerySet):
+            return super().count
+        bounded = qs.order_by()[:self.exact_limit + 1].count()
+        if bounded <= self.exact_limit:
+            return bounded
+        if qs.query.where:
+            # filtered: only the first exact_limit rows are reachable by page number
+            return bounded
+        return max(estimate_table_rows(qs) or 0, bounded)
+
+
+def estimate_table_rows(qs: QuerySet) -> Optional[int]:
+    model = qs.model
+    connection = connections[qs.db]
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [model._meta.db_table])
+            row = cursor.fetchone()
+        if row and row[0] > 0:
+            return row[0]
+    if isinstance(model._meta.pk, (AutoField, BigAutoField)):
+        return model._default_manager.using(qs.db).aggregate(top=Max("pk"))["top"]
+    return None
@@ -0,0 +1,221 @@
+"""
+Opt-in request profiling. ProfilingMiddleware runs a sample of requests
+(PROFILING_SAMPLE_RATE), and staff requests sending the PROFILING_HEADER
+header, under cProfile and optionally tracemalloc. It writes one
+``<name>.prof`` (pstats) and ``<name>.json`` (route, slug, timing, query
+count, top allocations) pair per request to PROFILING_DIR, keeping the
+newest PROFILING_KEEP.
+
+    curl -H "X-Profile: 1" --cookie "sessionid=..." /api/movies/<slug>/
+    GET /api/profiles/              slowest captured requests (staff only)
+    GET /api/profiles/<name>/       hottest functions of one of them
+"""
+import cProfile
+import json
+import logging
+import pstats
+import random
+import re
+import threading
+import time
+import tracemalloc
+import uuid
+
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+from typing import Optional
+
+
+logger = logging.getLogger(__name__)
+
+NAME_RE = re.compile(r"^[0-9A-Za-z_-]+$")
+
+# modules whose functions /api/profiles/<name>/ shows by default
+FOCUS = ("reviewapp/core/serializers.py", "reviewapp/core/querysets.py")
+
+
+def profile_dir() -> Path:
+    return Path(settings.PROFILING_DIR)
+
+
+class _Tracing(object):
+    """
+    tracemalloc shared by concurrently profiled requests: the first one in
+    starts it and the last one out stops it, so a request never loses its
+    trace to another finishing first. Tracing started by someone else is
+    left running.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.users = 0
+        self.owned = False
+
+    def __enter__(self):
+        with self.lock:
+            if not self.users:
+                self.owned = not tracemalloc.is_tracing()
+                if self.owned:
+                    tracemalloc.start()
+            self.users += 1
+        return self
+
+    def __exit__(self, *exc):
+        with self.lock:
+            self.users -= 1
+            if not self.users and self.owned:
+                tracemalloc.stop()
+                self.owned = False
+        return False
+
+
+_tracing = _Tracing()
+
+
+def top_allocations(limit: int = 20) -> list:
+    """
+    The biggest allocation sites since tracing started, empty when the
+    snapshot fails. The trace is process-wide, so it includes concurrent
+    requests.
+    """
+    try:
+        snapshot = tracemalloc.take_snapshot()
+        return [
+            {"where": str(stat.traceback), "size": stat.size, "count": stat.count}
+            for stat in snapshot.statistics("lineno")[:limit]
+        ]
+    except Exception:
+        logger.exception("Could not take a tracemalloc snapshot")
+        return []
+
+
+class ProfilingMiddleware(object):
+    """
+    Must come after AuthenticationMiddleware for the staff header check.
+    Profiling never fails a request: when the profiler cannot start (only
+    one may be active per process from Python 3.12) the request is served
+    unprofiled, and a profile that cannot be saved is logged and dropped.
+    """
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not self.should_profile(request):
+            return self.get_response(request)
+        return self.profile(request)
+
+    def should_profile(self, request) -> bool:
+        rate = getattr(settings, "PROFILING_SAMPLE_RATE", 0.0)
+        if rate and random.random() < rate:
+            return True
+        header = getattr(settings, "PROFILING_HEADER", "X-Profile")
+        user = getattr(request, "user", None)
+        return bool(header and request.headers.get(header) and user is not None and user.is_staff)
+
+    def profile(self, request):
+        queries = []
+
+        def count(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        trace = getattr(settings, "PROFILING_TRACEMALLOC", True)
+        profiler = cProfile.Profile()
+        allocations = []
+        with ExitStack() as stack:
+            if trace:
+                stack.enter_context(_tracing)
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(count))
+            try:
+                profiler.enable()
+            except ValueError:
+                # another profiler is active in this process
+                return self.get_response(request)
+            started = time.perf_counter()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+            duration = time.perf_counter() - started
+            if trace:
+                allocations = top_allocations()
+
+        match = request.resolver_match
+        try:
+            save_profile(profiler, {
+                "method": request.method,
+                "path": request.get_full_path(),
+                "route": match.route if match else None,
+                "slug": (match.kwargs.get("slug") or match.kwargs.get("username")) if match else None,
+                "status": response.status_code,
+                "duration_ms": round(duration * 1000, 3),
+                "queries": len(queries),
+                "allocations": allocations,
+                "created": datetime.now(timezone.utc).isoformat(),
+            })
+        except Exception:
+            logger.exception("Could not save the profile of %s", request.path)
+        return response
+
+
+def save_profile(profiler: cProfile.Profile, meta: dict) -> str:
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    name = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S") + "-" + uuid.uuid4().hex[:8]
+    profiler.dump_stats(str(directory / f"{name}.prof"))
+    (directory / f"{name}.json").write_text(json.dumps({"name": name, **meta}))
+
+    keep = getattr(settings, "PROFILING_KEEP", 200)
+    for old in sorted(directory.glob("*.json"))[:-keep or None]:
+        old.unlink(missing_ok=True)
+        old.with_suffix(".prof").unlink(missing_ok=True)
+    return name
+
+
+def list_profiles(limit: int = 50) -> list:
+    """Captured requests, slowest first."""
+    entries = []
+    for path in profile_dir().glob("*.json"):
+        try:
+            meta = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        meta.pop("allocations", None)
+        entries.append(meta)
+    entries.sort(key=lambda meta: meta.get("duration_ms", 0), reverse=True)
+    return entries[:limit]
+
+
+def load_profile(name: str, focus: Optional[tuple] = FOCUS, limit: int = 30) -> Optional[dict]:
+    """
+    Metadata and the functions with the highest cumulative time, restricted
+    to files ending with one of ``focus`` (None for every function).
+    """
+    if not NAME_RE.match(name):
+        return None
+    meta_path, prof_path = profile_dir() / f"{name}.json", profile_dir() / f"{name}.prof"
+    if not meta_path.exists() or not prof_path.exists():
+        return None
+
+    stats = pstats.Stats(str(prof_path)).stats
+    functions = [
+        {
+            "function": funcname,
+            "file": filename,
+            "line": lineno,
+            "calls": calls,
+            "own_ms": round(own * 1000, 3),
+            "cumulative_ms": round(cumulative * 1000, 3),
+        }
+        for (filename, lineno, funcname), (_, calls, own, cumulative, _) in stats.items()
+        if focus is None or filename.replace("\\", "/").endswith(focus)
+    ]
+    functions.sort(key=lambda entry: entry["cumulative_ms"], reverse=True)
+    return {**json.loads(meta_path.read_text()), "functions": functions[:limit]}
@@ -1,19 +1,25 @@
-from django.db.models import Prefetch
+from django.db.models import Avg, Count, OuterRef, Prefetch, QuerySet, Subquery
+from django.db.models.functions import Coalesce
 
 from reviewapp.apps.books.models import Book, BookReview, ReviewSection
+from reviewapp.apps.metadata.models import Creator
 from reviewapp.apps.movies.models import Movie, MovieReview, MovieAspectRating
+from reviewapp.apps.stats.models import AspectRatingBucket
 
 from typing import Iterable
 
 
-def books_queryset_for_serialization(base_qs=None) -> Iterable[Book]:
+def books_queryset_for_serialization(base_qs=None, include_histograms: bool = False) -> Iterable[Book]:
     """
     Use this in your views before serializing:
         qs = books_queryset_for_serialization(Book.objects.all())
         data = [serialize_book(b, verbose=True, include_reviews=True) for b in qs]
+    Pass include_histograms=True when serializing with include_histograms.
     """
     if base_qs is None:
         base_qs = Book.objects.all()
+    if include_histograms:
+        base_qs = base_qs.prefetch_related("rating_buckets")
 
     return (
         base_qs
@@ -27,7 +33,7 @@ def books_queryset_for_serialization(base_qs=None) -> Iterable[Book]:
                     .prefetch_related(
                         Prefetch(
                             "sections",
-                            queryset=ReviewSection.objects.select_related("section_type")
+                            queryset=ReviewSection.objects.select_related("section_type").order_by("review_id", "order")
                         )
                     )
                 ),
@@ -36,14 +42,20 @@ def books_queryset_for_serialization(base_qs=None) -> Iterable[Book]:
     )
 
 
-def movies_queryset_for_serialization(base_qs=None) -> Iterable[Movie]:
+def movies_queryset_for_serialization(base_qs=None, include_histograms: bool = False) -> Iterable[Movie]:
     """
     Use this in your views before serializing:
         qs = movies_queryset_for_serialization(Movie.objects.all())
         data = [serialize_movie(m, verbose=True, include_reviews=True, include_aspects=True) for m in qs]
+    Pass include_histograms=True when serializing with include_histograms.
     """
     if base_qs is None:
         base_qs = Movie.objects.all()
+    if include_histograms:
+        base_qs = base_qs.prefetch_related(
+            "rating_buckets",
+            Prefetch("aspect_buckets", queryset=AspectRatingBucket.objects.select_related("category")),
+        )
 
     return (
         base_qs
@@ -67,4 +79,38 @@ def movies_queryset_for_serialization(base_qs=None) -> Iterable[Movie]:
                 ),
             ),
         )
-    )
\ No newline at end of file
+    )
+
+
+def with_public_ratings(qs: QuerySet) -> QuerySet:
+    """
+    Annotate titles with the average rating and count of their public
+    reviews. Correlated subqueries rather than a JOIN + GROUP BY, so the
+    titles keep their ordering and each aggregate is a lookup on the
+    covering public-review index.
+    """
+    relation = qs.model._meta.get_field("reviews")
+    public = (
+        relation.related_model.objects.filter(**{relation.field.name: OuterRef("pk")}, is_public=True)
+        .order_by().values(relation.field.name)
+    )
+    return qs.annotate(
+        public_rating=Subquery(public.annotate(value=Avg("overall_rating")).values("value")),
+        public_review_count=Coalesce(Subquery(public.annotate(value=Count("id")).values("value")), 0),
+    )
+
+
+def creators_queryset_for_works(base_qs=None) -> Iterable[Creator]:
+    """
+    Use this before serialize_creator_works, for one creator or a whole list:
+        qs = creators_queryset_for_works(Creator.objects.filter(type=Creator.TYPE.Director))
+        data = [serialize_creator_works(c) for c in qs]
+    Three queries however many creators and titles, ratings included.
+    """
+    if base_qs is None:
+        base_qs = Creator.objects.all()
+
+    return base_qs.prefetch_related(
+        Prefetch("movie_set", queryset=with_public_ratings(Movie.objects.all())),
+        Prefetch("book_set", queryset=with_public_ratings(Book.objects.all())),
+    )
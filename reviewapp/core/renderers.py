@@ -0,0 +1,120 @@
+"""
+Response rendering for the API.
+
+Payloads are encoded with orjson when it is installed and with the standard
+library otherwise; both write the same compact, non-ASCII-escaped JSON.
+Dates and datetimes are handed to the encoder as they are instead of being
+formatted by the serializers: orjson writes them natively, the fallback
+calls isoformat(). A datetime renders in the offset it carries, i.e. UTC as
+read from the database.
+
+MessagePack is offered through Accept negotiation (application/msgpack or
+application/x-msgpack) when the optional ``msgpack`` package is installed.
+Dates and datetimes travel as the same ISO 8601 strings as in JSON, so a
+field has the same type whatever the client asked for.
+"""
+import datetime
+import decimal
+import json
+import uuid
+
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.functional import Promise
+
+from reviewapp.core.compression import encoded_response
+
+from typing import Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+
+MEDIA_TYPES = {
+    "application/json": JSON,
+    "application/*": JSON,
+    "*/*": JSON,
+    "application/msgpack": MSGPACK,
+    "application/x-msgpack": MSGPACK,
+}
+
+
+def _default(obj):
+    if isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, (decimal.Decimal, uuid.UUID, Promise)):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+class _JSONEncoder(json.JSONEncoder):
+    def default(self, obj):
+        return _default(obj)
+
+
+def to_json(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, cls=_JSONEncoder, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def from_json(body: bytes):
+    return orjson.loads(body) if orjson is not None else json.loads(body)
+
+
+def to_msgpack(data) -> bytes:
+    return msgpack.packb(data, default=_default, use_bin_type=True)
+
+
+def accepted_media_type(request) -> str:
+    """JSON or MSGPACK, whichever available type the client's Accept header weighs highest."""
+    best, best_q = JSON, 0.0
+    for item in request.META.get("HTTP_ACCEPT", "").split(","):
+        media_type, _, params = item.strip().partition(";")
+        renderer = MEDIA_TYPES.get(media_type.strip().lower())
+        if renderer is None or (renderer == MSGPACK and msgpack is None):
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > best_q:
+            best, best_q = renderer, q
+    return best
+
+
+def render(request, data, status: int = 200) -> HttpResponse:
+    """Response with ``data`` encoded as the client prefers."""
+    media_type = accepted_media_type(request)
+    body = to_msgpack(data) if media_type == MSGPACK else to_json(data)
+    response = HttpResponse(body, content_type=media_type, status=status)
+    patch_vary_headers(response, ("Accept",))
+    return response
+
+
+def render_encoded(request, body: bytes, encoding: Optional[str] = None) -> HttpResponse:
+    """
+    Response for an already encoded JSON payload (e.g. a stored document),
+    possibly content-coded. MessagePack clients get it re-encoded, which
+    needs an uncompressed ``body``.
+    """
+    if accepted_media_type(request) == MSGPACK:
+        response = HttpResponse(to_msgpack(from_json(body)), content_type=MSGPACK)
+    else:
+        response = encoded_response(body, encoding)
+    patch_vary_headers(response, ("Accept",))
+    return response
@@ -0,0 +1,135 @@
+import datetime
+
+from django.db import connections
+from django.db.models import CharField, Q, QuerySet, Value
+from django.utils.dateparse import parse_datetime
+
+from reviewapp.apps.books.models import BookReview
+from reviewapp.apps.movies.models import MovieReview
+from reviewapp.core.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+from typing import Optional
+
+
+# sort name -> (field, descending); ties are broken by id in the same direction
+REVIEW_SORTS = {
+    "newest": ("created", True),
+    "oldest": ("created", False),
+    "highest": ("overall_rating", True),
+    "lowest": ("overall_rating", False),
+}
+
+
+def _parse_created(value) -> Optional[datetime.datetime]:
+    """A cursor's ISO timestamp, or None when it is not one (or is out of range)."""
+    if not isinstance(value, str):
+        return None
+    try:
+        return parse_datetime(value)
+    except ValueError:
+        return None
+
+
+def _is_id(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def decode_review_cursor(token: Optional[str], sort: str) -> Optional[tuple]:
+    """(value, id) to continue after; InvalidCursor for garbage or a cursor of another sort."""
+    values = decode_cursor(token, 3)
+    if values is None:
+        return None
+    cursor_sort, value, pk = values
+    if cursor_sort != sort or not _is_id(pk):
+        raise InvalidCursor("Malformed cursor")
+    if REVIEW_SORTS[sort][0] == "created":
+        value = _parse_created(value)
+    elif not isinstance(value, (int, float)) or isinstance(value, bool):
+        value = None
+    if value is None:
+        raise InvalidCursor("Malformed cursor")
+    return value, pk
+
+
+def review_page(qs: QuerySet, sort: str, limit: int, after: Optional[tuple] = None) -> tuple:
+    """
+    One keyset page of ``qs`` (the public reviews of one title) as
+    (reviews, next cursor). Filtering on the title and seeking on
+    (field, id) keeps every page a bounded range scan on the
+    (title, created) / (title, overall_rating) indexes, however deep.
+    """
+    field, descending = REVIEW_SORTS[sort]
+    op = "lt" if descending else "gt"
+    if after is not None:
+        value, pk = after
+        qs = qs.filter(Q(**{f"{field}__{op}": value}) | Q(**{field: value, f"id__{op}": pk}))
+    ordering = (f"-{field}", "-id") if descending else (field, "id")
+    rows = list(qs.order_by(*ordering)[:limit + 1])
+    page = rows[:limit]
+
+    next_cursor = None
+    if len(rows) > limit:
+        value = getattr(page[-1], field)
+        next_cursor = encode_cursor(sort, value.isoformat() if field == "created" else value, page[-1].id)
+    return page, next_cursor
+
+
+# media name -> review model of the cross-media feed (the name is also the
+# review's title field); ordered newest first by (created, id, media)
+FEED_SOURCES = {"movie": MovieReview, "book": BookReview}
+
+
+def decode_feed_cursor(token: Optional[str]) -> Optional[tuple]:
+    """(created, id, media) to continue after; InvalidCursor for garbage."""
+    values = decode_cursor(token, 3)
+    if values is None:
+        return None
+    created, pk, media = values
+    created = _parse_created(created)
+    if created is None or not _is_id(pk) or not isinstance(media, str) or media not in FEED_SOURCES:
+        raise InvalidCursor("Malformed cursor")
+    return created, pk, media
+
+
+def _feed_branch(media: str, limit: int, after: Optional[tuple]) -> QuerySet:
+    qs = FEED_SOURCES[media].objects.filter(is_public=True)
+    if after is not None:
+        created, pk, after_media = after
+        # rows of this media sort before the cursor's own at equal (created, id)
+        op = "lte" if media < after_media else "lt"
+        # the plain created bound is what lets the planner seek instead of scan
+        qs = qs.filter(Q(created__lt=created) | Q(created=created, **{f"id__{op}": pk}), created__lte=created)
+    qs = qs.annotate(media=Value(media, output_field=CharField())).values_list("created", "id", "media")
+    if connections[qs.db].features.supports_slicing_ordering_in_compound:
+        qs = qs.order_by("-created", "-id")[:limit]
+    else:
+        qs = qs.order_by()
+    return qs
+
+
+def feed_page(limit: int, after: Optional[tuple] = None) -> tuple:
+    """
+    One keyset page of the public reviews of every media as
+    (reviews, next cursor), hydrated with their title and author.
+
+    A single UNION ALL of per-media range scans on the partial
+    (created, id) indexes: SQLite merges the ordered branches and stops at
+    the LIMIT, PostgreSQL sorts the branches' own LIMITed rows. Either way
+    a page costs the same however deep it is.
+    """
+    first, *rest = [_feed_branch(media, limit + 1, after) for media in FEED_SOURCES]
+    rows = list(first.union(*rest, all=True).order_by("-created", "-id", "-media")[:limit + 1])
+    page = rows[:limit]
+
+    ids = {media: [pk for _, pk, row_media in page if row_media == media] for media in FEED_SOURCES}
+    loaded = {
+        media: model.objects.select_related(media, "created_by").order_by().in_bulk(ids[media])
+        for media, model in FEED_SOURCES.items() if ids[media]
+    }
+    reviews = [loaded[media][pk] for _, pk, media in page if pk in loaded.get(media, {})]
+
+    next_cursor = None
+    if len(rows) > limit:
+        created, pk, media = page[-1]
+        next_cursor = encode_cursor(created.isoformat(), pk, media)
+    return reviews, next_cursor
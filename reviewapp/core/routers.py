@@ -0,0 +1,120 @@
+import random
+import time
+
+from contextlib import ContextDecorator
+from contextvars import ContextVar
+from typing import Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+
+class RoutingState(object):
+    """
+    Per-request routing information shared between the middleware, the
+    ``replica_reads`` context and the router.
+    """
+    def __init__(self, pinned: bool = False) -> None:
+        self.pinned = pinned
+        self.wrote = False
+        self.read_alias = None  # type: Optional[str]
+        self.saved = []
+
+
+_state = ContextVar("reviewapp_db_routing", default=None)
+
+
+def get_state() -> RoutingState:
+    state = _state.get()
+    if state is None:
+        state = RoutingState()
+        _state.set(state)
+    return state
+
+
+def replicas() -> list:
+    return list(getattr(settings, "DATABASE_REPLICAS", []))
+
+
+class replica_reads(ContextDecorator):
+    """
+    Send reads issued inside this block to a read replica:
+        with replica_reads():
+            data = [serialize_movie(m) for m in movies_queryset_for_serialization()]
+
+    Does nothing when no replica is configured or when the client is pinned
+    to the primary because it wrote recently.
+    """
+    def __enter__(self):
+        state = get_state()
+        state.saved.append(state.read_alias)
+        aliases = replicas()
+        if aliases and not state.pinned and not state.wrote:
+            state.read_alias = state.read_alias or random.choice(aliases)
+        return state
+
+    def __exit__(self, *exc):
+        state = get_state()
+        state.read_alias = state.saved.pop()
+        return False
+
+
+class ReplicaRouter(object):
+    """
+    Writes, migrations and everything outside ``replica_reads`` use the
+    primary. Inside ``replica_reads`` reads go to the replica chosen for the
+    request; related lookups stay on the database their instance came from.
+    """
+    def db_for_read(self, model, **hints) -> Optional[str]:
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        return get_state().read_alias
+
+    def db_for_write(self, model, **hints) -> Optional[str]:
+        state = get_state()
+        state.wrote = True
+        state.read_alias = None
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> Optional[bool]:
+        aliases = {DEFAULT_DB_ALIAS, *replicas()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints) -> Optional[bool]:
+        # replicas are copies of the primary and receive its schema through replication
+        if db in replicas():
+            return False
+        return None
+
+
+class ReplicaPinningMiddleware(object):
+    """
+    Read-your-writes stickiness. A request that writes sets a short-lived
+    cookie; while it is valid the client's reads stay on the primary. The
+    window is REPLICA_PIN_SECONDS. Read-only POSTs (e.g. the batch lookup)
+    do not pin.
+    """
+    cookie_name = "db_pin"
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request):
+        pinned_until = request.COOKIES.get(self.cookie_name, "")
+        pinned = pinned_until.isdigit() and int(pinned_until) > time.time()
+        token = _state.set(RoutingState(pinned=pinned))
+        try:
+            response = self.get_response(request)
+            state = _state.get()
+            if state.wrote:
+                window = getattr(settings, "REPLICA_PIN_SECONDS", 5)
+                response.set_cookie(
+                    self.cookie_name, str(int(time.time() + window)),
+                    max_age=window, httponly=True, samesite="Lax",
+                )
+            return response
+        finally:
+            _state.reset(token)
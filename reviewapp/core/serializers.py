@@ -1,14 +1,73 @@
-from django.utils.timezone import localtime
+from django.db.models import Avg
+from django.urls import NoReverseMatch
 
 from reviewapp.apps.books.models import Book, BookReview, ReviewSection, ReviewSectionType
 from reviewapp.apps.movies.models import Movie, MovieReview, MovieAspectRating
 from reviewapp.apps.metadata.models import Genre, Creator, Language, Country
+from reviewapp.core.nplusone import budget
 
 from typing import Optional
 
 
+def absolute_url(obj) -> Optional[str]:
+    # the public site routes (book-detail, bookreview-detail) are not always mounted
+    try:
+        return obj.get_absolute_url()
+    except NoReverseMatch:
+        return None
+
+
+def prefetched_reviews(obj) -> Optional[list]:
+    """
+    Public reviews, newest first, as loaded by movies_queryset_for_serialization /
+    books_queryset_for_serialization; None when they were not prefetched.
+    """
+    cache = getattr(obj, "_prefetched_objects_cache", {})
+    if "reviews" not in cache:
+        return None
+    return list(cache["reviews"])
+
+
+def average_rating(reviews: list) -> Optional[float]:
+    """Mean overall rating of already loaded reviews, as AVG() would give it."""
+    if not reviews:
+        return None
+    return sum(review.overall_rating for review in reviews) / len(reviews)
+
+
+def serialize_histogram(buckets) -> dict:
+    """1-10 rating buckets (stats *RatingBucket rows) as {"1": count, ..., "10": count}."""
+    counts = {str(bucket): 0 for bucket in range(1, 11)}
+    for row in buckets:
+        counts[str(row.bucket)] = row.count
+    return counts
+
+
+def serialize_movie_histograms(movie: Movie) -> dict:
+    aspects = {}
+    for row in movie.aspect_buckets.all():
+        aspects.setdefault(row.category_id, (row.category, []))[1].append(row)
+    return {
+        "overall": serialize_histogram(movie.rating_buckets.all()),
+        "aspects": [
+            {
+                "category": {"id": category.id, "name": category.name},
+                "buckets": serialize_histogram(rows),
+            }
+            for _, (category, rows) in sorted(aspects.items())
+        ],
+    }
+
+
+@budget(0)  # with movies_queryset_for_serialization input
 def serialize_movie(movie: Movie, *, verbose: bool = True, include_reviews: bool = True,
-                    include_aspects: bool = True, reviews_limit: Optional[int] = 5) -> dict:
+                    include_aspects: bool = True, reviews_limit: Optional[int] = 5,
+                    include_histograms: bool = False, review_summaries: bool = False) -> dict:
+    """
+    review_summaries=True embeds reviews as serialize_movie_review_summary;
+    the full texts are served by the paginated reviews sub-resource.
+    """
+    serialize_review = serialize_movie_review_summary if review_summaries else serialize_movie_review
     genres = movie.genre.all()
     directors = movie.director.all()
     languages = movie.language.all()
@@ -33,20 +92,28 @@ def serialize_movie(movie: Movie, *, verbose: bool = True, include_reviews: bool
 
     if verbose or include_reviews:
         # assume public reviews only in API; adjust filter if admins can see non-public
-        qs = movie.reviews.filter(is_public=True).order_by('-created')
+        qs = prefetched_reviews(movie)
+        if qs is not None:
+            latest, count = (qs[0] if qs else None), len(qs)
+            average = average_rating(qs)
+        else:
+            qs = movie.reviews.filter(is_public=True).order_by('-created')
+            latest, count = (qs.first(), qs.count()) if verbose else (None, 0)
+            average = movie.average_rating if verbose else None
 
         if verbose:
-            latest = qs.first()
             payload["reviews_summary"] = {
-                "count": qs.count(),
-                "average_rating": movie.average_rating,
-                "latest_review": serialize_movie_review(latest) if latest else None,
+                "count": count,
+                "average_rating": average,
+                "latest_review": serialize_review(latest) if latest else None,
             }
+            if include_histograms:
+                payload["reviews_summary"]["histogram"] = serialize_movie_histograms(movie)
 
         if include_reviews:
             if reviews_limit is not None:
                 qs = qs[:reviews_limit]
-            payload["reviews"] = [serialize_movie_review(r, include_aspects=include_aspects) for r in qs]
+            payload["reviews"] = [serialize_review(r, include_aspects=include_aspects) for r in qs]
 
     return payload
 
@@ -87,6 +154,36 @@ def serialize_creator(creator: Creator) -> dict:
     }
 
 
+@budget(0)  # with creators_queryset_for_works input
+def serialize_creator_works(creator: Creator) -> dict:
+    """A creator with the movies they directed and the books they wrote."""
+    return {
+        "creator": serialize_creator(creator),
+        "movies": [
+            {
+                "id": movie.id,
+                "title": movie.title,
+                "slug": movie.slug,
+                "release_year": movie.release_year,
+                "average_rating": movie.public_rating,
+                "review_count": movie.public_review_count,
+            }
+            for movie in creator.movie_set.all()
+        ],
+        "books": [
+            {
+                "id": book.id,
+                "title": book.title,
+                "slug": book.slug,
+                "publication_year": book.publication_year,
+                "average_rating": book.public_rating,
+                "review_count": book.public_review_count,
+            }
+            for book in creator.book_set.all()
+        ],
+    }
+
+
 def serialize_aspect_rating(ar: MovieAspectRating) -> dict:
     return {
         "category": {
@@ -115,8 +212,8 @@ def serialize_movie_review(review: MovieReview, include_aspects: bool = True) ->
             "id": review.created_by.id,
             "username": review.created_by.username,
         },
-        "created": localtime(review.created).isoformat(),
-        "updated": localtime(review.updated).isoformat(),
+        "created": review.created,
+        "updated": review.updated,
         "is_public": review.is_public,
     }
 
@@ -126,6 +223,41 @@ def serialize_movie_review(review: MovieReview, include_aspects: bool = True) ->
     return data
 
 
+def serialize_movie_review_summary(review: MovieReview, include_aspects: bool = True) -> dict:
+    """Review without its long texts, for embedding in the movie payload."""
+    data = {
+        "id": review.id,
+        "overall_rating": review.overall_rating,
+        "review_summary": review.review_summary,
+        "created_by": {
+            "id": review.created_by.id,
+            "username": review.created_by.username,
+        },
+        "created": review.created,
+    }
+    if include_aspects:
+        data["aspect_ratings"] = [
+            {"category": {"id": ar.category.id, "name": ar.category.name}, "rating": ar.rating}
+            for ar in review.aspect_ratings.all()
+        ]
+    return data
+
+
+def serialize_feed_review(review) -> dict:
+    """MovieReview or BookReview summary with its title, for the cross-media feed."""
+    media = "movie" if isinstance(review, MovieReview) else "book"
+    title = getattr(review, media)
+    return {
+        "type": media,
+        "id": review.id,
+        "overall_rating": review.overall_rating,
+        "review_summary": review.review_summary,
+        "created_by": {"id": review.created_by.id, "username": review.created_by.username},
+        "created": review.created,
+        media: {"id": title.id, "title": title.title, "slug": title.slug},
+    }
+
+
 def serialize_book_review_section_type(rst: ReviewSectionType) -> dict:
     return {
         "id": rst.id,
@@ -158,18 +290,20 @@ def serialize_book_review(review: BookReview, include_sections: bool = True) ->
         "personal_reflection": review.personal_reflection,
         "final_verdict": review.final_verdict,
         "created_by": {"id": review.created_by.id, "username": review.created_by.username},
-        "created": localtime(review.created).isoformat(),
-        "updated": localtime(review.updated).isoformat(),
+        "created": review.created,
+        "updated": review.updated,
         "is_public": review.is_public,
-        "url": review.get_absolute_url() if hasattr(review, "get_absolute_url") else None,
+        "url": absolute_url(review),
     }
     if include_sections:
         data["sections"] = [serialize_book_review_section(s) for s in review.sections.all()]
     return data
 
 
+@budget(0)  # with books_queryset_for_serialization input
 def serialize_book(book: Book, *, verbose: bool = False, include_reviews: bool = False,
-                   include_sections: bool = True, reviews_limit: Optional[int] = 5) -> dict:
+                   include_sections: bool = True, reviews_limit: Optional[int] = 5,
+                   include_histograms: bool = False) -> dict:
     authors = book.authors.all()
     categories = book.category.all()
     languages = book.language.all()
@@ -191,22 +325,31 @@ def serialize_book(book: Book, *, verbose: bool = False, include_reviews: bool =
         "summary": book.summary,
         "language": [serialize_language(l) for l in languages],
         "country": [serialize_country(c) for c in countries],
-        "url": book.get_absolute_url() if hasattr(book, "get_absolute_url") else None,
+        "url": absolute_url(book),
         # handy display strings from your model properties:
         "display_authors": book.display_authors,
         "display_categories": book.display_categories,
     }
 
     if verbose or include_reviews:
-        public_reviews_qs = book.reviews.filter(is_public=True).order_by("-created")
+        public_reviews_qs = prefetched_reviews(book)
+        if public_reviews_qs is not None:
+            latest, count = (public_reviews_qs[0] if public_reviews_qs else None), len(public_reviews_qs)
+            average = average_rating(public_reviews_qs)
+        else:
+            public_reviews_qs = book.reviews.filter(is_public=True).order_by("-created")
+            if verbose:
+                latest, count = public_reviews_qs.first(), public_reviews_qs.count()
+                average = public_reviews_qs.aggregate(avg=Avg("overall_rating"))["avg"]
 
         if verbose:
             payload["reviews_summary"] = {
-                "count": public_reviews_qs.count(),
-                "average_rating": public_reviews_qs.aggregate(avg=Avg("overall_rating"))["avg"],
-                "latest_review": serialize_book_review(public_reviews_qs.first(), include_sections=False)
-                if public_reviews_qs.exists() else None,
+                "count": count,
+                "average_rating": average,
+                "latest_review": serialize_book_review(latest, include_sections=False) if latest else None,
             }
+            if include_histograms:
+                payload["reviews_summary"]["histogram"] = {"overall": serialize_histogram(book.rating_buckets.all())}
 
         if include_reviews:
             qs = public_reviews_qs
@@ -0,0 +1,99 @@
+"""
+Request coalescing: callers asking for the same key at the same time share
+one computation instead of each running it.
+
+    body = single_flight(f"movies:details:{slug}", render)
+
+Within a process followers wait for the leader's outcome: its result, or the
+exception it raised, which every follower then re-raises. Across processes the
+leader holds a short lock in the default cache and publishes its result there
+under the lock's token; followers in other processes poll for it. A follower
+that waits longer than SINGLE_FLIGHT_TIMEOUT runs ``compute`` itself, as does
+one in another process whose leader failed, so a slow or crashed leader only
+costs latency.
+
+Keys must cover everything the result depends on, including the database it
+is read from when reads can be routed to a replica.
+"""
+import math
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+from typing import Any, Callable, Optional
+
+
+POLL_INTERVAL = 0.02  # seconds between checks for another process' result
+
+
+class _Call(object):
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result = None  # type: Any
+        self.error = None  # type: Optional[BaseException]
+
+
+_calls = {}
+_calls_lock = threading.Lock()
+
+
+def single_flight(key: str, compute: Callable[[], Any]) -> Any:
+    """
+    Return ``compute()``, sharing the call with concurrent callers of ``key``.
+    Results must be picklable to be shared across processes.
+    """
+    timeout = getattr(settings, "SINGLE_FLIGHT_TIMEOUT", 5)
+    with _calls_lock:
+        call = _calls.get(key)
+        leader = call is None
+        if leader:
+            call = _calls[key] = _Call()
+
+    if not leader:
+        if not call.done.wait(timeout):
+            return compute()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    try:
+        call.result = _across_processes(key, compute, timeout)
+        return call.result
+    except BaseException as exc:
+        call.error = exc
+        raise
+    finally:
+        with _calls_lock:
+            _calls.pop(key, None)
+        call.done.set()
+
+
+def _across_processes(key: str, compute: Callable[[], Any], timeout: float) -> Any:
+    lock_key = f"singleflight:lock:{key}"
+    token = uuid.uuid4().hex
+    if cache.add(lock_key, token, timeout=math.ceil(timeout)):
+        try:
+            result = compute()
+            cache.set(f"singleflight:result:{token}", (result,), getattr(settings, "SINGLE_FLIGHT_RESULT_SECONDS", 10))
+            return result
+        finally:
+            if cache.get(lock_key) == token:
+                cache.delete(lock_key)
+
+    leader = cache.get(lock_key)
+    deadline = time.monotonic() + timeout
+    while leader is not None and time.monotonic() < deadline:
+        published = cache.get(f"singleflight:result:{leader}")
+        if published is not None:
+            return published[0]
+        if cache.get(lock_key) != leader:
+            # released: either the result is there now or the leader failed
+            published = cache.get(f"singleflight:result:{leader}")
+            if published is not None:
+                return published[0]
+            break
+        time.sleep(POLL_INTERVAL)
+    return compute()
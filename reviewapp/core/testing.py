@@ -0,0 +1,70 @@
+"""
+Fixtures for the app tests. Rows are created one by one through the ORM, so
+the signal-maintained tables (stats, documents, change feed, works cache)
+are populated the way production writes populate them; benchmarks.datagen
+bulk-inserts and leaves them empty.
+"""
+from types import SimpleNamespace
+
+from django.contrib.auth.models import User
+
+from reviewapp.apps.books.models import Book, BookReview, ReviewSection, ReviewSectionType
+from reviewapp.apps.metadata.models import Country, Creator, Genre, Language
+from reviewapp.apps.movies.models import Movie, MovieAspectRating, MovieReview, MovieReviewCategory
+
+
+def seed_catalogue(movies: int = 4, books: int = 3, reviewers: int = 3) -> SimpleNamespace:
+    """
+    Titles in different decades, genres and countries, reviewed by every
+    reviewer. Every fourth review is hidden; movie reviews rate each aspect
+    category and book reviews have two sections.
+    """
+    users = [User.objects.create(username=f"reviewer{i}") for i in range(reviewers)]
+    genres = [Genre.objects.create(name=f"Movie genre {i}", type=Genre.TYPE.MOVIE) for i in range(2)]
+    book_genres = [Genre.objects.create(name=f"Book genre {i}", type=Genre.TYPE.BOOK) for i in range(2)]
+    languages = [Language.objects.create(name=f"Language {i}", code=f"l{i}") for i in range(2)]
+    countries = [Country.objects.create(name=f"Country {i}", code=f"c{i}") for i in range(2)]
+    directors = [Creator.objects.create(name=f"Director {i}", type=Creator.TYPE.Director) for i in range(2)]
+    authors = [Creator.objects.create(name=f"Author {i}", type=Creator.TYPE.Author) for i in range(2)]
+    categories = [MovieReviewCategory.objects.create(name=f"Aspect {i}", weight=1 + i) for i in range(3)]
+    section_types = [
+        ReviewSectionType.objects.create(name=f"Section {i}", suggested_for=ReviewSectionType.SUGGESTED_GENRES.ALL)
+        for i in range(2)
+    ]
+
+    movie_rows = []
+    for i in range(movies):
+        movie = Movie.objects.create(title=f"Movie {i}", release_year=1985 + 10 * i, runtime=90 + i)
+        movie.genre.set([genres[i % 2]])
+        movie.director.set([directors[i % 2]])
+        movie.language.set([languages[i % 2]])
+        movie.country.set([countries[(i // 2) % 2]])
+        for j, user in enumerate(users):
+            review = MovieReview.objects.create(
+                movie=movie, overall_rating=3 + (i * 3 + j * 2) % 7, detailed_review="text",
+                final_verdict="verdict", created_by=user, is_public=(i + j) % 4 != 3,
+            )
+            for k, category in enumerate(categories):
+                MovieAspectRating.objects.create(review=review, category=category,
+                                                 rating=1 + (i + j * 2 + k * 3) % 10, review_text="aspect")
+        movie_rows.append(movie)
+
+    book_rows = []
+    for i in range(books):
+        book = Book.objects.create(title=f"Book {i}", slug=f"book-{i}", publication_year=2000 + i)
+        book.authors.set([authors[i % 2]])
+        book.category.set([book_genres[i % 2]])
+        for j, user in enumerate(users):
+            review = BookReview.objects.create(
+                book=book, overall_rating=2 + (i * 5 + j) % 8, detailed_review="text",
+                final_verdict="verdict", created_by=user, is_public=(i + j) % 4 != 3,
+            )
+            for k, section_type in enumerate(section_types):
+                ReviewSection.objects.create(review=review, section_type=section_type, content=f"section {k}",
+                                             order=k)
+        book_rows.append(book)
+
+    return SimpleNamespace(
+        users=users, genres=genres, countries=countries, directors=directors, authors=authors,
+        categories=categories, section_types=section_types, movies=movie_rows, books=book_rows,
+    )
@@ -0,0 +1,309 @@
+import tempfile
+import threading
+import tracemalloc
+
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import DEFAULT_DB_ALIAS, connection, connections, router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from reviewapp.apps.metadata.models import Language
+from reviewapp.apps.movies.models import Movie, MovieReview
+from reviewapp.core import profiling
+from reviewapp.core.pagination import InvalidCursor, encode_cursor
+from reviewapp.core.querysets import movies_queryset_for_serialization
+from reviewapp.core.reviews import decode_feed_cursor, decode_review_cursor
+from reviewapp.core.routers import ReplicaPinningMiddleware, get_state, replica_reads
+from reviewapp.core.serializers import serialize_movie
+
+
+REPLICA = "replica"
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA], REPLICA_PIN_SECONDS=5)
+class ReplicaRoutingTests(TransactionTestCase):
+    """
+    Routing decisions with a replica alias configured next to 'default'.
+    The 'replica' connection mirrors the test database, so reads sent there
+    succeed and are told apart from 'default' by capturing each connection's
+    queries. A TransactionTestCase, because SQLite will not let the second
+    connection read tables the first holds in an open transaction.
+    """
+    databases = {DEFAULT_DB_ALIAS, REPLICA}
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.movie = Movie.objects.create(title="Alien", release_year=1979, runtime=117)
+
+    def get_api(self, path: str, params=None):
+        """Serve ``path`` through the test client; return the response and the query counts per alias."""
+        with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as default, \
+                CaptureQueriesContext(connections[REPLICA]) as replica:
+            response = self.client.get(path, params or {})
+        self.assertEqual(response.status_code, 200, path)
+        return response, {DEFAULT_DB_ALIAS: len(default), REPLICA: len(replica)}
+
+    def serve(self, view, cookies=None):
+        request = self.factory.get("/api/movies/")
+        request.COOKIES.update(cookies or {})
+        return ReplicaPinningMiddleware(view)(request)
+
+    def test_reads_inside_replica_reads_go_to_the_replica(self):
+        seen = []
+
+        def view(request):
+            with replica_reads():
+                seen.append(Movie.objects.all().db)
+            return HttpResponse()
+
+        self.serve(view)
+        self.assertEqual(seen, [REPLICA])
+
+    def test_reads_outside_replica_reads_use_default(self):
+        def view(request):
+            self.assertEqual(Movie.objects.all().db, DEFAULT_DB_ALIAS)
+            return HttpResponse()
+
+        self.serve(view)
+
+    def test_writes_go_to_default_and_keep_later_reads_there(self):
+        seen = []
+
+        def view(request):
+            with replica_reads():
+                seen.append(router.db_for_write(Language))
+                Language.objects.create(name="Esperanto", code="eo")
+                seen.append(Movie.objects.all().db)
+            return HttpResponse()
+
+        self.serve(view)
+        self.assertEqual(seen, [DEFAULT_DB_ALIAS, DEFAULT_DB_ALIAS])
+        self.assertTrue(Language.objects.using(DEFAULT_DB_ALIAS).filter(code="eo").exists())
+
+    def test_migrations_skip_the_replica(self):
+        self.assertFalse(router.allow_migrate(REPLICA, "movies", model_name="movie"))
+        self.assertTrue(router.allow_migrate(DEFAULT_DB_ALIAS, "movies", model_name="movie"))
+
+    def test_admin_reads_default(self):
+        staff = User.objects.create_superuser("admin", "admin@example.com", "secret")
+        self.client.force_login(staff)
+        response = self.client.get("/admin/movies/movie/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_write_sets_the_pin_cookie(self):
+        def view(request):
+            Language.objects.create(name="Esperanto", code="eo")
+            return HttpResponse()
+
+        with mock.patch("reviewapp.core.routers.time.time", return_value=1000.0):
+            response = self.serve(view)
+        cookie = response.cookies[ReplicaPinningMiddleware.cookie_name]
+        self.assertEqual(cookie.value, "1005")
+        self.assertEqual(cookie["max-age"], 5)
+        self.assertTrue(cookie["httponly"])
+
+    def test_read_only_request_does_not_pin(self):
+        def view(request):
+            with replica_reads():
+                Movie.objects.all().db
+            return HttpResponse()
+
+        response = self.serve(view)
+        self.assertNotIn(ReplicaPinningMiddleware.cookie_name, response.cookies)
+
+    def test_pinned_client_reads_default_until_the_window_ends(self):
+        seen = []
+
+        def view(request):
+            with replica_reads():
+                seen.append((get_state().pinned, Movie.objects.all().db))
+            return HttpResponse()
+
+        cookies = {ReplicaPinningMiddleware.cookie_name: "1005"}
+        for now in (1000.0, 1004.0, 1005.0, 1010.0):
+            with mock.patch("reviewapp.core.routers.time.time", return_value=now):
+                self.serve(view, cookies)
+        self.assertEqual(seen, [
+            (True, DEFAULT_DB_ALIAS),
+            (True, DEFAULT_DB_ALIAS),
+            (False, REPLICA),
+            (False, REPLICA),
+        ])
+
+    def test_api_reads_run_on_the_replica(self):
+        for path, params in (("/api/movies/", {"verbose": "true"}),
+                             (f"/api/movies/{self.movie.slug}/", {"include_histograms": "true"})):
+            response, queries = self.get_api(path, params)
+            self.assertEqual(queries[DEFAULT_DB_ALIAS], 0, path)
+            self.assertGreater(queries[REPLICA], 0, path)
+            self.assertNotIn(ReplicaPinningMiddleware.cookie_name, response.cookies)
+
+    def test_pinned_client_reads_through_the_api_on_default(self):
+        with mock.patch("reviewapp.core.routers.time.time", return_value=1000.0):
+            self.client.cookies[ReplicaPinningMiddleware.cookie_name] = "1005"
+            _, queries = self.get_api(f"/api/movies/{self.movie.slug}/", {"include_histograms": "true"})
+        self.assertGreater(queries[DEFAULT_DB_ALIAS], 0)
+        self.assertEqual(queries[REPLICA], 0)
+
+    def test_api_reads_after_a_write_run_on_default(self):
+        User.objects.create_superuser("admin", "admin@example.com", "secret")
+        # logging in saves the session and the user's last_login, which pins the client
+        response = self.client.post("/admin/login/", {"username": "admin", "password": "secret"})
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(ReplicaPinningMiddleware.cookie_name, response.cookies)
+
+        _, queries = self.get_api(f"/api/movies/{self.movie.slug}/", {"include_histograms": "true"})
+        self.assertGreater(queries[DEFAULT_DB_ALIAS], 0)
+        self.assertEqual(queries[REPLICA], 0)
+
+    def test_garbage_pin_cookie_is_ignored(self):
+        seen = []
+
+        def view(request):
+            with replica_reads():
+                seen.append(Movie.objects.all().db)
+            return HttpResponse()
+
+        self.serve(view, {ReplicaPinningMiddleware.cookie_name: "soon"})
+        self.assertEqual(seen, [REPLICA])
+
+
+class PrefixSearchIndexTests(TestCase):
+
+    def test_admin_prefix_search_uses_the_index(self):
+        if connection.vendor not in ("postgresql", "sqlite"):
+            self.skipTest("prefix search indexes are only created on PostgreSQL and SQLite")
+        plan = Movie.objects.filter(title__istartswith="sta").explain()
+        self.assertIn("movies_movie_title_prefix", plan)
+
+    def test_prefix_search_stays_case_insensitive(self):
+        for title in ("Stab", "star trek", "STARGATE", "Mustang"):
+            Movie.objects.create(title=title, release_year=2000, runtime=90, imdb_id=f"tt{len(title)}{title[:2]}")
+        titles = Movie.objects.filter(title__istartswith="sta").values_list("title", flat=True)
+        self.assertEqual(sorted(titles), ["STARGATE", "Stab", "star trek"])
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA], REPLICA_PIN_SECONDS=5)
+class SingleFlightKeyTests(TestCase):
+
+    def details_key(self, cookies=None):
+        keys = []
+
+        def single_flight(key, compute):
+            keys.append(key)
+            return None
+
+        for name, value in (cookies or {}).items():
+            self.client.cookies[name] = value
+        with mock.patch("reviewapp.api.movies.views.single_flight", single_flight), \
+                mock.patch("reviewapp.core.routers.time.time", return_value=1000.0):
+            response = self.client.get("/api/movies/alien/", {"include_histograms": "true"})
+        self.assertEqual(response.status_code, 404)
+        return keys[0]
+
+    def test_pinned_and_replica_reads_do_not_share_a_flight(self):
+        replica_key = self.details_key()
+        pinned_key = self.details_key({ReplicaPinningMiddleware.cookie_name: "1005"})
+        self.assertIn(f":{REPLICA}:", replica_key)
+        self.assertIn(f":{DEFAULT_DB_ALIAS}:", pinned_key)
+        self.assertNotEqual(replica_key, pinned_key)
+
+
+class ReviewCursorTests(SimpleTestCase):
+
+    def test_rating_cursors_round_trip(self):
+        self.assertEqual(decode_review_cursor(encode_cursor("highest", 7.5, 3), "highest"), (7.5, 3))
+        self.assertEqual(decode_review_cursor(encode_cursor("lowest", 7, 3), "lowest"), (7, 3))
+
+    def test_rating_cursors_need_a_number(self):
+        for value in ("7", True, [7], {"a": 1}, None):
+            with self.subTest(value=value), self.assertRaises(InvalidCursor):
+                decode_review_cursor(encode_cursor("highest", value, 3), "highest")
+
+    def test_date_cursors_need_a_valid_timestamp(self):
+        # the second one matches the ISO pattern but is out of range
+        for value in (7, "yesterday", "2024-13-45T25:61:00"):
+            with self.subTest(value=value), self.assertRaises(InvalidCursor):
+                decode_review_cursor(encode_cursor("newest", value, 3), "newest")
+            with self.subTest(value=value), self.assertRaises(InvalidCursor):
+                decode_feed_cursor(encode_cursor(value, 3, "movie"))
+
+    def test_ids_and_media_are_checked(self):
+        created = "2024-01-01T00:00:00+00:00"
+        for token in (encode_cursor("newest", created, True), encode_cursor("oldest", created, 3)):
+            with self.assertRaises(InvalidCursor):
+                decode_review_cursor(token, "newest")
+        for media in (["movie"], {"movie": 1}, "film"):
+            with self.subTest(media=media), self.assertRaises(InvalidCursor):
+                decode_feed_cursor(encode_cursor(created, 3, media))
+
+
+class ProfilingTests(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        overridden = override_settings(PROFILING_SAMPLE_RATE=1.0, PROFILING_DIR=directory.name)
+        overridden.enable()
+        self.addCleanup(overridden.disable)
+
+    def test_tracing_lasts_until_the_last_concurrent_request_ends(self):
+        self.assertFalse(tracemalloc.is_tracing())
+        first_in, second_done, traced = threading.Event(), threading.Event(), []
+
+        def first():
+            with profiling._tracing:
+                first_in.set()
+                second_done.wait(5)
+                traced.append(tracemalloc.is_tracing())
+
+        thread = threading.Thread(target=first)
+        thread.start()
+        first_in.wait(5)
+        with profiling._tracing:
+            pass
+        second_done.set()
+        thread.join()
+        self.assertEqual(traced, [True])
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_tracing_started_elsewhere_is_left_running(self):
+        tracemalloc.start()
+        self.addCleanup(tracemalloc.stop)
+        with profiling._tracing:
+            pass
+        self.assertTrue(tracemalloc.is_tracing())
+
+    def test_snapshot_failure_does_not_fail_the_request(self):
+        with mock.patch.object(profiling.tracemalloc, "take_snapshot", side_effect=RuntimeError), \
+                self.assertLogs("reviewapp.core.profiling", "ERROR"):
+            response = self.client.get("/api/movies/")
+        self.assertEqual(response.status_code, 200)
+        profile, = profiling.list_profiles()
+        self.assertEqual(profile["status"], 200)
+
+    def test_save_failure_does_not_fail_the_request(self):
+        with mock.patch.object(profiling, "save_profile", side_effect=OSError), \
+                self.assertLogs("reviewapp.core.profiling", "ERROR"):
+            response = self.client.get("/api/movies/")
+        self.assertEqual(response.status_code, 200)
+
+
+class AverageRatingTests(TestCase):
+
+    def test_prefetched_and_live_movies_average_public_reviews_only(self):
+        movie = Movie.objects.create(title="Alien", release_year=1979, runtime=117)
+        for i, (rating, public) in enumerate(((8, True), (6, True), (1, False))):
+            MovieReview.objects.create(movie=movie, overall_rating=rating, detailed_review="text", final_verdict="ok",
+                                       created_by=User.objects.create(username=f"reviewer{i}"), is_public=public)
+
+        prefetched = movies_queryset_for_serialization(Movie.objects.filter(pk=movie.pk)).get()
+        for instance in (prefetched, Movie.objects.get(pk=movie.pk)):
+            with self.subTest(prefetched=instance is prefetched):
+                summary = serialize_movie(instance)["reviews_summary"]
+                self.assertEqual(summary["average_rating"], 7)
+                self.assertEqual(summary["count"], 2)
+        self.assertEqual(movie.average_rating, 7)
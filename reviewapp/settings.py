@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import tempfile
+
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -41,6 +43,13 @@ INSTALLED_APPS = [
     'reviewapp.apps.movies',
     'reviewapp.apps.books',
     'reviewapp.apps.metadata',
+    'reviewapp.apps.jobs',
+    'reviewapp.apps.documents',
+    'reviewapp.apps.similarity',
+    'reviewapp.apps.stats',
+    'reviewapp.apps.changes',
+    'reviewapp.apps.works',
+    'reviewapp.apps.ratings',
 
     "corsheaders",
 ]
@@ -48,10 +57,13 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'reviewapp.core.routers.ReplicaPinningMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'reviewapp.core.profiling.ProfilingMiddleware',
+    'reviewapp.core.nplusone.NPlusOneMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -92,6 +104,60 @@ DATABASES = {
     }
 }
 
+# Read replicas: add their aliases to DATABASES (e.g. in settings_local) and list
+# them here. API reads go to a replica; admin and writes stay on 'default'.
+# A client that wrote is pinned to the primary for REPLICA_PIN_SECONDS.
+DATABASE_REPLICAS = []
+
+# Second connection to the same database, used as the replica by the routing
+# tests (reviewapp.core.tests). The test runner points it at the test database
+# and nothing routes to it unless it is listed in DATABASE_REPLICAS.
+DATABASES['replica'] = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+
+DATABASE_ROUTERS = ['reviewapp.core.routers.ReplicaRouter']
+
+REPLICA_PIN_SECONDS = 5
+
+# Concurrent identical detail renders share one computation (reviewapp.core.singleflight).
+# Cross-process coalescing uses the default cache, so it needs a shared backend
+# (Redis/Memcached) in CACHES; with the local-memory default it is per process.
+SINGLE_FLIGHT_TIMEOUT = 5
+SINGLE_FLIGHT_RESULT_SECONDS = 10
+
+# Background jobs (reviewapp.apps.jobs), run by `manage.py run_workers`.
+JOBS_MAX_ATTEMPTS = 5
+JOBS_LEASE_SECONDS = 300
+
+# Warm the document store in a background thread when an app server loads
+# reviewapp.wsgi or reviewapp.asgi; management commands never do (see
+# `manage.py warm_cache` to warm by hand).
+WARM_CACHE_ON_STARTUP = False
+WARM_CACHE_TOP = 100
+
+# The change feed (/api/changes/) holds back changes younger than this. Feed
+# entries are already sequenced in commit order; this is a heuristic margin,
+# not a guarantee.
+CHANGES_SETTLE_SECONDS = 2
+
+# Creator works payloads (/api/creators/<id>/works/) are invalidated on every
+# relevant write; this only bounds how long unused entries stay in the cache.
+CREATOR_WORKS_CACHE_SECONDS = 60 * 60
+
+# Request profiling (reviewapp.core.profiling): a random share of requests,
+# plus staff requests sending the header, is profiled into PROFILING_DIR.
+PROFILING_SAMPLE_RATE = 0.0
+PROFILING_HEADER = "X-Profile"
+PROFILING_TRACEMALLOC = True
+PROFILING_DIR = Path(tempfile.gettempdir()) / "reviewapp-profiles"
+PROFILING_KEEP = 200
+
+# N+1 detection (reviewapp.core.nplusone): requests repeating the same query
+# NPLUSONE_THRESHOLD times from one call site, or exceeding their view's
+# declared query budget, are logged (or fail, with NPLUSONE_RAISE).
+NPLUSONE_ENABLED = DEBUG
+NPLUSONE_THRESHOLD = 3
+NPLUSONE_RAISE = False
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators